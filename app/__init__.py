@@ -1,11 +1,14 @@
 from flask import Flask
 from app.extensions import db, migrate, cors, jwt
 from app.config import AppConfig as Config
+from app.core.responses import ORJSONProvider
 from app.utils.rsa_util import init_rsa_keys
 
 def create_app(config_class=Config):
     """创建Flask应用实例"""
     app = Flask(__name__, instance_relative_config=True)
+    # 使用orjson处理应用内的JSON序列化和解析
+    app.json = ORJSONProvider(app)
     app.config.from_object(config_class)
     app.config.from_pyfile('config.py', silent=True)
 
@@ -17,6 +20,12 @@ def create_app(config_class=Config):
 
     init_rsa_keys(app)
     
+    # 初始化认证参数
+    register_auth_settings(app)
+    
+    # 注册请求钩子
+    register_request_hooks(app)
+    
     # 注册蓝图
     register_blueprints(app)
     
@@ -36,6 +45,25 @@ def register_extensions(app):
     jwt.init_app(app)
     return None
 
+def register_auth_settings(app):
+    """缓存认证相关配置"""
+    from app.api.middleware.auth import init_auth_settings
+    init_auth_settings(app)
+    return None
+
+def register_request_hooks(app):
+    """注册请求钩子"""
+    from flask import g, request
+
+    @app.before_request
+    def attach_client_info():
+        """记录客户端IP和用户代理，直接读取WSGI environ，供限流和记录日志的接口复用"""
+        environ = request.environ
+        g.ip_address = environ.get("REMOTE_ADDR")
+        g.user_agent = environ.get("HTTP_USER_AGENT")
+
+    return None
+
 def register_blueprints(app):
     """注册蓝图"""
     from app.api.v1 import api_v1_bp
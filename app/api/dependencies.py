@@ -0,0 +1,169 @@
+"""接口依赖
+
+存储库持有的db.session是按应用上下文划分作用域的scoped_session，
+每次访问都会解析到当前请求（或后台任务）自己的会话，因此存储库和服务本身无状态，
+可在进程内共享。这里按需创建后缓存在模块级字典中，之后的请求不再重复初始化。
+"""
+from typing import Any, Dict, Type, TypeVar
+
+from app.extensions import db
+
+from app.domains.applications.services.app_store_service import AppStoreService
+from app.domains.auth.services.auth_service import AuthService
+from app.domains.applications.services.image_classify_service import (
+    ImageClassifyService,
+)
+from app.domains.applications.services.user_app_service import UserAppService
+from app.domains.applications.services.xhs_copy_service import (
+    XhsCopyGenerationService,
+)
+from app.domains.foundation.services.forbidden_words_service import (
+    ForbiddenWordsService,
+)
+from app.domains.foundation.services.llm_service import (
+    LLMModelService,
+    LLMProviderConfigService,
+    LLMProviderService,
+)
+from app.infrastructure.database.repositories.app_template_repository import (
+    AppTemplateRepository,
+)
+from app.infrastructure.database.repositories.auth_repository import AuthRepository
+from app.infrastructure.database.repositories.forbidden_words_repository import (
+    ForbiddenWordsRepository,
+)
+from app.infrastructure.database.repositories.image_classify_repository import (
+    ImageClassifyRepository,
+)
+from app.infrastructure.database.repositories.llm_repository import (
+    LLMModelRepository,
+    LLMProviderConfigRepository,
+    LLMProviderRepository,
+)
+from app.infrastructure.database.repositories.user_app_repository import (
+    UserAppRepository,
+)
+from app.infrastructure.database.repositories.user_repository import UserRepository
+from app.infrastructure.database.repositories.xhs_copy_repository import (
+    XhsCopyGenerationRepository,
+)
+
+RepositoryT = TypeVar("RepositoryT")
+
+
+# 进程内共享的存储库（按类）和服务（按名称）实例。
+# 并发首次创建时可能多构造一次，setdefault保证最终只保留一个实例
+_repositories: Dict[type, Any] = {}
+_services: Dict[str, Any] = {}
+
+
+def get_repository(repository_class: Type[RepositoryT]) -> RepositoryT:
+    """获取共享的存储库实例（按类缓存）"""
+    repository = _repositories.get(repository_class)
+    if repository is None:
+        repository = repository_class(db.session)
+        repository = _repositories.setdefault(repository_class, repository)
+    return repository
+
+
+def get_auth_service() -> AuthService:
+    """获取认证服务"""
+    service = _services.get("auth_service")
+    if service is None:
+        service = AuthService(
+            get_repository(AuthRepository),
+            get_repository(UserRepository),
+        )
+        service = _services.setdefault("auth_service", service)
+    return service
+
+
+def get_user_app_service() -> UserAppService:
+    """获取用户应用服务"""
+    service = _services.get("user_app_service")
+    if service is None:
+        service = UserAppService(
+            get_repository(UserAppRepository),
+            get_repository(AppTemplateRepository),
+            get_repository(LLMProviderConfigRepository),
+        )
+        service = _services.setdefault("user_app_service", service)
+    return service
+
+
+def get_app_store_service() -> AppStoreService:
+    """获取应用商店服务"""
+    service = _services.get("app_store_service")
+    if service is None:
+        service = AppStoreService(get_repository(AppTemplateRepository))
+        service = _services.setdefault("app_store_service", service)
+    return service
+
+
+def get_image_classify_service() -> ImageClassifyService:
+    """获取图片分类服务"""
+    service = _services.get("image_classify_service")
+    if service is None:
+        service = ImageClassifyService(
+            get_repository(ImageClassifyRepository),
+            get_repository(UserAppRepository),
+            get_repository(LLMProviderRepository),
+            get_repository(LLMModelRepository),
+            get_repository(LLMProviderConfigRepository),
+        )
+        service = _services.setdefault("image_classify_service", service)
+    return service
+
+
+def get_xhs_copy_service() -> XhsCopyGenerationService:
+    """获取小红书文案生成服务"""
+    service = _services.get("xhs_copy_service")
+    if service is None:
+        service = XhsCopyGenerationService(
+            get_repository(XhsCopyGenerationRepository),
+            get_repository(UserAppRepository),
+            get_repository(LLMProviderRepository),
+            get_repository(LLMModelRepository),
+            get_repository(LLMProviderConfigRepository),
+        )
+        service = _services.setdefault("xhs_copy_service", service)
+    return service
+
+
+def get_llm_provider_service() -> LLMProviderService:
+    """获取大模型平台服务"""
+    service = _services.get("llm_provider_service")
+    if service is None:
+        service = LLMProviderService(get_repository(LLMProviderRepository))
+        service = _services.setdefault("llm_provider_service", service)
+    return service
+
+
+def get_llm_model_service() -> LLMModelService:
+    """获取模型服务"""
+    service = _services.get("llm_model_service")
+    if service is None:
+        service = LLMModelService(
+            get_repository(LLMModelRepository),
+            get_repository(LLMProviderRepository),
+        )
+        service = _services.setdefault("llm_model_service", service)
+    return service
+
+
+def get_llm_provider_config_service() -> LLMProviderConfigService:
+    """获取用户LLM配置服务"""
+    service = _services.get("llm_provider_config_service")
+    if service is None:
+        service = LLMProviderConfigService(get_repository(LLMProviderConfigRepository))
+        service = _services.setdefault("llm_provider_config_service", service)
+    return service
+
+
+def get_forbidden_words_service() -> ForbiddenWordsService:
+    """获取违禁词服务"""
+    service = _services.get("forbidden_words_service")
+    if service is None:
+        service = ForbiddenWordsService(get_repository(ForbiddenWordsRepository))
+        service = _services.setdefault("forbidden_words_service", service)
+    return service
@@ -0,0 +1,47 @@
+"""接口后台任务
+
+由submit_background_task在独立的应用上下文中执行，服务通过进程级共享的依赖获取。
+"""
+from typing import Any, Dict, List, Optional
+
+from flask import request
+
+from app.api.dependencies import get_image_classify_service, get_xhs_copy_service
+
+
+def is_async_request(default: bool = False) -> bool:
+    """请求是否要求异步执行
+
+    查询参数async=1/true时异步执行，async=0/false时同步执行，未指定时使用default。
+    """
+    value = request.args.get("async")
+    if value is None:
+        return default
+    return value.lower() in ("1", "true")
+
+
+def run_classification_job(
+    classification_id: int,
+    image_url: str,
+    categories: List[Dict[str, Any]],
+    config: Dict[str, Any],
+    user_id: str,
+) -> None:
+    """后台执行图片分类，结果写回分类记录"""
+    get_image_classify_service().run_classification(
+        classification_id, image_url, categories, config, user_id
+    )
+
+
+def run_generation_job(
+    generation_id: int,
+    prompt: str,
+    image_urls: List[str],
+    config: Dict[str, Any],
+    user_id: str,
+    forbidden_words: Optional[List[str]] = None,
+) -> None:
+    """后台执行小红书文案生成，结果写回生成记录"""
+    get_xhs_copy_service().run_generation(
+        generation_id, prompt, image_urls, config, user_id, forbidden_words
+    )
@@ -2,12 +2,11 @@
 from functools import wraps
 import time
 import logging
-import traceback
-from flask import request, g, current_app
+from flask import request, g
+from app.api.dependencies import get_repository
 from app.infrastructure.database.repositories.user_app_repository import UserAppRepository
 from app.core.exceptions import AuthenticationException, ValidationException, NotFoundException
-from app.core.status_codes import APPLICATION_NOT_FOUND, PARAMETER_ERROR, RATE_LIMITED
-from app.infrastructure.database.session import get_db_session
+from app.core.status_codes import RATE_LIMITED
 
 logger = logging.getLogger(__name__)
 
@@ -72,17 +71,13 @@ def app_key_required(f):
     @wraps(f)
     def decorated_function(*args, **kwargs):
         try:
-            # 从请求头中获取应用密钥
-            app_key = request.headers.get("X-App-Key")
-            print("===== 开始应用密钥认证 =====")
-            print(f"Headers获取是: {request.headers}")
-            print(f"提取的应用密钥头: {app_key}")
-            print(f"提取的应用密钥: {app_key[:15]}...{app_key[-15:]} (仅显示首尾)")
+            # 从请求头中获取应用密钥（直接读取WSGI environ，跳过请求头的大小写无关查找）
+            app_key = request.environ.get("HTTP_X_APP_KEY")
             if not app_key:
                 raise AuthenticationException("缺少应用密钥")
             
             # 获取客户端IP
-            ip_address = request.remote_addr
+            ip_address = g.ip_address
             
             # 限流检查
             if not RateLimiter.check(app_key, ip_address):
@@ -90,11 +85,10 @@ def app_key_required(f):
                 raise ValidationException("请求频率超过限制，请稍后再试", RATE_LIMITED)
             
             # 初始化存储库
-            db_session = get_db_session()
-            user_app_repo = UserAppRepository(db_session)
+            user_app_repo = get_repository(UserAppRepository)
             
-            # 验证应用密钥
-            app = user_app_repo.get_by_app_key(app_key)
+            # 验证应用密钥（使用缓存的应用快照）
+            app = user_app_repo.get_snapshot_by_app_key(app_key)
             if not app:
                 logger.warning(f"Invalid app key: {app_key}")
                 raise NotFoundException("无效的应用密钥")
@@ -108,24 +102,50 @@ def app_key_required(f):
             g.app_key = app_key
             g.app = app
             g.user_id = app.user_id
-            g.db_session = db_session
             
             # 记录API调用
             logger.info(f"API call from app: {app.name} (ID: {app.id}), User ID: {app.user_id}")
             
-            # 执行被装饰的函数
-            return f(*args, **kwargs)
-            
         except (AuthenticationException, ValidationException, NotFoundException) as e:
             # 直接重新抛出已知异常
             raise
         except Exception as e:
             # 记录未知异常
-            logger.error(f"Unexpected error in app_key_auth: {str(e)}\n{traceback.format_exc()}")
+            logger.exception("Unexpected error in app_key_auth")
             raise AuthenticationException(f"应用验证失败: {str(e)}")
+        
+        # 在try之外执行被装饰的函数，避免接口自身的业务异常被转换为认证失败
+        return f(*args, **kwargs)
     
     return decorated_function
 
+
+def app_type_required(app_type, app_label, require_published_config=False):
+    """应用类型验证装饰器，需放在app_key_required之后
+
+    应用快照已由app_key_required从缓存中取得，这里只比较快照字段，不查询数据库。
+
+    Args:
+        app_type: 允许的应用类型
+        app_label: 应用类型名称，用于错误提示
+        require_published_config: 是否要求应用已发布配置
+    """
+    type_error = f"该应用密钥不属于{app_label}"
+
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            app = g.app
+            if app.app_type != app_type:
+                raise ValidationException(type_error)
+            if require_published_config and not (app.published and app.published_config):
+                raise ValidationException("该应用未发布配置")
+            return f(*args, **kwargs)
+
+        return decorated_function
+
+    return decorator
+
 # 定期清理过期数据的函数，应当在应用启动时通过后台线程调用
 def cleanup_rate_limiter():
     """清理限流器中的过期数据"""
@@ -1,124 +1,185 @@
 """认证中间件"""
+import hashlib
+import logging
+from collections import namedtuple
 from functools import wraps
 from flask import request, g, current_app
 import jwt
 import time
 from app.core.exceptions import AuthenticationException
-from app.core.status_codes import UNAUTHORIZED, TOKEN_EXPIRED, INVALID_TOKEN
+from app.infrastructure.cache.memory_cache import MemoryCache
+from app.api.dependencies import get_repository
 from app.infrastructure.database.repositories.user_repository import UserRepository
-from app.infrastructure.database.session import get_db_session
+
+logger = logging.getLogger(__name__)
+
+# 令牌解码结果缓存时间（秒），实际TTL不会超过令牌剩余有效期
+TOKEN_CACHE_TTL = 30
+# 用户信息缓存时间（秒）
+USER_CACHE_TTL = 60
+
+# 进程内缓存：令牌摘要 -> payload，避免同一令牌重复验签和解析
+_token_cache = MemoryCache()
+_token_cache.initialize(prefix="auth:token", max_size=10000)
+
+# 进程内缓存：用户ID -> 用户快照。只缓存必要字段而不是ORM对象，
+# 避免跨请求使用已脱离会话的实例
+_user_cache = MemoryCache()
+_user_cache.initialize(prefix="auth:user", max_size=10000)
+
+AuthUser = namedtuple("AuthUser", ["id", "username", "is_active", "is_admin"])
+
+# JWT验证参数，应用初始化时由init_auth_settings写入，避免每次请求读取配置
+_jwt_settings = {}
+
+
+def init_auth_settings(app) -> None:
+    """缓存JWT验证参数
+
+    Args:
+        app: Flask应用实例
+    """
+    secret_key = app.config.get("JWT_SECRET_KEY")
+    # 预先编码为bytes，PyJWT的HMAC验签可直接使用，无需每次请求重新编码
+    if isinstance(secret_key, str):
+        secret_key = secret_key.encode("utf-8")
+    _jwt_settings["secret_key"] = secret_key
+    _jwt_settings["algorithms"] = ["HS256"]
+    _jwt_settings["leeway"] = 120
+
+
+def _get_jwt_settings() -> dict:
+    """获取JWT验证参数，未初始化时从当前应用配置加载"""
+    if not _jwt_settings:
+        init_auth_settings(current_app)
+    return _jwt_settings
+
+
+def _token_digest(token: str) -> str:
+    """计算令牌的缓存键"""
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()[:32]
+
+
+def _decode_token(token: str) -> dict:
+    """解码JWT令牌，命中缓存时跳过验签"""
+    cache_key = _token_digest(token)
+    payload = _token_cache.get(cache_key)
+    if payload is not None:
+        return payload
+
+    settings = _get_jwt_settings()
+    payload = jwt.decode(
+        token,
+        settings["secret_key"],
+        algorithms=settings["algorithms"],
+        leeway=settings["leeway"],
+    )
+
+    # 缓存时间不超过令牌剩余有效期
+    ttl = TOKEN_CACHE_TTL
+    if "exp" in payload:
+        ttl = min(ttl, int(payload["exp"] - time.time()))
+    if ttl > 0:
+        _token_cache.set(cache_key, payload, ttl=ttl)
+
+    return payload
+
+
+def _load_user(user_id):
+    """获取用户快照，命中缓存时不查询数据库"""
+    cache_key = str(user_id)
+    user = _user_cache.get(cache_key)
+    if user is not None:
+        return user
+
+    record = get_repository(UserRepository).find_by_id(user_id)
+    if not record:
+        return None
+
+    user = AuthUser(
+        id=record.id,
+        username=record.username,
+        is_active=record.is_active,
+        is_admin=record.is_admin,
+    )
+    _user_cache.set(cache_key, user, ttl=USER_CACHE_TTL)
+    return user
+
+
+def _authenticate_request() -> AuthUser:
+    """验证当前请求的JWT令牌，并将用户ID和用户信息存储在请求上下文中
+
+    Returns:
+        当前用户快照
+
+    Raises:
+        AuthenticationException: 认证失败
+    """
+    # 从请求头中获取JWT令牌（直接读取WSGI environ，跳过请求头的大小写无关查找）
+    auth_header = request.environ.get("HTTP_AUTHORIZATION")
+    if not auth_header:
+        logger.debug("缺少Authorization请求头")
+        raise AuthenticationException("缺少认证令牌")
+    
+    # 提取令牌，兼容大小写形式的Bearer前缀
+    if not auth_header.startswith(("Bearer ", "bearer ")):
+        logger.debug("无效的认证格式")
+        raise AuthenticationException("无效的认证格式")
+    
+    token = auth_header[7:].strip()
+    if not token or " " in token:
+        logger.debug("无效的认证格式")
+        raise AuthenticationException("无效的认证格式")
+    
+    try:
+        # 解码令牌（带缓存）
+        payload = _decode_token(token)
+    except jwt.ExpiredSignatureError:
+        raise AuthenticationException("令牌已过期")
+    except jwt.InvalidTokenError as e:
+        logger.debug("无效的令牌: %s", e)
+        raise AuthenticationException("无效的令牌")
+    
+    # 获取用户ID
+    user_id = payload.get("sub")
+    if not user_id:
+        logger.debug("令牌payload中缺少'sub'字段")
+        raise AuthenticationException("无效的令牌")
+    
+    # 验证用户是否存在
+    user = _load_user(user_id)
+    if not user:
+        logger.debug("用户不存在: %s", user_id)
+        raise AuthenticationException("用户不存在")
+    
+    # 验证用户状态
+    if not user.is_active:
+        logger.debug("用户账户已禁用: %s", user_id)
+        raise AuthenticationException("账户已禁用")
+    
+    # 将用户ID和用户信息存储在请求上下文中
+    g.user_id = user_id
+    g.user = user
+    return user
+
 
 def auth_required(f):
     """JWT认证装饰器"""
     @wraps(f)
     def decorated_function(*args, **kwargs):
-        print("===== 开始JWT认证 =====")
-        # 从请求头中获取JWT令牌
-        auth_header = request.headers.get("Authorization")
-        if not auth_header:
-            print("错误: 缺少Authorization请求头")
-            raise AuthenticationException("缺少认证令牌")
-        
-        # 提取令牌
-        token_parts = auth_header.split()
-        print(f"Authorization头拆分结果: {token_parts}")
-        
-        if len(token_parts) != 2 or token_parts[0].lower() != "bearer":
-            print(f"错误: 无效的认证格式 - 长度: {len(token_parts)}, 前缀: {token_parts[0] if token_parts else None}")
-            raise AuthenticationException("无效的认证格式")
-        
-        token = token_parts[1]
-        print(f"提取的令牌: {token[:15]}...{token[-15:]} (仅显示首尾)")
-        
-        try:
-            # 获取密钥
-            secret_key = current_app.config.get("JWT_SECRET_KEY")
-            print(f"使用的密钥: {secret_key[:3]}...{secret_key[-3:] if secret_key else None} (仅显示首尾)")
-            
-            # 解码令牌前检查
-            print("尝试解码令牌...")
-            
-            # 解码令牌
-            payload = jwt.decode(token, secret_key, algorithms=["HS256"],leeway=120)
-            print(f"令牌解码成功，payload: {payload}")
-            
-            # 获取用户ID
-            user_id = payload.get("sub")
-            if not user_id:
-                print("错误: payload中缺少'sub'字段")
-                raise AuthenticationException("无效的2令牌")
-            
-            print(f"从令牌获取的用户ID: {user_id}")
-            
-            # 检查令牌过期时间
-            exp_time = payload.get("exp", 0)
-            current_time = int(time.time())
-            time_diff = exp_time - current_time
-            print(f"令牌过期时间: {exp_time} (Unix时间戳)")
-            print(f"当前时间: {current_time} (Unix时间戳)")
-            print(f"距离过期还有: {time_diff} 秒")
-            
-            # 初始化存储库
-            print("初始化用户存储库...")
-            db_session = get_db_session()
-            user_repo = UserRepository(db_session)
-            
-            # 验证用户是否存在
-            print(f"查询用户ID: {user_id}...")
-            user = user_repo.find_by_id(user_id)
-            if not user:
-                print(f"错误: 用户ID {user_id} 不存在")
-                raise AuthenticationException("用户不存在")
-            
-            print(f"用户信息: ID={user.id}, 用户名={user.username}, 状态={user.is_active}")
-            
-            # 验证用户状态
-            if not user.is_active:
-                print("错误: 用户账户已禁用")
-                raise AuthenticationException("账户已禁用")
-            
-            # 将用户ID和会话存储在请求上下文中
-            g.user_id = user_id
-            g.db_session = db_session
-            
-            print("===== JWT认证成功 =====")
-            # 调用被装饰的函数
-            return f(*args, **kwargs)
-        except jwt.ExpiredSignatureError as e:
-            print(f"错误: 令牌已过期 - {str(e)}")
-            raise AuthenticationException("令牌已过期")
-        except jwt.InvalidTokenError as e:
-            print(f"错误: 无效的令1牌 - {str(e)}")
-            raise AuthenticationException("无效的令牌")
-        except AuthenticationException:
-            # 直接重新抛出认证异常
-            raise
-        except Exception as e:
-            # 记录未知异常，但不做处理，让它继续传播
-            print(f"认证过程中发生非认证异常 - 类型: {type(e).__name__}, 信息: {str(e)}")
-            raise  # 让异常继续传播，保持原始异常类型
+        _authenticate_request()
+        return f(*args, **kwargs)
     return decorated_function
 
 def admin_required(f):
     """管理员权限装饰器"""
     @wraps(f)
     def decorated_function(*args, **kwargs):
-        print("===== 检查管理员权限 =====")
-        # 先验证JWT令牌
-        @auth_required
-        def check_admin(*args, **kwargs):
-            # 获取用户
-            db_session = g.db_session
-            user_repo = UserRepository(db_session)
-            user = user_repo.find_by_id(g.user_id)
-            
-            print(f"检查用户 {user.username} (ID: {user.id}) 的管理员权限")
-            # 验证管理员权限
-            if not user.is_admin:
-                print(f"错误: 用户 {user.username} 不是管理员")
-                raise AuthenticationException("需要管理员权限")
-            
-            print(f"用户 {user.username} 具有管理员权限，验证通过")
-            return f(*args, **kwargs)
-        return check_admin(*args, **kwargs)
-    return decorated_function
\ No newline at end of file
+        user = _authenticate_request()
+        # 验证管理员权限
+        if not user.is_admin:
+            logger.debug("用户 %s 不是管理员", user.id)
+            raise AuthenticationException("需要管理员权限")
+        
+        return f(*args, **kwargs)
+    return decorated_function
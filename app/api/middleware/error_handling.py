@@ -1,13 +1,21 @@
-from flask import jsonify
-from app.core.status_codes import SUCCESS, UNKNOWN_ERROR
+from werkzeug.exceptions import HTTPException
+from app.core.responses import JSONResponse, dumps
+from app.core.status_codes import UNKNOWN_ERROR
 
 def handle_exception(e):
     """全局异常处理器"""
     # 记录错误
     # current_app.logger.error(f"Unhandled exception: {str(e)}")
     
-    # 获取业务状态码，默认为未知错误
-    code = getattr(e, 'code', UNKNOWN_ERROR)
+    if isinstance(e, HTTPException):
+        # Werkzeug的HTTP异常（如404路由不存在），code即HTTP状态码
+        code = e.code
+        http_status_code = e.code
+    else:
+        # 获取业务状态码，默认为未知错误
+        code = getattr(e, 'code', UNKNOWN_ERROR)
+        # 确定HTTP状态码，默认为500
+        http_status_code = getattr(e, 'http_status_code', 500)
     
     # 返回JSON格式的错误响应
     response = {
@@ -16,7 +24,4 @@ def handle_exception(e):
         "data": None
     }
     
-    # 确定HTTP状态码，默认为500
-    http_status_code = getattr(e, 'http_status_code', 500)
-    
-    return jsonify(response), http_status_code
\ No newline at end of file
+    return JSONResponse(dumps(response), status=http_status_code)
@@ -0,0 +1,86 @@
+"""查询参数解析
+
+查询参数格式错误时使用默认值，不抛出ValueError导致500；
+分页大小统一限制上限，避免一次查询过多数据。
+"""
+from collections import namedtuple
+from typing import Any, Dict, Optional, Tuple
+
+from flask import request
+
+# 每页记录数上限
+MAX_PER_PAGE = 100
+
+# 列表接口的查询参数：分页、游标和过滤条件
+ListArgs = namedtuple("ListArgs", ["page", "per_page", "cursor", "filters"])
+
+
+def _parse_int(raw: Optional[str]) -> Optional[int]:
+    """解析整数字符串，格式错误时返回None"""
+    if not raw:
+        return None
+    try:
+        return int(raw)
+    except ValueError:
+        return None
+
+
+def get_filter_args(
+    str_fields: Tuple[str, ...] = (),
+    int_fields: Tuple[str, ...] = (),
+) -> Dict[str, Any]:
+    """一次性读取列表接口的过滤参数
+
+    整数参数格式错误时忽略该条件；start_date和end_date需同时提供才生效。
+
+    Args:
+        str_fields: 按原样读取的参数名
+        int_fields: 需转换为整数的参数名
+
+    Returns:
+        过滤条件字典，只包含请求中提供的参数
+    """
+    args = request.args
+    filters = {name: args[name] for name in str_fields if name in args}
+    for name in int_fields:
+        value = _parse_int(args.get(name))
+        if value is not None:
+            filters[name] = value
+
+    start_date = args.get("start_date")
+    end_date = args.get("end_date")
+    if start_date is not None and end_date is not None:
+        filters["start_date"] = start_date
+        filters["end_date"] = end_date
+    return filters
+
+
+def get_list_args(
+    str_fields: Tuple[str, ...] = (),
+    int_fields: Tuple[str, ...] = (),
+    default_per_page: int = 20,
+) -> ListArgs:
+    """一次性读取列表接口的分页、游标和过滤参数
+
+    页码缺失、格式错误或小于1时取1；每页记录数限制在1到MAX_PER_PAGE之间；
+    过滤参数规则与get_filter_args相同。
+
+    Args:
+        str_fields: 按原样读取的过滤参数名
+        int_fields: 需转换为整数的过滤参数名
+        default_per_page: 默认每页记录数
+
+    Returns:
+        ListArgs(页码, 每页记录数, 游标, 过滤条件)
+    """
+    args = request.args
+
+    page = _parse_int(args.get("page"))
+    if page is None or page < 1:
+        page = 1
+    per_page = _parse_int(args.get("per_page"))
+    if per_page is None:
+        per_page = default_per_page
+    per_page = min(max(per_page, 1), MAX_PER_PAGE)
+
+    return ListArgs(page, per_page, args.get("cursor"), get_filter_args(str_fields, int_fields))
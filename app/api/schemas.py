@@ -0,0 +1,178 @@
+"""接口请求体模型
+
+请求体统一通过 `parse_request_body` 一次性解析并校验，
+路由中不再逐个字段 `data.get(...)` 取值和判断类型。
+"""
+from typing import Annotated, Any, Dict, List, Optional, Type, TypeVar, Union
+
+import orjson
+from flask import g, request
+from pydantic import BaseModel, ConfigDict, Field, ValidationError
+
+from app.core.exceptions import ValidationException
+from app.core.validation import IMAGE_URL_REGEX, MAX_IMAGE_URLS
+
+SchemaT = TypeVar("SchemaT", bound=BaseModel)
+
+# 图片URL在解析请求体时即完成格式校验
+ImageUrl = Annotated[str, Field(pattern=IMAGE_URL_REGEX)]
+
+
+class CategoryItem(BaseModel):
+    """分类选项"""
+
+    model_config = ConfigDict(extra="allow")
+
+    id: Union[int, str]
+    text: str
+
+
+class ClassifyImageRequest(BaseModel):
+    """图片分类请求"""
+
+    image_url: ImageUrl
+    categories: List[CategoryItem] = Field(min_length=2)
+    app_id: Optional[str] = None
+
+
+class GenerateContentRequest(BaseModel):
+    """小红书文案生成请求"""
+
+    prompt: str = Field(min_length=1)
+    image_urls: List[ImageUrl] = Field(default_factory=list, max_length=MAX_IMAGE_URLS)
+    forbidden_words: List[str] = Field(default_factory=list)
+
+
+class PhonePasswordRequest(BaseModel):
+    """手机号密码注册/登录请求"""
+
+    phone: str
+    password: str
+    username: Optional[str] = None
+
+
+class VerifyTokenRequest(BaseModel):
+    """令牌验证请求"""
+
+    token: str
+
+
+class AppIdRequest(BaseModel):
+    """按应用ID操作的请求，其余字段作为更新内容"""
+
+    model_config = ConfigDict(extra="allow")
+
+    app_id: Union[int, str]
+
+
+class ConfigIdRequest(BaseModel):
+    """按LLM配置ID操作的请求，其余字段作为更新内容"""
+
+    model_config = ConfigDict(extra="allow")
+
+    config_id: Union[int, str]
+
+
+class InstantiateAppRequest(BaseModel):
+    """从模板实例化应用请求"""
+
+    template_id: Union[int, str]
+    config: Optional[Dict[str, Any]] = None
+    name: Optional[str] = None
+
+
+class CheckContentRequest(BaseModel):
+    """违禁词检查请求"""
+
+    content: str = Field(min_length=1)
+    application: str = "xhs_copy"
+
+
+# 字段校验失败时返回给调用方的提示，未列出的字段使用通用提示
+_FIELD_MESSAGES = {
+    "image_url": "图片URL不能为空",
+    "categories": "分类列表必须至少包含两个选项",
+    "prompt": "提示词不能为空",
+    "image_urls": "图片URL列表格式错误",
+    "forbidden_words": "禁用词列表格式错误",
+    "phone": "缺少必要参数: phone, password",
+    "password": "缺少必要参数: phone, password",
+    "token": "缺少必要参数: token",
+    "app_id": "缺少必填参数: app_id",
+    "config_id": "缺少必填参数: config_id",
+    "template_id": "缺少必填参数: template_id",
+    "content": "内容不能为空",
+}
+
+
+# 解析结果在g上的缓存键，区分"未解析"与"解析结果为None"
+_JSON_BODY_KEY = "_json_body"
+_UNPARSED = object()
+
+
+def load_json_body() -> Optional[Any]:
+    """使用orjson解析当前请求的JSON请求体
+
+    不在请求对象上缓存原始请求体，解析结果缓存在g上，同一请求内重复调用
+    不会重新解析；Content-Type不是JSON、请求体为空或格式错误时返回None，
+    由调用方按"请求数据不能为空"处理。
+    """
+    data = g.get(_JSON_BODY_KEY, _UNPARSED)
+    if data is _UNPARSED:
+        data = _decode_json_body()
+        setattr(g, _JSON_BODY_KEY, data)
+    return data
+
+
+def _decode_json_body() -> Optional[Any]:
+    """读取并解码请求体"""
+    if not request.is_json:
+        return None
+    raw = request.get_data(cache=False)
+    if not raw:
+        return None
+    try:
+        return orjson.loads(raw)
+    except orjson.JSONDecodeError:
+        return None
+
+
+def require_json_body() -> Any:
+    """获取当前请求的JSON请求体，为空时抛出异常
+
+    Raises:
+        ValidationException: 请求体为空或格式错误
+    """
+    data = load_json_body()
+    if not data:
+        raise ValidationException("请求数据不能为空")
+    return data
+
+
+def parse_request_body(schema: Type[SchemaT]) -> SchemaT:
+    """解析并校验当前请求的JSON请求体
+
+    Args:
+        schema: 请求体模型类
+
+    Returns:
+        校验通过的模型实例
+
+    Raises:
+        ValidationException: 请求体为空或字段不符合要求
+    """
+    data = require_json_body()
+
+    try:
+        return schema.model_validate(data)
+    except ValidationError as e:
+        error = e.errors()[0]
+        field = error["loc"][0] if error["loc"] else None
+        if error["type"] == "string_pattern_mismatch" and error["input"]:
+            raise ValidationException(f"无效的图片URL: {error['input']}")
+        if field == "image_urls" and error["type"] == "too_long":
+            raise ValidationException(f"图片数量不能超过{MAX_IMAGE_URLS}张")
+        message = _FIELD_MESSAGES.get(field)
+        if message is None:
+            message = f"参数错误: {field}" if field else "请求数据格式错误"
+        raise ValidationException(message)
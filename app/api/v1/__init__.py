@@ -25,55 +25,32 @@ from app.api.v1.external.applications.image_classify import external_image_class
 from app.api.v1.external.foundation.forbidden_words import external_forbidden_words_bp
 from app.api.v1.external.applications.xhs_copy import external_xhs_copy_bp
 
+# 所有蓝图直接注册到主蓝图，使用完整的URL前缀，避免多层嵌套蓝图
+
 # 注册认证蓝图
 api_v1_bp.register_blueprint(auth_bp, url_prefix="/auth")
 
-
-
-# 创建并注册基础能力蓝图
-foundation_bp = Blueprint("foundation", __name__, url_prefix="/foundation")
-
-foundation_bp.register_blueprint(llm_provider_bp, url_prefix="/llm_provider")
-foundation_bp.register_blueprint(llm_provider_config_bp, url_prefix="/llm_provider_configs")
-api_v1_bp.register_blueprint(foundation_bp)
-
-
-# 创建并注册应用蓝图
-applications_bp = Blueprint("applications", __name__, url_prefix="/applications")
+# 注册基础能力蓝图
+api_v1_bp.register_blueprint(llm_provider_bp, url_prefix="/foundation/llm_provider")
+api_v1_bp.register_blueprint(
+    llm_provider_config_bp, url_prefix="/foundation/llm_provider_configs"
+)
 
 # 注册各应用类型蓝图
-applications_bp.register_blueprint(xhs_copy_bp, url_prefix="/xhs_copy")
-applications_bp.register_blueprint(image_classify_bp, url_prefix="/image_classify")
-applications_bp.register_blueprint(user_app_bp, url_prefix="/user_app")
-applications_bp.register_blueprint(app_store_bp, url_prefix="/store")
-
-
-
-# 注册应用蓝图到主蓝图
-api_v1_bp.register_blueprint(applications_bp)
-
-# 创建并注册外部接口蓝图
-external_bp = Blueprint("external", __name__, url_prefix="/external")
-
-# 外部接口的基础能力蓝图
-external_foundation_bp = Blueprint(
-    "external_foundation", __name__, url_prefix="/foundation"
+api_v1_bp.register_blueprint(xhs_copy_bp, url_prefix="/applications/xhs_copy")
+api_v1_bp.register_blueprint(
+    image_classify_bp, url_prefix="/applications/image_classify"
 )
-external_foundation_bp.register_blueprint(external_forbidden_words_bp)
-external_bp.register_blueprint(external_foundation_bp)
+api_v1_bp.register_blueprint(user_app_bp, url_prefix="/applications/user_app")
+api_v1_bp.register_blueprint(app_store_bp, url_prefix="/applications/store")
 
-# 外部接口的应用蓝图
-external_applications_bp = Blueprint(
-    "external_applications", __name__, url_prefix="/applications"
+# 注册外部接口蓝图
+api_v1_bp.register_blueprint(
+    external_forbidden_words_bp, url_prefix="/external/foundation/forbidden_words"
 )
-external_applications_bp.register_blueprint(
-    external_xhs_copy_bp, url_prefix="/xhs_copy"
+api_v1_bp.register_blueprint(
+    external_xhs_copy_bp, url_prefix="/external/applications/xhs_copy"
 )
-external_applications_bp.register_blueprint(
-    external_image_classify_bp, url_prefix="/image_classify"
+api_v1_bp.register_blueprint(
+    external_image_classify_bp, url_prefix="/external/applications/image_classify"
 )
-external_bp.register_blueprint(external_applications_bp)
-
-# 注册外部接口蓝图到主蓝图
-api_v1_bp.register_blueprint(external_bp)
-
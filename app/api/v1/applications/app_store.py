@@ -1,18 +1,9 @@
 # app/api/v1/applications/app_store.py (修改)
 from flask import Blueprint, request, g
+from app.api.schemas import InstantiateAppRequest, parse_request_body
 from app.core.responses import success_response
 from app.core.exceptions import ValidationException
-from app.domains.applications.services.app_store_service import AppStoreService
-from app.domains.applications.services.user_app_service import UserAppService
-from app.infrastructure.database.repositories.app_template_repository import (
-    AppTemplateRepository,
-)
-from app.infrastructure.database.repositories.user_app_repository import (
-    UserAppRepository,
-)
-from app.infrastructure.database.repositories.llm_repository import (
-    LLMProviderConfigRepository,
-)
+from app.api.dependencies import get_app_store_service, get_user_app_service
 from app.api.middleware.auth import auth_required
 
 app_store_bp = Blueprint("app_store", __name__, url_prefix="/store")
@@ -22,10 +13,7 @@ app_store_bp = Blueprint("app_store", __name__, url_prefix="/store")
 @auth_required
 def list_available_apps():
     """获取应用商店中可用的应用列表"""
-    # 初始化存储库和服务
-    db_session = g.db_session
-    template_repo = AppTemplateRepository(db_session)
-    app_store_service = AppStoreService(template_repo)
+    app_store_service = get_app_store_service()
 
     # 获取应用模板列表
     templates = app_store_service.get_all_templates()
@@ -44,10 +32,7 @@ def get_app_details():
     app_id = data.get("id")
     if not app_id :
         raise ValidationException("请提供app_id")
-    # 初始化存储库和服务
-    db_session = g.db_session
-    template_repo = AppTemplateRepository(db_session)
-    app_store_service = AppStoreService(template_repo)
+    app_store_service = get_app_store_service()
     template = app_store_service.get_template_by_id(app_id)
     return success_response(template, "获取应用详情成功")
 
@@ -56,25 +41,14 @@ def get_app_details():
 @auth_required
 def instantiate_app():
     """从模板实例化应用"""
-    # 验证请求数据
-    data = request.get_json()
-    if not data or "template_id" not in data:
-        raise ValidationException("缺少必填参数: template_id")
-
-    template_id = data["template_id"]
-    custom_config = data.get("config")
-    custom_name = data.get("name")
+    # 解析并验证请求数据
+    body = parse_request_body(InstantiateAppRequest)
+    template_id = body.template_id
+    custom_config = body.config
+    custom_name = body.name
     user_id = g.user_id
 
-    # 初始化存储库和服务
-    db_session = g.db_session
-    template_repo = AppTemplateRepository(db_session)
-    user_app_repo = UserAppRepository(db_session)
-    llm_provider_config_repo = LLMProviderConfigRepository(db_session)
-
-    user_app_service = UserAppService(
-        user_app_repo, template_repo, llm_provider_config_repo
-    )
+    user_app_service = get_user_app_service()
 
     # 实例化应用
     app = user_app_service.instantiate_from_template(
@@ -1,24 +1,14 @@
 # app/api/v1/applications/image_classify.py
 from flask import Blueprint, request, g
-from app.core.responses import success_response
+from app.core.responses import ndjson_response, success_response
 from app.core.exceptions import ValidationException
-from app.domains.applications.services.image_classify_service import (
-    ImageClassifyService
-)
-from app.infrastructure.database.repositories.user_app_repository import (
-    UserAppRepository,
-)
-from app.infrastructure.database.repositories.image_classify_repository import (
-    ImageClassifyRepository,
-)
-from app.infrastructure.database.repositories.llm_repository import (
-    LLMProviderRepository,
-    LLMModelRepository,LLMProviderConfigRepository
-)
-
+from app.api.dependencies import get_image_classify_service
+from app.api.jobs import is_async_request, run_classification_job
+from app.api.request_args import get_filter_args, get_list_args
+from app.api.schemas import ClassifyImageRequest, parse_request_body
 from app.api.middleware.auth import auth_required
+from app.infrastructure.tasks.background import submit_background_task
 import logging
-import traceback
 
 logger = logging.getLogger(__name__)
 
@@ -33,62 +23,69 @@ def classify_image():
     try:
         user_id = g.user_id
 
-        # 验证请求数据
-        data = request.get_json()
-        if not data:
-            raise ValidationException("请求数据不能为空")
-
-        # 提取数据
-        image_url = data.get("image_url")
-        if not image_url:
-            raise ValidationException("图片URL不能为空")
-
-        categories = data.get("categories", [])
-        if not categories or not isinstance(categories, list) or len(categories) < 2:
-            raise ValidationException("分类列表必须至少包含两个选项")
-
-        app_id = data.get("app_id")  # 可选参数
+        # 解析并验证请求数据
+        body = parse_request_body(ClassifyImageRequest)
 
         # 获取IP和用户代理
-        ip_address = request.remote_addr
-        user_agent = request.headers.get("User-Agent")
-
-        # 初始化存储库和服务
-        db_session = g.db_session
-        classify_repo = ImageClassifyRepository(db_session)
-        user_app_repo = UserAppRepository(db_session)
-        provider_repo = LLMProviderRepository(db_session)
-        model_repo = LLMModelRepository(db_session)
-        llm_provider_config_repo = LLMProviderConfigRepository(db_session)
-
-        classify_service = ImageClassifyService(
-            classify_repo,
-            user_app_repo,
-            provider_repo,
-            model_repo,
-            llm_provider_config_repo,
-        )
+        ip_address = g.ip_address
+        user_agent = g.user_agent
+
+        classify_service = get_image_classify_service()
+        categories = [item.model_dump() for item in body.categories]
+
+        # 异步模式：创建处理中的记录后立即返回，客户端通过/classify/status轮询结果
+        if is_async_request():
+            classification, config = classify_service.prepare_classification(
+                image_url=body.image_url,
+                categories=categories,
+                app_id=body.app_id,
+                user_id=user_id,
+                ip_address=ip_address,
+                user_agent=user_agent,
+            )
+            submit_background_task(
+                run_classification_job,
+                classification["id"],
+                body.image_url,
+                categories,
+                config,
+                user_id,
+            )
+            return success_response(classification, "图片分类任务已提交"), 202
 
         # 执行图片分类
         classification = classify_service.create_classification(
-            image_url=image_url,
+            image_url=body.image_url,
             categories=categories,
-            app_id=app_id,
+            app_id=body.app_id,
             user_id=user_id,
             ip_address=ip_address,
             user_agent=user_agent,
         )
 
         return success_response(classification, "图片分类成功")
-    except Exception as e:
-        # 记录未知错误
-        if not isinstance(e, ValidationException):
-            logger.error(
-                f"Error classifying image: {str(e)}\n{traceback.format_exc()}"
-            )
+    except ValidationException:
+        raise
+    except Exception:
+        # 记录未知错误，堆栈由日志处理器按需格式化
+        logger.exception("Error classifying image")
         raise
 
 
+@image_classify_bp.route("/classify/status", methods=["GET"])
+@auth_required
+def get_classification_status():
+    """查询图片分类结果（异步分类轮询）"""
+    classification_id = request.args.get("id", type=int)
+    if not classification_id:
+        raise ValidationException("分类记录ID不能为空")
+
+    classification = get_image_classify_service().get_classification(
+        classification_id, g.user_id
+    )
+    return success_response(classification, "获取图片分类结果成功")
+
+
 @image_classify_bp.route("/classifications", methods=["GET"])
 @auth_required
 def list_classifications():
@@ -96,51 +93,49 @@ def list_classifications():
     try:
         user_id = g.user_id
 
-        # 获取分页和过滤参数
-        page = int(request.args.get("page", 1))
-        per_page = int(request.args.get("per_page", 20))
-
-        # 过滤条件
-        filters = {}
-        if "status" in request.args:
-            filters["status"] = request.args.get("status")
-
-        if "app_id" in request.args:
-            filters["app_id"] = int(request.args.get("app_id"))
-
-        if "start_date" in request.args and "end_date" in request.args:
-            filters["start_date"] = request.args.get("start_date")
-            filters["end_date"] = request.args.get("end_date")
-
-        # 初始化存储库和服务
-        db_session = g.db_session
-        classify_repo = ImageClassifyRepository(db_session)
-        user_app_repo = UserAppRepository(db_session)
-        provider_repo = LLMProviderRepository(db_session)
-        model_repo = LLMModelRepository(db_session)
-        llm_provider_config_repo = LLMProviderConfigRepository(db_session)
-
-        classify_service = ImageClassifyService(
-            classify_repo,
-            user_app_repo,
-            provider_repo,
-            model_repo,
-            llm_provider_config_repo,
-        )
+        # 获取分页和过滤参数（传入cursor时使用游标分页，忽略page）
+        page, per_page, cursor, filters = get_list_args(**_LIST_FILTER_FIELDS)
+
+        classify_service = get_image_classify_service()
 
         # 获取分类记录
-        classifications, total = classify_service.get_all_classifications(
-            user_id=user_id, page=page, per_page=per_page, **filters
+        classifications, total, next_cursor = classify_service.get_all_classifications(
+            user_id=user_id, page=page, per_page=per_page, cursor=cursor, **filters
         )
 
         return success_response(
-            {"items": classifications, "total": total, "page": page, "per_page": per_page},
+            {
+                "items": classifications,
+                "total": total,
+                "page": page,
+                "per_page": per_page,
+                "next_cursor": next_cursor,
+                "has_more": next_cursor is not None,
+            },
             "获取图片分类历史记录成功",
         )
-    except Exception as e:
-        # 记录未知错误
-        if not isinstance(e, ValidationException):
-            logger.error(
-                f"Error listing classifications: {str(e)}\n{traceback.format_exc()}"
-            )
-        raise
\ No newline at end of file
+    except ValidationException:
+        raise
+    except Exception:
+        # 记录未知错误，堆栈由日志处理器按需格式化
+        logger.exception("Error listing classifications")
+        raise
+
+
+@image_classify_bp.route("/classifications/export", methods=["GET"])
+@auth_required
+def export_classifications():
+    """以NDJSON流式导出图片分类历史记录（支持与列表相同的过滤条件）"""
+    classify_service = get_image_classify_service()
+    return ndjson_response(
+        classify_service.iter_classifications(g.user_id, **_get_list_filters())
+    )
+
+
+# 历史记录支持的过滤参数
+_LIST_FILTER_FIELDS = dict(str_fields=("status", "app_id"))
+
+
+def _get_list_filters():
+    """从查询参数中提取历史记录过滤条件"""
+    return get_filter_args(**_LIST_FILTER_FIELDS)
@@ -1,11 +1,9 @@
 # app/api/v1/applications/user_app.py
-from app.infrastructure.database.repositories.app_template_repository import AppTemplateRepository
 from flask import Blueprint, request, g
+from app.api.schemas import AppIdRequest, parse_request_body
 from app.core.responses import success_response
 from app.core.exceptions import ValidationException
-from app.domains.applications.services.user_app_service import UserAppService
-from app.infrastructure.database.repositories.user_app_repository import UserAppRepository
-from app.infrastructure.database.repositories.llm_repository import LLMProviderConfigRepository
+from app.api.dependencies import get_user_app_service
 from app.api.middleware.auth import auth_required
 
 user_app_bp = Blueprint("user_app", __name__, url_prefix="/user_app")
@@ -17,18 +15,10 @@ def list_user_apps():
     user_id = g.user_id
     app_type = request.args.get("app_type")  # 可选按类型过滤
     
-    # 初始化存储库和服务
-    db_session = g.db_session
-    user_app_repo = UserAppRepository(db_session)
-    llm_provider_config_repo = LLMProviderConfigRepository(db_session)
-    user_app_service = UserAppService(user_app_repo, llm_provider_config_repo)
+    user_app_service = get_user_app_service()
     
-    # 获取应用列表
-    apps = user_app_service.get_all_apps(user_id)
-    
-    # 按类型过滤
-    if app_type:
-        apps = [app for app in apps if app["app_type"] == app_type]
+    # 获取应用列表（类型过滤在数据库中完成）
+    apps = user_app_service.get_all_apps(user_id, app_type)
     
     return success_response(apps, "获取用户应用列表成功")
 
@@ -44,11 +34,7 @@ def get_user_app():
     app_id = data["app_id"]
     user_id = g.user_id
     
-    # 初始化存储库和服务
-    db_session = g.db_session
-    user_app_repo = UserAppRepository(db_session)
-    llm_provider_config_repo = LLMProviderConfigRepository(db_session)
-    user_app_service = UserAppService(user_app_repo, llm_provider_config_repo)
+    user_app_service = get_user_app_service()
     
     # 获取应用
     app = user_app_service.get_app(app_id, user_id)
@@ -60,19 +46,13 @@ def get_user_app():
 @auth_required
 def update_user_app():
     """更新用户应用配置"""
-    # 验证请求数据
-    data = request.get_json()
-    if not data or "app_id" not in data:
-        raise ValidationException("缺少必填参数: app_id")
-    
-    app_id = data.pop("app_id")
+    # 解析并验证请求数据，app_id以外的字段为更新内容
+    body = parse_request_body(AppIdRequest)
+    app_id = body.app_id
+    data = body.model_extra
     user_id = g.user_id
     
-    # 初始化存储库和服务
-    db_session = g.db_session
-    user_app_repo = UserAppRepository(db_session)
-    llm_provider_config_repo = LLMProviderConfigRepository(db_session)
-    user_app_service = UserAppService(user_app_repo, llm_provider_config_repo)
+    user_app_service = get_user_app_service()
     
     # 更新应用
     app = user_app_service.update_app(app_id, data, user_id)
@@ -83,20 +63,11 @@ def update_user_app():
 @auth_required
 def publish_user_app():
     """发布应用配置"""
-    # 验证请求数据
-    data = request.get_json()
-    if not data or "app_id" not in data:
-        raise ValidationException("缺少必填参数: app_id")
-    
-    app_id = data["app_id"]
+    # 解析并验证请求数据
+    app_id = parse_request_body(AppIdRequest).app_id
     user_id = g.user_id
     
-    # 初始化存储库和服务
-    db_session = g.db_session
-    user_app_repo = UserAppRepository(db_session)
-    app_template_repo = AppTemplateRepository(db_session)
-    llm_provider_config_repo = LLMProviderConfigRepository(db_session)
-    user_app_service = UserAppService(user_app_repo,app_template_repo, llm_provider_config_repo)
+    user_app_service = get_user_app_service()
     
     # 发布应用
     app = user_app_service.publish_app(app_id, user_id)
@@ -107,19 +78,11 @@ def publish_user_app():
 @auth_required
 def unpublish_user_app():
    """取消发布应用"""
-   # 验证请求数据
-   data = request.get_json()
-   if not data or "app_id" not in data:
-       raise ValidationException("缺少必填参数: app_id")
-   
-   app_id = data["app_id"]
+   # 解析并验证请求数据
+   app_id = parse_request_body(AppIdRequest).app_id
    user_id = g.user_id
    
-   # 初始化存储库和服务
-   db_session = g.db_session
-   user_app_repo = UserAppRepository(db_session)
-   llm_provider_config_repo = LLMProviderConfigRepository(db_session)
-   user_app_service = UserAppService(user_app_repo, llm_provider_config_repo)
+   user_app_service = get_user_app_service()
    
    # 取消发布应用
    app = user_app_service.unpublish_app(app_id, user_id)
@@ -130,19 +93,11 @@ def unpublish_user_app():
 @auth_required
 def delete_user_app():
    """删除用户应用"""
-   # 验证请求数据
-   data = request.get_json()
-   if not data or "app_id" not in data:
-       raise ValidationException("缺少必填参数: app_id")
-   
-   app_id = data["app_id"]
+   # 解析并验证请求数据
+   app_id = parse_request_body(AppIdRequest).app_id
    user_id = g.user_id
    
-   # 初始化存储库和服务
-   db_session = g.db_session
-   user_app_repo = UserAppRepository(db_session)
-   llm_provider_config_repo = LLMProviderConfigRepository(db_session)
-   user_app_service = UserAppService(user_app_repo, llm_provider_config_repo)
+   user_app_service = get_user_app_service()
    
    # 删除应用
    user_app_service.delete_app(app_id, user_id)
@@ -153,19 +108,11 @@ def delete_user_app():
 @auth_required
 def regenerate_app_key():
    """重新生成应用密钥"""
-   # 验证请求数据
-   data = request.get_json()
-   if not data or "app_id" not in data:
-       raise ValidationException("缺少必填参数: app_id")
-   
-   app_id = data["app_id"]
+   # 解析并验证请求数据
+   app_id = parse_request_body(AppIdRequest).app_id
    user_id = g.user_id
    
-   # 初始化存储库和服务
-   db_session = g.db_session
-   user_app_repo = UserAppRepository(db_session)
-   llm_provider_config_repo = LLMProviderConfigRepository(db_session)
-   user_app_service = UserAppService(user_app_repo, llm_provider_config_repo)
+   user_app_service = get_user_app_service()
    
    # 重新生成密钥
    app = user_app_service.regenerate_app_key(app_id, user_id)
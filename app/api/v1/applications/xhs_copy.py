@@ -1,25 +1,14 @@
 # app/api/v1/applications/xhs_copy/xhs_copy.py
 from flask import Blueprint, request, g
-from app.core.responses import success_response
+from app.core.responses import conditional_response, ndjson_response, success_response
 from app.core.exceptions import ValidationException
-from app.domains.applications.services.xhs_copy_service import (
-    XhsCopyGenerationService,
-)
-from app.infrastructure.database.repositories.user_app_repository import (
-    UserAppRepository,
-)
-from app.infrastructure.database.repositories.xhs_copy_repository import (
-    XhsCopyGenerationRepository,
-)
-from app.infrastructure.database.repositories.llm_repository import (
-    LLMProviderRepository,
-    LLMModelRepository,
-    LLMProviderConfigRepository
-)
-
+from app.api.dependencies import get_xhs_copy_service
+from app.api.jobs import is_async_request, run_generation_job
 from app.api.middleware.auth import auth_required
+from app.api.request_args import get_filter_args, get_list_args
+from app.api.schemas import GenerateContentRequest, parse_request_body
+from app.infrastructure.tasks.background import submit_background_task
 import logging
-import traceback
 
 logger = logging.getLogger(__name__)
 
@@ -34,43 +23,35 @@ def generate_content():
     try:
         user_id = g.user_id
 
-        # 验证请求数据
-        data = request.get_json()
-        if not data:
-            raise ValidationException("请求数据不能为空")
-
-        # 提取数据
-        prompt = data.get("prompt")
-        if not prompt:
-            raise ValidationException("提示词不能为空")
-
-        image_urls = data.get("image_urls", [])
- 
-
-        # 验证图片URL格式
-        if image_urls:
-            for url in image_urls:
-                if not url.startswith(("http://", "https://")):
-                    raise ValidationException(f"无效的图片URL: {url}")
+        # 解析并验证请求数据
+        body = parse_request_body(GenerateContentRequest)
+        prompt = body.prompt
+        image_urls = body.image_urls
 
         # 获取IP和用户代理
-        ip_address = request.remote_addr
-        user_agent = request.headers.get("User-Agent")
-
-        # 初始化存储库和服务
-        db_session = g.db_session
-        generation_repo = XhsCopyGenerationRepository(db_session)
-
-        provider_repo = LLMProviderRepository(db_session)
-        model_repo = LLMModelRepository(db_session)
-        llm_provider_config_repo = LLMProviderConfigRepository(db_session)
-
-        generation_service = XhsCopyGenerationService(
-            generation_repo,
-            provider_repo,
-            model_repo,
-            llm_provider_config_repo,
-        )
+        ip_address = g.ip_address
+        user_agent = g.user_agent
+
+        generation_service = get_xhs_copy_service()
+
+        # 异步模式：创建处理中的记录后立即返回，客户端通过/generation轮询结果
+        if is_async_request():
+            generation, config = generation_service.prepare_generation(
+                prompt=prompt,
+                image_urls=image_urls,
+                user_id=user_id,
+                ip_address=ip_address,
+                user_agent=user_agent,
+            )
+            submit_background_task(
+                run_generation_job,
+                generation["id"],
+                prompt,
+                image_urls,
+                config,
+                user_id,
+            )
+            return success_response(generation, "文案生成任务已提交"), 202
 
         # 生成文案
         generation = generation_service.create_generation(
@@ -83,12 +64,11 @@ def generate_content():
         )
 
         return success_response(generation, "生成小红书文案成功")
-    except Exception as e:
-        # 记录未知错误
-        if not isinstance(e, ValidationException):
-            logger.error(
-                f"Error generating content: {str(e)}\n{traceback.format_exc()}"
-            )
+    except ValidationException:
+        raise
+    except Exception:
+        # 记录未知错误，堆栈由日志处理器按需格式化
+        logger.exception("Error generating content")
         raise
 
 
@@ -99,56 +79,61 @@ def list_generations():
     try:
         user_id = g.user_id
 
-        # 获取分页和过滤参数
-        page = int(request.args.get("page", 1))
-        per_page = int(request.args.get("per_page", 20))
-
-        # 过滤条件
-        filters = {}
-        if "status" in request.args:
-            filters["status"] = request.args.get("status")
-
-        if "config_id" in request.args:
-            filters["config_id"] = int(request.args.get("config_id"))
-
-        if "app_id" in request.args:
-            filters["app_id"] = int(request.args.get("app_id"))
-
-        if "start_date" in request.args and "end_date" in request.args:
-            filters["start_date"] = request.args.get("start_date")
-            filters["end_date"] = request.args.get("end_date")
-
-        # 初始化存储库和服务
-        db_session = g.db_session
-        generation_repo = XhsCopyGenerationRepository(db_session)
-        user_app_repo = UserAppRepository(db_session)
-        provider_repo = LLMProviderRepository(db_session)
-        model_repo = LLMModelRepository(db_session)
-        llm_provider_config_repo = LLMProviderConfigRepository(db_session)
-
-        generation_service = XhsCopyGenerationService(
-            generation_repo,
-            user_app_repo,
-            provider_repo,
-            model_repo,
-            llm_provider_config_repo,
-        )
+        # 获取分页和过滤参数（传入cursor时使用游标分页，忽略page）
+        page, per_page, cursor, filters = get_list_args(**_LIST_FILTER_FIELDS)
+
+        generation_service = get_xhs_copy_service()
 
         # 获取生成记录
-        generations, total = generation_service.get_all_generations(
-            user_id=user_id, page=page, per_page=per_page, **filters
+        generations, total, next_cursor = generation_service.get_all_generations(
+            user_id=user_id, page=page, per_page=per_page, cursor=cursor, **filters
         )
 
         return success_response(
-            {"items": generations, "total": total, "page": page, "per_page": per_page},
+            {
+                "items": generations,
+                "total": total,
+                "page": page,
+                "per_page": per_page,
+                "next_cursor": next_cursor,
+                "has_more": next_cursor is not None,
+            },
             "获取小红书文案生成历史记录成功",
         )
-    except Exception as e:
-        # 记录未知错误
-        if not isinstance(e, ValidationException):
-            logger.error(
-                f"Error listing generations: {str(e)}\n{traceback.format_exc()}"
-            )
+    except ValidationException:
+        raise
+    except Exception:
+        # 记录未知错误，堆栈由日志处理器按需格式化
+        logger.exception("Error listing generations")
         raise
 
 
+@xhs_copy_bp.route("/generation", methods=["GET"])
+@auth_required
+def get_generation():
+    """获取单条小红书文案生成记录（内容未变化时返回304）"""
+    generation_id = request.args.get("id", type=int)
+    if not generation_id:
+        raise ValidationException("生成记录ID不能为空")
+
+    generation = get_xhs_copy_service().get_generation(generation_id, g.user_id)
+    return conditional_response(generation, "获取小红书文案生成记录成功")
+
+
+@xhs_copy_bp.route("/generations/export", methods=["GET"])
+@auth_required
+def export_generations():
+    """以NDJSON流式导出小红书文案生成历史记录（支持与列表相同的过滤条件）"""
+    generation_service = get_xhs_copy_service()
+    return ndjson_response(
+        generation_service.iter_generations(g.user_id, **_get_list_filters())
+    )
+
+
+# 历史记录支持的过滤参数
+_LIST_FILTER_FIELDS = dict(str_fields=("status",), int_fields=("config_id", "app_id"))
+
+
+def _get_list_filters():
+    """从查询参数中提取历史记录过滤条件"""
+    return get_filter_args(**_LIST_FILTER_FIELDS)
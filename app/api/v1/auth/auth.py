@@ -1,11 +1,9 @@
 """认证API接口"""
-from flask import Blueprint, request, g, current_app
+from flask import Blueprint, g, current_app
+from app.api.schemas import PhonePasswordRequest, VerifyTokenRequest, parse_request_body
 from app.core.responses import success_response
-from app.core.exceptions import ValidationException, AuthenticationException
-from app.domains.auth.services.auth_service import AuthService
-from app.infrastructure.database.repositories.auth_repository import AuthRepository
-from app.infrastructure.database.repositories.user_repository import UserRepository
-from app.infrastructure.database.session import get_db_session
+from app.core.exceptions import AuthenticationException
+from app.api.dependencies import get_auth_service
 
 auth_bp = Blueprint("auth", __name__)
 
@@ -23,31 +21,15 @@ def get_public_key():
 @auth_bp.route("/register", methods=["POST"])
 def register():
     """手机号密码注册"""
-    # 验证请求数据
-    data = request.get_json()
-    if not data:
-        raise ValidationException("请求数据不能为空")
-    
-    # 检查必要字段
-    if "phone" not in data or "password" not in data:
-        raise ValidationException("缺少必要参数: phone, password")
-    
-    phone = data.get("phone")
-    print(phone)
-    encrypted_password = data.get("password")
-    print(encrypted_password)
-    username = data.get("username")  # 可选
+    # 解析并验证请求数据
+    body = parse_request_body(PhonePasswordRequest)
+    phone = body.phone
+    encrypted_password = body.password
+    username = body.username  # 可选
+
+    # 获取服务
+    auth_service = get_auth_service()
 
-    
-    # 初始化存储库和服务
-    db_session = get_db_session()
- 
-    auth_repo = AuthRepository(db_session)
-    user_repo = UserRepository(db_session)
-    auth_service = AuthService(auth_repo, user_repo)
-    
-    
-  
     result = auth_service.register_with_phone_password(
         phone=phone,
         encrypted_password=encrypted_password,
@@ -59,27 +41,17 @@ def register():
 @auth_bp.route("/login", methods=["POST"])
 def login():
     """手机号密码登录"""
-    # 验证请求数据
-    data = request.get_json()
-    if not data:
-        raise ValidationException("请求数据不能为空")
-    
-    # 检查必要字段
-    if "phone" not in data or "password" not in data:
-        raise ValidationException("缺少必要参数: phone, password")
-    
-    phone = data.get("phone")
-    encrypted_password = data.get("password")
+    # 解析并验证请求数据
+    body = parse_request_body(PhonePasswordRequest)
+    phone = body.phone
+    encrypted_password = body.password
     
     # 获取请求信息
-    ip_address = request.remote_addr
-    user_agent = request.headers.get("User-Agent")
+    ip_address = g.ip_address
+    user_agent = g.user_agent
     
-    # 初始化存储库和服务
-    db_session = get_db_session()
-    auth_repo = AuthRepository(db_session)
-    user_repo = UserRepository(db_session)
-    auth_service = AuthService(auth_repo, user_repo)
+    # 获取服务
+    auth_service = get_auth_service()
     
     # 登录
     result = auth_service.login_with_phone_password(
@@ -94,17 +66,11 @@ def login():
 @auth_bp.route("/verify_token", methods=["POST"])
 def verify_token():
     """验证JWT令牌"""
-    # 验证请求数据
-    data = request.get_json()
-    if not data or "token" not in data:
-        raise ValidationException("缺少必要参数: token")
-    
-    token = data.get("token")
+    # 解析并验证请求数据
+    token = parse_request_body(VerifyTokenRequest).token
     
-    # 初始化存储库和服务
-    db_session = get_db_session()
-    auth_repo = AuthRepository(db_session)
-    auth_service = AuthService(auth_repo)
+    # 获取服务
+    auth_service = get_auth_service()
     
     # 验证令牌
     try:
@@ -1,19 +1,14 @@
 # app/api/v1/external/applications/image_classify.py
 import logging
-import traceback
-from flask import Blueprint, request, g
+from flask import Blueprint, current_app, request, g
 from app.core.responses import success_response
-from app.core.exceptions import ValidationException, NotFoundException, APIException
-from app.core.status_codes import PARAMETER_ERROR, APPLICATION_NOT_FOUND
-from app.domains.applications.services.image_classify_service import ImageClassifyService
-from app.infrastructure.database.repositories.user_app_repository import UserAppRepository
-from app.infrastructure.database.repositories.image_classify_repository import ImageClassifyRepository
-from app.infrastructure.database.repositories.llm_repository import (
-    LLMProviderRepository,
-    LLMModelRepository,
-    LLMProviderConfigRepository
-)
-from app.api.middleware.app_key_auth import app_key_required
+from app.core.exceptions import ValidationException, APIException
+from app.core.status_codes import PARAMETER_ERROR
+from app.api.dependencies import get_image_classify_service
+from app.api.jobs import is_async_request, run_classification_job
+from app.api.schemas import ClassifyImageRequest, parse_request_body
+from app.api.middleware.app_key_auth import app_key_required, app_type_required
+from app.infrastructure.tasks.background import submit_background_task
 
 logger = logging.getLogger(__name__)
 
@@ -21,65 +16,65 @@ external_image_classify_bp = Blueprint("external_image_classify", __name__, url_
 
 @external_image_classify_bp.route("/classify", methods=["POST"])
 @app_key_required
+@app_type_required("image_classify", "图片分类应用", require_published_config=True)
 def external_classify():
     """图片分类API（外部接口）"""
     try:
-        # 获取app_key_auth中间件已验证的应用和用户信息
-        app_key = g.app_key
+        # 获取app_key_auth中间件已验证的应用和用户信息（应用类型和发布状态已由装饰器验证）
         user_id = g.user_id
         app = g.app
 
-        # 验证应用类型和发布状态
-        if app.app_type != "image_classify":
-            raise ValidationException("该应用密钥不属于图片分类应用", PARAMETER_ERROR)
-
-        if not app.published or not app.published_config:
-            raise ValidationException("该应用未发布配置", PARAMETER_ERROR)
-
-        # 验证请求数据
-        data = request.get_json()
-        if not data:
-            raise ValidationException("请求数据不能为空", PARAMETER_ERROR)
-
-        # 提取关键参数
-        image_url = data.get("image_url")
-        if not image_url:
-            raise ValidationException("图片URL不能为空", PARAMETER_ERROR)
-
-        categories = data.get("categories", [])
-        if not categories or not isinstance(categories, list) or len(categories) < 2:
-            raise ValidationException("分类列表必须至少包含两个选项", PARAMETER_ERROR)
+        # 解析并验证请求数据
+        body = parse_request_body(ClassifyImageRequest)
 
         # 获取IP和用户代理
-        ip_address = request.remote_addr
-        user_agent = request.headers.get("User-Agent")
-
-        # 初始化存储库和服务
-        db_session = g.db_session
-        classify_repo = ImageClassifyRepository(db_session)
-        user_app_repo = UserAppRepository(db_session)
-        provider_repo = LLMProviderRepository(db_session)
-        model_repo = LLMModelRepository(db_session)
-        llm_provider_config_repo = LLMProviderConfigRepository(db_session)
-
-        # 初始化服务
-        classify_service = ImageClassifyService(
-            classify_repo,
-            user_app_repo,
-            provider_repo,
-            model_repo,
-            llm_provider_config_repo
-        )
-
-        # 调用分类服务
-        classification = classify_service.create_classification(
-            image_url=image_url,
+        ip_address = g.ip_address
+        user_agent = g.user_agent
+
+        # 获取服务
+        classify_service = get_image_classify_service()
+        categories = [item.model_dump() for item in body.categories]
+
+        # 异步模式：创建处理中的记录后立即返回，调用方通过/classify/status轮询结果
+        if is_async_request(current_app.config.get("EXTERNAL_CLASSIFY_ASYNC_DEFAULT", False)):
+            classification, config = classify_service.prepare_classification(
+                image_url=body.image_url,
+                categories=categories,
+                app_id=app.id,
+                user_id=user_id,
+                ip_address=ip_address,
+                user_agent=user_agent,
+                use_published_config=True,
+                app=app,
+            )
+            submit_background_task(
+                run_classification_job,
+                classification["id"],
+                body.image_url,
+                categories,
+                config,
+                user_id,
+            )
+            result = {
+                "id": classification["id"],
+                "status": classification["status"],
+            }
+            return success_response(result, "图片分类任务已提交"), 202
+
+        # 调用分类服务（开启CLASSIFY_BUFFERED_HISTORY时分类记录批量异步写入）
+        if current_app.config.get("CLASSIFY_BUFFERED_HISTORY"):
+            classify = classify_service.create_classification_buffered
+        else:
+            classify = classify_service.create_classification
+        classification = classify(
+            image_url=body.image_url,
             categories=categories,
             app_id=app.id,  # 使用应用ID
             user_id=user_id,
             ip_address=ip_address,
             user_agent=user_agent,
-            use_published_config=True
+            use_published_config=True,
+            app=app,  # 直接使用app_key_auth已加载的应用快照
         )
 
         # 创建调试信息对象
@@ -106,15 +101,37 @@ def external_classify():
 
         return success_response(result, "图片分类成功")
 
-    except ValidationException as e:
-        logger.warning(f"Validation error: {str(e)}")
-        raise
-    except NotFoundException as e:
-        logger.error(f"Not found error: {str(e)}")
-        raise
     except APIException as e:
-        logger.error(f"API error: {str(e)}")
+        # 业务异常（含参数错误、资源不存在）属于预期错误，不记录堆栈
+        logger.warning("External classify failed: %s", e.message)
         raise
-    except Exception as e:
-        logger.error(f"Unexpected error: {str(e)}\n{traceback.format_exc()}")
-        raise APIException("服务器内部错误", PARAMETER_ERROR)
\ No newline at end of file
+    except Exception:
+        logger.exception("Unexpected error in external classify")
+        raise APIException("服务器内部错误", PARAMETER_ERROR)
+
+
+@external_image_classify_bp.route("/classify/status", methods=["GET"])
+@app_key_required
+@app_type_required("image_classify", "图片分类应用")
+def external_classify_status():
+    """查询图片分类结果（外部接口，异步分类轮询）"""
+    classification_id = request.args.get("id", type=int)
+    if not classification_id:
+        raise ValidationException("分类记录ID不能为空")
+
+    classification = get_image_classify_service().get_classification(
+        classification_id, g.user_id
+    )
+
+    result = {
+        "id": classification.get("id"),
+        "category_id": classification.get("category_id"),
+        "category_name": classification.get("category_name"),
+        "confidence": classification.get("confidence"),
+        "reasoning": classification.get("reasoning"),
+        "status": classification.get("status"),
+        "error_message": classification.get("error_message"),
+        "tokens_used": classification.get("tokens_used"),
+        "duration_ms": classification.get("duration_ms"),
+    }
+    return success_response(result, "获取图片分类结果成功")
@@ -1,21 +1,14 @@
 # app/api/v1/external/applications/xhs_copy.py
 import logging
-import traceback
 from flask import Blueprint, request, g
 from app.core.responses import success_response
 from app.core.exceptions import ValidationException, NotFoundException, APIException
-from app.core.status_codes import PARAMETER_ERROR, APPLICATION_NOT_FOUND, GENERATION_FAILED
-from app.domains.applications.services.xhs_copy_service import XhsCopyGenerationService
-from app.infrastructure.database.repositories.user_app_repository import UserAppRepository
-from app.infrastructure.database.repositories.xhs_copy_repository import XhsCopyGenerationRepository
-from app.infrastructure.database.repositories.llm_repository import (
-    LLMProviderRepository,
-    LLMModelRepository,
-    LLMProviderConfigRepository
-)
-from app.domains.foundation.services.forbidden_words_service import ForbiddenWordsService
-from app.infrastructure.database.repositories.forbidden_words_repository import ForbiddenWordsRepository
-from app.api.middleware.app_key_auth import app_key_required
+from app.core.status_codes import GENERATION_FAILED
+from app.api.dependencies import get_forbidden_words_service, get_xhs_copy_service
+from app.api.jobs import is_async_request, run_generation_job
+from app.api.middleware.app_key_auth import app_key_required, app_type_required
+from app.api.schemas import GenerateContentRequest, parse_request_body
+from app.infrastructure.tasks.background import submit_background_task
 
 logger = logging.getLogger(__name__)
 
@@ -23,59 +16,28 @@ external_xhs_copy_bp = Blueprint("external_xhs_copy", __name__, url_prefix="/xhs
 
 @external_xhs_copy_bp.route("/generate", methods=["POST"])
 @app_key_required
+@app_type_required("xhs_copy", "小红书文案生成应用", require_published_config=True)
 def external_generate():
     """小红书文案生成API（外部接口）"""
     try:
-        # 获取app_key_auth中间件已验证的应用和用户信息
-        app_key = g.app_key
+        # 获取app_key_auth中间件已验证的应用和用户信息（应用类型和发布状态已由装饰器验证）
         user_id = g.user_id
         app = g.app
 
-        # 验证应用类型和发布状态
-        if app.app_type != "xhs_copy":
-            raise ValidationException("该应用密钥不属于小红书文案生成应用", PARAMETER_ERROR)
-
-        if not app.published or not app.published_config:
-            raise ValidationException("该应用未发布配置", PARAMETER_ERROR)
-
-        # 验证请求数据
-        data = request.get_json()
-        if not data:
-            raise ValidationException("请求数据不能为空", PARAMETER_ERROR)
-
-        # 提取关键参数
-        prompt = data.get("prompt")
-        if not prompt:
-            raise ValidationException("提示词不能为空", PARAMETER_ERROR)
-
-        # 获取其他可选参数
-        image_urls = data.get("image_urls", [])
-        custom_forbidden_words = data.get("forbidden_words", [])
-
-        # 验证图片URL
-        if image_urls:
-            for url in image_urls:
-                if not isinstance(url, str) or not url.startswith(("http://", "https://")):
-                    raise ValidationException(f"无效的图片URL: {url}", PARAMETER_ERROR)
+        # 解析并验证请求数据
+        body = parse_request_body(GenerateContentRequest)
+        prompt = body.prompt
+        image_urls = body.image_urls
+        custom_forbidden_words = body.forbidden_words
 
         # 获取IP和用户代理
-        ip_address = request.remote_addr
-        user_agent = request.headers.get("User-Agent")
-
-        # 初始化存储库和服务
-        db_session = g.db_session
-        generation_repo = XhsCopyGenerationRepository(db_session)
-        user_app_repo = UserAppRepository(db_session)
-        provider_repo = LLMProviderRepository(db_session)
-        model_repo = LLMModelRepository(db_session)
-        llm_provider_config_repo = LLMProviderConfigRepository(db_session)
-        forbidden_words_repo = ForbiddenWordsRepository(db_session)
+        ip_address = g.ip_address
+        user_agent = g.user_agent
 
         # 获取系统预置禁用词
-        forbidden_words_service = ForbiddenWordsService(forbidden_words_repo)
+        forbidden_words_service = get_forbidden_words_service()
         try:
-            system_forbidden_words = [word["word"] for word in 
-                                      forbidden_words_service.get_all_words("xhs_copy")]
+            system_forbidden_words = forbidden_words_service.get_word_texts("xhs_copy")
         except Exception as e:
             logger.warning(f"无法获取系统预置禁用词: {str(e)}")
             system_forbidden_words = []
@@ -83,14 +45,8 @@ def external_generate():
         # 合并系统预置和自定义禁用词
         all_forbidden_words = list(set(system_forbidden_words + custom_forbidden_words))
 
-        # 初始化生成服务
-        generation_service = XhsCopyGenerationService(
-            generation_repo,
-            user_app_repo,
-            provider_repo,
-            model_repo,
-            llm_provider_config_repo,
-        )
+        # 获取生成服务
+        generation_service = get_xhs_copy_service()
 
         # 创建文本生成请求数据
         generation_data = {
@@ -104,6 +60,25 @@ def external_generate():
             "use_published_config": True,
         }
 
+        # 异步模式：创建处理中的记录后立即返回，调用方通过/generation/status轮询结果
+        if is_async_request():
+            forbidden_words = generation_data.pop("forbidden_words")
+            generation, config = generation_service.prepare_generation(**generation_data)
+            submit_background_task(
+                run_generation_job,
+                generation["id"],
+                prompt,
+                image_urls,
+                config,
+                user_id,
+                forbidden_words,
+            )
+            result = {
+                "id": generation["id"],
+                "status": generation["status"],
+            }
+            return success_response(result, "文案生成任务已提交"), 202
+
         # 调用生成服务
         generation = generation_service.create_generation(**generation_data)
 
@@ -145,5 +120,29 @@ def external_generate():
         logger.error(f"API error: {str(e)}")
         raise
     except Exception as e:
-        logger.error(f"Unexpected error: {str(e)}\n{traceback.format_exc()}")
-        raise APIException(f"生成文案失败: {str(e)}", GENERATION_FAILED)
\ No newline at end of file
+        logger.exception("Unexpected error in external xhs copy generation")
+        raise APIException(f"生成文案失败: {str(e)}", GENERATION_FAILED)
+
+
+@external_xhs_copy_bp.route("/generation/status", methods=["GET"])
+@app_key_required
+@app_type_required("xhs_copy", "小红书文案生成应用")
+def external_generation_status():
+    """查询文案生成结果（外部接口，异步生成轮询）"""
+    generation_id = request.args.get("id", type=int)
+    if not generation_id:
+        raise ValidationException("生成记录ID不能为空")
+
+    generation = get_xhs_copy_service().get_generation(generation_id, g.user_id)
+
+    result = {
+        "id": generation.get("id"),
+        "title": generation.get("title"),
+        "content": generation.get("content"),
+        "tags": generation.get("tags"),
+        "status": generation.get("status"),
+        "error_message": generation.get("error_message"),
+        "tokens_used": generation.get("tokens_used"),
+        "duration_ms": generation.get("duration_ms"),
+    }
+    return success_response(result, "获取文案生成结果成功")
@@ -1,9 +1,8 @@
 # app/api/v1/external/forbidden_words.py
-from flask import Blueprint, request, g
+from flask import Blueprint, request
+from app.api.schemas import CheckContentRequest, parse_request_body
 from app.core.responses import success_response
-from app.core.exceptions import ValidationException
-from app.domains.foundation.services.forbidden_words_service import ForbiddenWordsService
-from app.infrastructure.database.repositories.forbidden_words_repository import ForbiddenWordsRepository
+from app.api.dependencies import get_forbidden_words_service
 from app.api.middleware.app_key_auth import app_key_required
 
 external_forbidden_words_bp = Blueprint("external_forbidden_words", __name__, url_prefix="/forbidden_words")
@@ -15,16 +14,11 @@ def get_forbidden_words_list():
     # 获取查询参数
     application = request.args.get("application", "xhs_copy")  # 默认为小红书应用
     
-    # 初始化存储库和服务
-    db_session = g.db_session
-    forbidden_words_repo = ForbiddenWordsRepository(db_session)
-    forbidden_words_service = ForbiddenWordsService(forbidden_words_repo)
+    # 获取服务
+    forbidden_words_service = get_forbidden_words_service()
     
-    # 获取违禁词
-    words = forbidden_words_service.get_all_words(application)
-    
-    # 简化输出，只返回词汇本身
-    simplified_words = [word["word"] for word in words]
+    # 简化输出，只返回词汇本身（由服务缓存，无需每次提取）
+    simplified_words = forbidden_words_service.get_word_texts(application)
     
     return success_response(simplified_words, "获取违禁词列表成功")
 
@@ -33,18 +27,13 @@ def get_forbidden_words_list():
 @app_key_required
 def check_content():
     """检查内容是否包含违禁词（外部调用）"""
-    # 验证请求数据
-    data = request.get_json()
-    if not data or "content" not in data:
-        raise ValidationException("内容不能为空")
-    
-    content = data.get("content")
-    application = data.get("application", "xhs_copy")  # 默认为小红书应用
+    # 解析并验证请求数据（application默认为小红书应用）
+    body = parse_request_body(CheckContentRequest)
+    content = body.content
+    application = body.application
     
-    # 初始化存储库和服务
-    db_session = g.db_session
-    forbidden_words_repo = ForbiddenWordsRepository(db_session)
-    forbidden_words_service = ForbiddenWordsService(forbidden_words_repo)
+    # 获取服务
+    forbidden_words_service = get_forbidden_words_service()
     
     # 检查内容
     passed, detected_words = forbidden_words_service.check_content(content, application)
@@ -1,15 +1,12 @@
 from flask import Blueprint, request, g
-from app.core.responses import success_response
+from app.api.schemas import ConfigIdRequest, parse_request_body, require_json_body
+from app.core.responses import conditional_response, success_response
 from app.core.exceptions import ValidationException
-from app.domains.foundation.services.llm_service import LLMModelService, LLMProviderConfigService, LLMProviderService
-from app.infrastructure.database.repositories.llm_repository import LLMModelRepository, LLMProviderConfigRepository, LLMProviderRepository,LLMProviderRepository
-
-from app.api.middleware.auth import auth_required
-
-
-
-
-from app.infrastructure.database.repositories.user_repository import UserRepository
+from app.api.dependencies import (
+    get_llm_model_service,
+    get_llm_provider_config_service,
+    get_llm_provider_service,
+)
 from app.api.middleware.auth import auth_required
 
 llm_provider_bp = Blueprint("llm_provider", __name__)
@@ -21,10 +18,8 @@ llm_provider_config_bp = Blueprint("llm_provider_config", __name__)
 @auth_required
 def list_providers():
     """获取大模型平台列表"""
-    # 初始化存储库和服务
-    db_session = g.db_session
-    provider_repo = LLMProviderRepository(db_session)
-    provider_service = LLMProviderService(provider_repo)
+    # 获取服务
+    provider_service = get_llm_provider_service()
     
     # 获取提供商列表
     providers = provider_service.get_all_providers()
@@ -43,10 +38,8 @@ def get_provider():
     
     provider_id = data["provider_id"]
     
-    # 初始化存储库和服务
-    db_session = g.db_session
-    provider_repo = LLMProviderRepository(db_session)
-    provider_service = LLMProviderService(provider_repo)
+    # 获取服务
+    provider_service = get_llm_provider_service()
     
     # 获取提供商信息
     provider = provider_service.get_provider(provider_id)
@@ -60,17 +53,13 @@ def list_models():
     # 验证请求数据
 
     data = request.args
-    print(data)
     if not data or "provider_id" not in data:
         raise ValidationException("缺少必填参数: provider_id")
     
     provider_id = data["provider_id"]
     
-    # 初始化存储库和服务
-    db_session = g.db_session
-    model_repo = LLMModelRepository(db_session)
-    provider_repo = LLMProviderRepository(db_session)
-    model_service = LLMModelService(model_repo, provider_repo)
+    # 获取服务
+    model_service = get_llm_model_service()
     
     # 获取模型列表
     models = model_service.get_all_models(provider_id)
@@ -91,11 +80,8 @@ def get_model():
     provider_id = data["provider_id"]
     user_id = g.user_id
     
-    # 初始化存储库和服务
-    db_session = g.db_session
-    model_repo = LLMModelRepository(db_session)
-    provider_repo = LLMProviderRepository(db_session)
-    model_service = LLMModelService(model_repo, provider_repo)
+    # 获取服务
+    model_service = get_llm_model_service()
     
     # 获取模型信息
     model = model_service.get_model(model_id, provider_id, user_id)
@@ -110,33 +96,25 @@ def list_configs():
     """获取用户LLM配置列表"""
     user_id = g.user_id
 
-    # 初始化存储库和服务
-    db_session = g.db_session
-    config_repo = LLMProviderConfigRepository(db_session)
-    config_service = LLMProviderConfigService(config_repo)
+    # 获取服务
+    config_service = get_llm_provider_config_service()
 
     # 获取配置列表
     configs = config_service.get_all_configs(user_id)
 
-    return success_response(configs, "获取用户LLM配置列表成功")
+    return conditional_response(configs, "获取用户LLM配置列表成功")
 
 
 @llm_provider_config_bp.route("/get", methods=["POST"])
 @auth_required
 def get_config():
     """获取特定LLM配置"""
-    # 验证请求数据
-    data = request.get_json()
-    if not data or "config_id" not in data:
-        raise ValidationException("缺少必填参数: config_id")
-
-    config_id = data["config_id"]
+    # 解析并验证请求数据
+    config_id = parse_request_body(ConfigIdRequest).config_id
     user_id = g.user_id
 
-    # 初始化存储库和服务
-    db_session = g.db_session
-    config_repo = LLMProviderConfigRepository(db_session)
-    config_service = LLMProviderConfigService(config_repo)
+    # 获取服务
+    config_service = get_llm_provider_config_service()
 
     # 获取配置
     config = config_service.get_config(config_id, user_id)
@@ -151,18 +129,16 @@ def get_default_config():
     user_id = g.user_id
     provider_type = request.args.get("provider_type")
 
-    # 初始化存储库和服务
-    db_session = g.db_session
-    config_repo = LLMProviderConfigRepository(db_session)
-    config_service = LLMProviderConfigService(config_repo)
+    # 获取服务
+    config_service = get_llm_provider_config_service()
 
     # 获取默认配置
     config = config_service.get_default_config(user_id, provider_type)
 
     if not config:
-        return success_response(None, "未找到默认配置")
+        return conditional_response(None, "未找到默认配置")
 
-    return success_response(config, "获取默认用户LLM配置成功")
+    return conditional_response(config, "获取默认用户LLM配置成功")
 
 
 @llm_provider_config_bp.route("/create", methods=["POST"])
@@ -170,16 +146,12 @@ def get_default_config():
 def create_config():
     """创建用户LLM配置"""
     # 验证请求数据
-    data = request.get_json()
-    if not data:
-        raise ValidationException("请求数据不能为空")
+    data = require_json_body()
 
     user_id = g.user_id
 
-    # 初始化存储库和服务
-    db_session = g.db_session
-    config_repo = LLMProviderConfigRepository(db_session)
-    config_service = LLMProviderConfigService(config_repo)
+    # 获取服务
+    config_service = get_llm_provider_config_service()
 
     # 创建配置
     config = config_service.create_config(data, user_id)
@@ -191,18 +163,14 @@ def create_config():
 @auth_required
 def update_config():
     """更新用户LLM配置"""
-    # 验证请求数据
-    data = request.get_json()
-    if not data or "config_id" not in data:
-        raise ValidationException("缺少必填参数: config_id")
-
-    config_id = data.pop("config_id")
+    # 解析并验证请求数据，config_id以外的字段为更新内容
+    body = parse_request_body(ConfigIdRequest)
+    config_id = body.config_id
+    data = body.model_extra
     user_id = g.user_id
 
-    # 初始化存储库和服务
-    db_session = g.db_session
-    config_repo = LLMProviderConfigRepository(db_session)
-    config_service = LLMProviderConfigService(config_repo)
+    # 获取服务
+    config_service = get_llm_provider_config_service()
 
     # 更新配置
     config = config_service.update_config(config_id, data, user_id)
@@ -214,18 +182,12 @@ def update_config():
 @auth_required
 def delete_config():
     """删除用户LLM配置"""
-    # 验证请求数据
-    data = request.get_json()
-    if not data or "config_id" not in data:
-        raise ValidationException("缺少必填参数: config_id")
-
-    config_id = data["config_id"]
+    # 解析并验证请求数据
+    config_id = parse_request_body(ConfigIdRequest).config_id
     user_id = g.user_id
 
-    # 初始化存储库和服务
-    db_session = g.db_session
-    config_repo = LLMProviderConfigRepository(db_session)
-    config_service = LLMProviderConfigService(config_repo)
+    # 获取服务
+    config_service = get_llm_provider_config_service()
 
     # 删除配置
     config_service.delete_config(config_id, user_id)
@@ -237,18 +199,12 @@ def delete_config():
 @auth_required
 def set_default_config():
     """设置默认用户LLM配置"""
-    # 验证请求数据
-    data = request.get_json()
-    if not data or "config_id" not in data:
-        raise ValidationException("缺少必填参数: config_id")
-
-    config_id = data["config_id"]
+    # 解析并验证请求数据
+    config_id = parse_request_body(ConfigIdRequest).config_id
     user_id = g.user_id
 
-    # 初始化存储库和服务
-    db_session = g.db_session
-    config_repo = LLMProviderConfigRepository(db_session)
-    config_service = LLMProviderConfigService(config_repo)
+    # 获取服务
+    config_service = get_llm_provider_config_service()
 
     # 设置默认配置
     config = config_service.set_default_config(config_id, user_id)
@@ -14,6 +14,18 @@ class Config:
     SQLALCHEMY_DATABASE_URI = "sqlite:///imp.db"
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     
+    # 数据库连接池配置
+    # pool_size应与每个进程的工作线程数相当；pool_pre_ping在取出连接时检测失效连接；
+    # pool_recycle需小于MySQL的wait_timeout，避免使用已被服务端关闭的连接
+    # 各项均可通过环境变量按部署的并发量调整
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        "pool_size": int(os.environ.get("DB_POOL_SIZE", 20)),
+        "max_overflow": int(os.environ.get("DB_MAX_OVERFLOW", 10)),
+        "pool_timeout": int(os.environ.get("DB_POOL_TIMEOUT", 30)),
+        "pool_pre_ping": True,
+        "pool_recycle": int(os.environ.get("DB_POOL_RECYCLE", 1800)),
+    }
+    
     # JWT配置
     JWT_SECRET_KEY = "jwt-secret-key"
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(hours=24)
@@ -35,7 +47,39 @@ class Config:
     QDRANT_URL = "http://localhost:6333"
     
     # Redis配置
-    REDIS_URL = "redis://localhost:6379/0"
+    REDIS_URL = os.environ.get("REDIS_URL", "redis://localhost:6379/0")
+    
+    # 缓存配置：memory（进程内）或redis（多进程共享）。
+    # 修改后需所有进程立即失效的数据（如用户LLM配置）只在redis下缓存
+    CACHE_TYPE = os.environ.get("CACHE_TYPE", "memory")
+    
+    # 后台任务线程数：异步分类等耗时任务在进程内线程池中执行，
+    # 线程数应小于连接池大小，避免后台任务占满数据库连接
+    BACKGROUND_WORKERS = int(os.environ.get("BACKGROUND_WORKERS", 4))
+    
+    # 外部图片分类接口是否批量异步写入分类记录（高并发时减少INSERT次数，
+    # 但同步返回的结果中不含记录ID）
+    CLASSIFY_BUFFERED_HISTORY = os.environ.get("CLASSIFY_BUFFERED_HISTORY", "false").lower() in ("1", "true")
+    
+    # 同步图片分类是否先写入处理中的记录、LLM返回后再更新（需要在分类过程中看到
+    # processing状态时开启）；关闭时在LLM返回后一次性插入最终状态的记录
+    CLASSIFY_TWO_PHASE = os.environ.get("CLASSIFY_TWO_PHASE", "false").lower() in ("1", "true")
+    
+    # 图片分类是否流式接收LLM回复：读到第一个完整的JSON对象即结束调用，不再等待
+    # 其后的解释文字。提前结束时拿不到提供商的usage，分类记录的tokens_used为空（未知）
+    CLASSIFY_STREAM_RESPONSE = os.environ.get("CLASSIFY_STREAM_RESPONSE", "false").lower() in ("1", "true")
+    
+    # 外部图片分类接口未指定async参数时是否默认异步执行（立即返回202，调用方轮询
+    # /classify/status获取结果），避免LLM调用期间长时间占用工作线程
+    EXTERNAL_CLASSIFY_ASYNC_DEFAULT = os.environ.get("EXTERNAL_CLASSIFY_ASYNC_DEFAULT", "false").lower() in ("1", "true")
+    
+    # 文案生成结果缓存时间（秒）：同一用户以相同应用配置、提示词、图片和禁用词
+    # 重复生成时直接返回上次结果，0表示不缓存
+    XHS_RESPONSE_CACHE_TTL = int(os.environ.get("XHS_RESPONSE_CACHE_TTL", 0))
+    
+    # 图片分类结果缓存时间（秒）：同一用户以相同应用配置、图片和分类选项重复分类时
+    # 跳过LLM调用，直接使用上次的分类结果（仍会写入分类记录），0表示不缓存
+    CLASSIFY_RESULT_CACHE_TTL = int(os.environ.get("CLASSIFY_RESULT_CACHE_TTL", 0))
     
     # 日志配置
     LOG_LEVEL = "INFO"
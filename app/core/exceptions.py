@@ -11,38 +11,38 @@ class APIException(Exception):
         super().__init__(self.message)
 
 
-# 具体异常示例
+# 具体异常示例（code为空时使用各自的默认业务状态码）
 class NotFoundException(APIException):
     """资源未找到异常"""
 
-    def __init__(self, message="资源未找到"):
+    def __init__(self, message="资源未找到", code=None):
         from app.core.status_codes import NOT_FOUND
 
-        super().__init__(message, NOT_FOUND, 404)
+        super().__init__(message, code or NOT_FOUND, 404)
 
 
 class AuthenticationException(APIException):
     """认证失败异常"""
 
-    def __init__(self, message="认证失败"):
+    def __init__(self, message="认证失败", code=None):
         from app.core.status_codes import AUTH_FAILED
 
-        super().__init__(message, AUTH_FAILED, 403)
+        super().__init__(message, code or AUTH_FAILED, 403)
 
 
 class ValidationException(APIException):
     """数据验证失败异常"""
 
-    def __init__(self, message="数据验证失败"):
+    def __init__(self, message="数据验证失败", code=None):
         from app.core.status_codes import PARAMETER_ERROR
 
-        super().__init__(message, PARAMETER_ERROR, 200)
+        super().__init__(message, code or PARAMETER_ERROR, 200)
 
 
 class ConflictException(APIException):
     """资源冲突异常"""
 
-    def __init__(self, message="资源已存在"):
+    def __init__(self, message="资源已存在", code=None):
         from app.core.status_codes import PARAMETER_ERROR
 
-        super().__init__(message, PARAMETER_ERROR, 409)
+        super().__init__(message, code or PARAMETER_ERROR, 409)
@@ -1,7 +1,14 @@
 """分页工具"""
-from typing import Dict, Any, List, TypeVar, Tuple, Generic
+import base64
+from datetime import datetime
+from typing import Dict, Any, List, Optional, TypeVar, Tuple, Generic
+
+import orjson
+from sqlalchemy import and_, func, or_
 from sqlalchemy.orm.query import Query
 
+from app.core.exceptions import ValidationException
+
 T = TypeVar('T')
 
 class PaginatedResult(Generic[T]):
@@ -92,4 +99,114 @@ def format_pagination_response(paginated_result: PaginatedResult) -> Dict[str, A
         "pages": paginated_result.pages,
         "has_prev": paginated_result.has_prev,
         "has_next": paginated_result.has_next
-    }
\ No newline at end of file
+    }
+
+def encode_cursor(created_at: Optional[datetime], record_id: Optional[int]) -> Optional[str]:
+    """将最后一条记录的(创建时间, ID)编码为分页游标
+
+    Args:
+        created_at: 记录创建时间
+        record_id: 记录ID
+
+    Returns:
+        URL安全的游标字符串，参数不完整时返回None
+    """
+    if created_at is None or record_id is None:
+        return None
+    raw = orjson.dumps([created_at.isoformat(), record_id])
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """解码分页游标
+
+    Args:
+        cursor: encode_cursor生成的游标字符串
+
+    Returns:
+        (创建时间, 记录ID)
+
+    Raises:
+        ValidationException: 游标格式无效
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, record_id = orjson.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(created_at), int(record_id)
+    except (ValueError, TypeError, orjson.JSONDecodeError):
+        raise ValidationException("无效的分页游标")
+
+def keyset_paginate(
+    query: Query,
+    created_at_column,
+    id_column,
+    cursor: Optional[Tuple[datetime, int]],
+    per_page: int = 20,
+) -> Tuple[List[Any], bool]:
+    """按(创建时间, ID)倒序进行游标分页
+
+    与OFFSET分页不同，数据库可以直接从索引定位到游标之后的位置，
+    翻页成本不随页码增加，也不需要额外的COUNT查询。
+    多取一条记录判断是否还有下一页，避免最后一页恰好满页时多翻一次空页。
+
+    Args:
+        query: SQLAlchemy查询对象
+        created_at_column: 创建时间列
+        id_column: 主键列
+        cursor: 上一页最后一条记录的(创建时间, ID)，为None时从第一条开始
+        per_page: 每页记录数
+
+    Returns:
+        (当前页数据, 是否还有下一页)
+    """
+    if cursor is not None:
+        last_created_at, last_id = cursor
+        query = query.filter(
+            or_(
+                created_at_column < last_created_at,
+                and_(created_at_column == last_created_at, id_column < last_id),
+            )
+        )
+
+    items = (
+        query.order_by(created_at_column.desc(), id_column.desc())
+        .limit(per_page + 1)
+        .all()
+    )
+    return items[:per_page], len(items) > per_page
+
+def offset_paginate(
+    query: Query,
+    count_column,
+    order_by: Tuple[Any, ...],
+    page: int = 1,
+    per_page: int = 20,
+) -> Tuple[List[Any], int]:
+    """按页码分页，总数与当前页数据在同一条SQL中查询
+
+    在SELECT中附加COUNT(*) OVER()窗口函数，每行都带有过滤后的总记录数，
+    省去单独的COUNT查询。页码超出范围时当前页为空、拿不到总数，才再COUNT一次。
+
+    Args:
+        query: SQLAlchemy查询对象（单个实体）
+        count_column: 补充COUNT查询时计数的列，通常为主键
+        order_by: 排序表达式
+        page: 页码，从1开始
+        per_page: 每页记录数
+
+    Returns:
+        (当前页数据, 总记录数)
+    """
+    rows = (
+        query.add_columns(func.count().over().label("total"))
+        .order_by(*order_by)
+        .offset((page - 1) * per_page)
+        .limit(per_page)
+        .all()
+    )
+    if rows:
+        return [row[0] for row in rows], rows[0][1]
+    if page == 1:
+        return [], 0
+
+    total = query.with_entities(func.count(count_column)).order_by(None).scalar()
+    return [], total
@@ -1,10 +1,88 @@
 # app/core/responses.py
+import hashlib
+from typing import Any, Iterable
+
+import orjson
+from flask import Response, request, stream_with_context
+from flask.json.provider import JSONProvider
 from app.core.status_codes import SUCCESS
 
+# orjson选项：允许非字符串键（与标准json行为一致，转为字符串）
+JSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+
+class JSONResponse(Response):
+    """已序列化JSON内容的响应类"""
+
+    default_mimetype = "application/json"
+
+
+def _default(obj):
+    """orjson无法直接处理的对象
+
+    声明了__json_fields__的ORM实例按字段直接读取属性，不经过中间字典格式化；
+    未声明的模型可能含有敏感列，与其他对象一样转为字符串。
+    """
+    fields = getattr(obj, "__json_fields__", None)
+    if fields is not None:
+        return {field: getattr(obj, field) for field in fields}
+    return str(obj)
+
+
+def dumps(data) -> bytes:
+    """使用orjson序列化数据，支持直接传入ORM实例"""
+    return orjson.dumps(data, default=_default, option=JSON_OPTIONS)
+
+
+class ORJSONProvider(JSONProvider):
+    """基于orjson的Flask JSON提供者
+
+    接口响应由success_response直接序列化；注册为app.json后，jsonify、
+    request.get_json以及Flask扩展内部的JSON读写也使用orjson，与之保持一致。
+    """
+
+    def dumps(self, obj, **kwargs) -> str:
+        """序列化为JSON字符串"""
+        return dumps(obj).decode("utf-8")
+
+    def loads(self, s, **kwargs):
+        """解析JSON字符串或字节串"""
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs) -> Response:
+        """生成JSON响应，直接使用orjson输出的字节串"""
+        obj = self._prepare_response_obj(args, kwargs)
+        return JSONResponse(dumps(obj))
+
+
 def success_response(data=None, message="操作成功"):
     """生成标准成功响应"""
-    return {
-        "code": SUCCESS,
-        "message": message,
-        "data": data
-    }
\ No newline at end of file
+    body = dumps(
+        {
+            "code": SUCCESS,
+            "message": message,
+            "data": data
+        }
+    )
+    return JSONResponse(body)
+
+
+def conditional_response(data=None, message="操作成功"):
+    """生成带ETag的成功响应
+
+    ETag为响应体的摘要，请求头If-None-Match与之匹配时返回空body的304，
+    适用于内容变化不频繁、客户端会反复拉取的GET接口。
+    """
+    response = success_response(data, message)
+    response.set_etag(hashlib.blake2b(response.get_data(), digest_size=8).hexdigest())
+    return response.make_conditional(request)
+
+
+def ndjson_response(rows: Iterable[Any]) -> Response:
+    """逐行流式输出NDJSON响应，每行一个JSON对象，内存占用与行数无关"""
+
+    def generate():
+        for row in rows:
+            yield dumps(row) + b"\n"
+
+    return Response(stream_with_context(generate()), mimetype="application/x-ndjson")
@@ -1,11 +1,20 @@
 """数据验证工具"""
+import ipaddress
 import re
+from urllib.parse import urlsplit
 from typing import Dict, Any, List, Optional, Callable, TypeVar, Union
 from app.core.exceptions import ValidationException
 from app.core.status_codes import PARAMETER_ERROR
 
 T = TypeVar('T')
 
+# 图片URL仅允许http/https协议且必须包含主机名，预编译后供请求模型和服务层校验共用
+IMAGE_URL_REGEX = r'^https?://[^\s/?#]+(?:[/?#]\S*)?$'
+IMAGE_URL_PATTERN = re.compile(IMAGE_URL_REGEX)
+
+# 单次请求允许的图片URL数量上限，超出时直接拒绝，不逐个校验
+MAX_IMAGE_URLS = 9
+
 def validate_required_fields(data: Dict[str, Any], required_fields: List[str], error_code: int = PARAMETER_ERROR) -> None:
     """验证必填字段
     
@@ -125,4 +134,47 @@ def validate_list_length(value: List[Any], min_length: Optional[int] = None, max
         return False
     if max_length is not None and len(value) > max_length:
         return False
-    return True
\ No newline at end of file
+    return True
+
+def find_invalid_image_url(urls: List[str]) -> Optional[str]:
+    """查找第一个无效的图片URL
+    
+    Args:
+        urls: 图片URL列表
+        
+    Returns:
+        第一个不符合格式的URL，全部有效时返回None
+    """
+    return next((url for url in urls if not is_valid_image_url(url)), None)
+
+def is_valid_image_url(url: Any) -> bool:
+    """验证图片URL
+    
+    除格式外，拒绝localhost和内网、回环等非公网IP地址：图片由LLM提供商下载，
+    这类地址必然无法访问，提前拒绝可避免一次注定失败的LLM调用。
+    域名不做DNS解析。
+    
+    Args:
+        url: 要验证的URL
+        
+    Returns:
+        是否为有效的图片URL
+    """
+    if not isinstance(url, str) or not IMAGE_URL_PATTERN.match(url):
+        return False
+    
+    try:
+        host = urlsplit(url).hostname
+    except ValueError:
+        return False
+    if not host:
+        return False
+    if host == "localhost" or host.endswith(".localhost"):
+        return False
+    
+    try:
+        address = ipaddress.ip_address(host)
+    except ValueError:
+        # 域名
+        return True
+    return address.is_global
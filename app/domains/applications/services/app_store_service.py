@@ -1,10 +1,18 @@
 from typing import List, Dict, Any, Optional
+from app.infrastructure.cache.memory_cache import MemoryCache
 from app.infrastructure.database.repositories.app_template_repository import (
     AppTemplateRepository,
 )
 from app.core.exceptions import ValidationException, NotFoundException
 from app.core.status_codes import PARAMETER_ERROR, APPLICATION_NOT_FOUND
 
+# 应用模板缓存时间（秒）。模板为系统预置数据，极少变化
+TEMPLATE_CACHE_TTL = 300
+
+# 进程内缓存已格式化的模板数据，避免每次请求查询数据库并重新格式化
+_template_cache = MemoryCache()
+_template_cache.initialize(prefix="app_store", max_size=1000)
+
 class AppStoreService:
     """应用商店服务"""
 
@@ -14,13 +22,42 @@ class AppStoreService:
 
     def get_all_templates(self) -> List[Dict[str, Any]]:
         """获取所有应用模板"""
-        templates = self.app_template_repo.get_all_active()
-        return [self._format_template(template) for template in templates]
+        templates = _template_cache.get("templates")
+        if templates is None:
+            templates = [
+                self._format_template(template)
+                for template in self.app_template_repo.get_all_active()
+            ]
+            _template_cache.set("templates", templates, ttl=TEMPLATE_CACHE_TTL)
+            _template_cache.set(
+                "template_ids",
+                frozenset(str(template["id"]) for template in templates),
+                ttl=TEMPLATE_CACHE_TTL,
+            )
+        return templates
+
+    def _get_template_ids(self) -> frozenset:
+        """获取所有活跃模板ID集合"""
+        template_ids = _template_cache.get("template_ids")
+        if template_ids is None:
+            self.get_all_templates()
+            template_ids = _template_cache.get("template_ids") or frozenset()
+        return template_ids
 
     def get_template_by_id(self, template_id: str) -> Dict[str, Any]:
         """根据ID获取应用模板"""
-        template = self.app_template_repo.get_by_id(template_id)
-        return self._format_template(template)
+        # 不存在的模板ID直接返回，无需查询数据库
+        if str(template_id) not in self._get_template_ids():
+            raise NotFoundException(f"未找到ID为{template_id}的应用模板")
+
+        cache_key = f"template:{template_id}"
+        template = _template_cache.get(cache_key)
+        if template is None:
+            template = self._format_template(
+                self.app_template_repo.get_by_id(template_id)
+            )
+            _template_cache.set(cache_key, template, ttl=TEMPLATE_CACHE_TTL)
+        return template
 
     def _format_template(self, template) -> Dict[str, Any]:
         """格式化应用模板数据"""
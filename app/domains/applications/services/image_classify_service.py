@@ -1,13 +1,18 @@
 """图片分类服务"""
 
+import hashlib
 import logging
 import time
-import traceback
 import json
 import re
-from typing import List, Dict, Any, Optional, Tuple
+from functools import lru_cache
+from typing import Callable, Iterator, List, Dict, Any, Optional, Tuple
 from datetime import datetime, timedelta
 
+import orjson
+from flask import current_app
+
+from app.infrastructure.database.models.image_classify import ImageClassification
 from app.infrastructure.database.repositories.user_app_repository import (
     UserAppRepository,
 )
@@ -21,7 +26,13 @@ from app.infrastructure.database.repositories.llm_repository import (
 )
 
 
+from app.infrastructure.database.session import release_db_connection
 from app.infrastructure.llm_providers.factory import LLMProviderFactory
+from app.infrastructure.tasks.history_writer import BufferedHistoryWriter
+from app.infrastructure.cache.factory import CacheFactory
+from app.infrastructure.cache.singleflight import SingleFlight
+from app.core.pagination import decode_cursor, encode_cursor
+from app.core.validation import is_valid_image_url
 from app.core.exceptions import ValidationException, NotFoundException, APIException
 from app.core.status_codes import (
     APPLICATION_NOT_FOUND,
@@ -33,6 +44,137 @@ from app.core.status_codes import (
 
 logger = logging.getLogger(__name__)
 
+# 应用未配置system_prompt时使用的系统提示词
+DEFAULT_SYSTEM_PROMPT = "你是一位专业的图像分类助手，你的任务是判断图片属于哪个预定义分类。请仔细分析图片内容，如果图片不属于任何分类或信息值太低，请明确表示无法分类。"
+
+# 应用开启json_mode时请求模型只输出JSON对象
+_JSON_RESPONSE_FORMAT = {"type": "json_object"}
+
+# 从LLM响应中提取JSON对象使用的解码器
+_json_decoder = json.JSONDecoder()
+
+# 进程内相同分类输入的并发LLM调用合并：只共享LLM结果，每个请求各自写入分类记录
+_inflight_classifications = SingleFlight()
+
+# 分类记录批量写入器（最多100条或50ms一批），供create_classification_buffered使用
+_history_writer = BufferedHistoryWriter(ImageClassification, max_batch_size=100, max_delay=0.05)
+
+
+class _JsonObjectScanner:
+    """增量扫描流式文本，找出第一个括号平衡且能解析为字典的JSON对象
+
+    逐段追加文本，只扫描新到达的字符；括号深度回到0时尝试解析，
+    解析失败则从该对象起点之后继续查找下一个"{"。
+    """
+
+    def __init__(self):
+        self.text = ""
+        self._pos = 0
+        self._start = -1
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+
+    def feed(self, chunk: str) -> Optional[Dict[str, Any]]:
+        """追加一段文本
+
+        Returns:
+            找到的JSON对象，尚未出现完整对象时返回None
+        """
+        self.text += chunk
+        text = self.text
+        i = self._pos
+        while i < len(text):
+            ch = text[i]
+            if self._start == -1:
+                if ch == "{":
+                    self._start = i
+                    self._depth = 1
+            elif self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif ch == "\\":
+                    self._escaped = True
+                elif ch == '"':
+                    self._in_string = False
+            elif ch == '"':
+                self._in_string = True
+            elif ch == "{":
+                self._depth += 1
+            elif ch == "}":
+                self._depth -= 1
+                if self._depth == 0:
+                    try:
+                        result = orjson.loads(text[self._start:i + 1])
+                    except orjson.JSONDecodeError:
+                        result = None
+                    if isinstance(result, dict):
+                        self._pos = i + 1
+                        return result
+                    # 不是合法对象，从起点的下一个字符重新查找
+                    i = self._start
+                    self._start = -1
+                    self._in_string = False
+                    self._escaped = False
+            i += 1
+        self._pos = i
+        return None
+
+
+def _category_options(categories: List[Dict[str, Any]]) -> Tuple[Tuple[str, str], ...]:
+    """把分类选项转换为可哈希的(分类ID, 分类名称)元组，作为模块级缓存的键"""
+    return tuple((str(category["id"]), category["text"]) for category in categories)
+
+
+@lru_cache(maxsize=256)
+def _category_patterns(options: Tuple[Tuple[str, str], ...]) -> Tuple[Tuple[str, Any], ...]:
+    """为分类选项生成推断分类使用的匹配模式
+
+    Args:
+        options: (分类ID, 分类名称)元组，顺序与请求中的分类选项一致
+
+    Returns:
+        每个分类的(小写名称, ID正则)
+    """
+    return tuple(
+        (text.lower(), re.compile(r'id[:\s]*["\']?' + re.escape(category_id.lower()) + r'["\']?'))
+        for category_id, text in options
+    )
+
+
+@lru_cache(maxsize=1024)
+def _build_user_prompt(options: Tuple[Tuple[str, str], ...]) -> str:
+    """生成分类用户提示词，相同的分类选项直接复用已生成的文本
+
+    Args:
+        options: (分类ID, 分类名称)元组，顺序与请求中的分类选项一致
+    """
+    # 构建分类选项文本
+    categories_text = "\n".join([f"ID: {category_id}, 分类: {text}" for category_id, text in options])
+
+    return f"""请分析下面这张图片，并判断它应该属于以下哪个分类：
+
+        {categories_text}
+
+        请仔细分析图片内容，并给出你的分类结果和推理过程。
+        你的回答必须是以下JSON格式：
+        {{
+        "category_id": "分类ID",
+        "category_name": "分类名称",
+        "confidence": 0.95,
+        "reasoning": "这里是你对分类的推理过程"
+        }}
+
+        只能选择一个最匹配的分类。如果图片内容不清晰、信息值低或不属于任何一个给定分类，请返回以下JSON格式：
+        {{
+        "category_id": null,
+        "category_name": null,
+        "confidence": 0,
+        "reasoning": "这里说明为什么无法对图片进行分类的原因"
+        }}
+
+        置信度为0-1之间的小数，推理过程需要详细说明为什么图片属于该分类或无法分类的原因。"""
+
 
 class ImageClassifyService:
     """图片分类服务"""
@@ -53,13 +195,39 @@ class ImageClassifyService:
         self.llm_provider_config_repo = llm_provider_config_repository
 
     def get_all_classifications(
-        self, user_id: str, page: int = 1, per_page: int = 20, **filters
-    ) -> Tuple[List[Dict[str, Any]], int]:
-        """获取用户所有分类记录"""
-        records, total = self.classify_repo.get_all_by_user(
-            user_id=user_id, page=page, per_page=per_page, **filters
+        self,
+        user_id: str,
+        page: int = 1,
+        per_page: int = 20,
+        cursor: Optional[str] = None,
+        **filters,
+    ) -> Tuple[List[ImageClassification], Optional[int], Optional[str]]:
+        """获取用户所有分类记录
+
+        传入cursor时使用游标分页，此时不计算总数（total为None）；
+        没有下一页时下一页游标为None
+
+        Returns:
+            (分类记录列表, 总数, 下一页游标)
+        """
+        records, total, has_more = self.classify_repo.get_all_by_user(
+            user_id=user_id,
+            page=page,
+            per_page=per_page,
+            cursor=decode_cursor(cursor) if cursor else None,
+            **filters,
         )
-        return [self._format_classification(record) for record in records], total
+
+        next_cursor = None
+        if has_more and records:
+            next_cursor = encode_cursor(records[-1].created_at, records[-1].id)
+
+        # 直接返回ORM实例，由响应序列化按模型的__json_fields__输出
+        return records, total, next_cursor
+
+    def iter_classifications(self, user_id: str, **filters) -> Iterator[ImageClassification]:
+        """逐条迭代用户的分类记录，用于流式导出"""
+        return self.classify_repo.iter_by_user(user_id, **filters)
 
     def get_classification(self, classification_id: int, user_id: str) -> Dict[str, Any]:
         """获取特定分类记录"""
@@ -74,7 +242,8 @@ class ImageClassifyService:
         user_id: str = None,
         ip_address: Optional[str] = None,
         user_agent: Optional[str] = None,
-        use_published_config: bool = False 
+        use_published_config: bool = False,
+        app=None,
     ) -> Dict[str, Any]:
         """创建并执行图片分类
 
@@ -85,94 +254,109 @@ class ImageClassifyService:
             user_id: 用户ID
             ip_address: IP地址
             user_agent: 用户代理
+            app: 调用方已解析的应用（如app_key_auth得到的应用快照），传入时不再查询应用
 
         Returns:
             分类结果
         """
-        start_time = time.time()
+        # 并发的相同分类输入由_classify合并LLM调用，每个请求仍写入自己的分类记录
+        if not current_app.config.get("CLASSIFY_TWO_PHASE", False):
+            # LLM返回后一次性插入最终状态的记录
+            return self._classify_and_persist(
+                image_url, categories, app_id, user_id, ip_address, user_agent,
+                use_published_config, app, self.classify_repo.insert,
+            )
+
+        start_ns = time.perf_counter_ns()
+        classification, config = self.prepare_classification(
+            image_url, categories, app_id, user_id, ip_address, user_agent,
+            use_published_config, app=app,
+        )
+        return self.run_classification(
+            classification["id"], image_url, categories, config, user_id, start_ns
+        )
 
+    def prepare_classification(
+        self,
+        image_url: str,
+        categories: List[Dict[str, str]],
+        app_id: Optional[str] = None,
+        user_id: str = None,
+        ip_address: Optional[str] = None,
+        user_agent: Optional[str] = None,
+        use_published_config: bool = False,
+        app=None,
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """验证输入并创建处理中的分类记录，不调用LLM
+
+        异步分类时先调用此方法立即返回记录，再在后台执行run_classification
+
+        Returns:
+            (分类记录, 应用配置)
+        """
         # 验证数据
         self._validate_classification_input(image_url, categories)
 
-        # 获取应用配置
-        app = self._get_classification_app(app_id, user_id)
-        
-        if use_published_config and app.published and app.published_config:
-            config = app.published_config
-            logger.info(f"使用已发布配置: {app.id}")
-        else:
-            config = app.config
-            logger.info(f"使用应用配置: {app.id}")
+        # 获取应用配置（调用方已解析应用时跳过查询）
+        if app is None:
+            app = self._get_classification_app(app_id, user_id)
+        config = self._select_config(app, use_published_config)
 
         # 创建分类记录
         classification = self._create_classification_record(
             image_url, categories, app.id, user_id, ip_address, user_agent
         )
 
-        try:
-            # 检查配置中是否包含provider_type
-            provider_type = config.get("provider_type")
-            if not provider_type:
-                raise ValidationException("应用配置中未指定provider_type")
-                
-            # 目前图片分类只支持Volcano提供商
-            if provider_type != "Volcano":
-                raise ValidationException("图片分类目前仅支持Volcano提供商", CLASSIFICATION_FAILED)
-
-            # 获取LLM服务
-            llm_provider_config = self._get_llm_provider_config(provider_type, user_id)
-            ai_provider = self._create_llm_provider(llm_provider_config)
+        return self._format_classification(classification), config
 
-            # 准备提示词
-            messages = self._prepare_prompts(config, image_url, categories)
-
-            # 获取模型名称
-            model_id = self._get_model_id(config)
-
-            # 生成分类结果
-            max_tokens = config.get("max_tokens", 2000)
-            temperature = config.get("temperature", 0.2)  # 降低温度增加确定性
+    def run_classification(
+        self,
+        classification_id: int,
+        image_url: str,
+        categories: List[Dict[str, str]],
+        config: Dict[str, Any],
+        user_id: str,
+        start_ns: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """调用LLM完成分类并更新分类记录
 
-            response = self._call_llm_service(
-                ai_provider=ai_provider,
-                messages=messages,
-                model=model_id,
-                max_tokens=max_tokens,
-                temperature=temperature,
-            )
+        Args:
+            classification_id: prepare_classification创建的分类记录ID
+            start_ns: 请求开始时的time.perf_counter_ns()，用于计算处理耗时
 
-            # 解析分类结果
-            parsed_result = self._parse_classification_result(
-                response["message"]["content"], categories
-            )
+        Returns:
+            分类结果
+        """
+        if start_ns is None:
+            start_ns = time.perf_counter_ns()
 
-            # 获取tokens使用量
-            tokens_used = response.get("usage", {}).get("total_tokens", 0)
+        try:
+            result = self._classify(image_url, categories, config, user_id)
 
             # 计算处理时间
-            duration_ms = int((time.time() - start_time) * 1000)
+            duration_ms = (time.perf_counter_ns() - start_ns) // 1_000_000
 
             # 更新分类记录
             updated_classification = self._update_classification_success(
-                classification.id,
+                classification_id,
                 user_id,
-                parsed_result["category_id"],
-                parsed_result["category_name"],
-                parsed_result.get("confidence", 0.0),
-                parsed_result.get("reasoning", ""),
-                tokens_used,
+                result["category_id"],
+                result["category_name"],
+                result["confidence"],
+                result["reasoning"],
+                result["tokens_used"],
                 duration_ms,
-                provider_type,
-                model_id
+                result["provider_type"],
+                result["model_id"]
             )
 
             return self._format_classification(updated_classification)
 
         except Exception as e:
-            logger.error(f"Classification error: {str(e)}\n{traceback.format_exc()}")
+            self._log_classification_error(e)
             # 更新失败状态
             self._update_classification_failure(
-                classification.id, user_id, str(e), int((time.time() - start_time) * 1000)
+                classification_id, user_id, str(e), (time.perf_counter_ns() - start_ns) // 1_000_000
             )
 
             # 重新抛出异常
@@ -180,13 +364,264 @@ class ImageClassifyService:
                 raise
             raise APIException(f"图片分类失败: {str(e)}", CLASSIFICATION_FAILED)
 
+    def create_classification_buffered(
+        self,
+        image_url: str,
+        categories: List[Dict[str, str]],
+        app_id: Optional[str] = None,
+        user_id: str = None,
+        ip_address: Optional[str] = None,
+        user_agent: Optional[str] = None,
+        use_published_config: bool = False,
+        app=None,
+    ) -> Dict[str, Any]:
+        """执行图片分类，分类记录交由批量写入器在后台插入
+
+        省去处理中记录的INSERT和结果UPDATE，适合高并发的外部调用。
+        记录异步落库，返回结果中id为None；需要记录ID的调用方应使用create_classification。
+
+        Returns:
+            分类结果
+        """
+        return self._classify_and_persist(
+            image_url, categories, app_id, user_id, ip_address, user_agent,
+            use_published_config, app, _history_writer.add,
+        )
+
+    def _classify_and_persist(
+        self,
+        image_url: str,
+        categories: List[Dict[str, str]],
+        app_id: Optional[str],
+        user_id: str,
+        ip_address: Optional[str],
+        user_agent: Optional[str],
+        use_published_config: bool,
+        app,
+        persist: Callable[[Dict[str, Any]], Optional[int]],
+    ) -> Dict[str, Any]:
+        """执行分类后一次性写入最终状态（成功、无法分类或失败）的分类记录
+
+        Args:
+            persist: 写入函数，接收记录字段，返回记录ID（异步写入时返回None）
+
+        Returns:
+            分类结果
+        """
+        start_ns = time.perf_counter_ns()
+
+        self._validate_classification_input(image_url, categories)
+        if app is None:
+            app = self._get_classification_app(app_id, user_id)
+        config = self._select_config(app, use_published_config)
+
+        row = {
+            "image_url": image_url,
+            "categories": categories,
+            "app_id": app.id,
+            "user_id": user_id,
+            "ip_address": ip_address,
+            "user_agent": user_agent,
+            "created_at": datetime.now(),
+        }
+
+        try:
+            result = self._classify(image_url, categories, config, user_id)
+        except Exception as e:
+            self._log_classification_error(e)
+            row.update(
+                status="failed",
+                error_message=str(e),
+                duration_ms=(time.perf_counter_ns() - start_ns) // 1_000_000,
+            )
+            persist(row)
+
+            if isinstance(e, APIException):
+                raise
+            raise APIException(f"图片分类失败: {str(e)}", CLASSIFICATION_FAILED)
+
+        row.update(
+            result,
+            status="completed" if result["category_id"] is not None else "unclassified",
+            duration_ms=(time.perf_counter_ns() - start_ns) // 1_000_000,
+        )
+        record_id = persist(row)
+
+        return self._format_classification(ImageClassification(id=record_id, **row))
+
+    def _select_config(self, app, use_published_config: bool) -> Dict[str, Any]:
+        """选择应用配置：外部调用使用已发布配置，否则使用当前配置"""
+        if use_published_config and app.published and app.published_config:
+            logger.info(f"使用已发布配置: {app.id}")
+            return app.published_config
+
+        logger.info(f"使用应用配置: {app.id}")
+        return app.config
+
+    def _classify(
+        self,
+        image_url: str,
+        categories: List[Dict[str, str]],
+        config: Dict[str, Any],
+        user_id: str,
+    ) -> Dict[str, Any]:
+        """调用LLM完成分类，不读写分类记录
+
+        开启CLASSIFY_RESULT_CACHE_TTL时，相同输入直接返回缓存的分类结果，不调用LLM；
+        同一进程内相同输入的并发调用只请求一次LLM，其余调用等待并复用结果。
+
+        Returns:
+            分类结果字段（category_id、category_name、confidence、reasoning、
+            tokens_used、provider_type、model_id）
+        """
+        cache_key = self._result_cache_key(image_url, categories, config, user_id)
+
+        cache_ttl = current_app.config.get("CLASSIFY_RESULT_CACHE_TTL", 0)
+        if cache_ttl > 0:
+            cached = self._get_cached_result(cache_key)
+            if cached is not None:
+                # 命中缓存时未消耗tokens
+                return dict(cached, tokens_used=0)
+
+        result, shared = _inflight_classifications.do(
+            cache_key,
+            lambda: self._classify_with_llm(image_url, categories, config, user_id),
+        )
+        if shared:
+            # 复用并发调用的结果，本次未消耗tokens
+            return dict(result, tokens_used=0)
+
+        if cache_ttl > 0:
+            self._set_cached_result(cache_key, result, cache_ttl)
+        return result
+
+    @staticmethod
+    def _result_cache_key(
+        image_url: str,
+        categories: List[Dict[str, str]],
+        config: Dict[str, Any],
+        user_id: str,
+    ) -> str:
+        """计算分类结果缓存键，包含生效的应用配置，配置修改后自然失效"""
+        options = sorted(
+            (str(category.get("id")), str(category.get("text"))) for category in categories
+        )
+        raw = json.dumps(
+            [user_id, config, image_url, options],
+            ensure_ascii=False,
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.blake2b(raw.encode("utf-8"), digest_size=20).hexdigest()
+
+    def _get_cached_result(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        """读取缓存的分类结果，缓存不可用时视为未命中"""
+        try:
+            return CacheFactory.get_shared_cache("classify_result").get(cache_key)
+        except APIException as e:
+            logger.warning(f"Classification result cache unavailable: {str(e)}")
+            return None
+
+    def _set_cached_result(self, cache_key: str, result: Dict[str, Any], ttl: int) -> None:
+        """缓存分类结果，失败不影响本次返回"""
+        try:
+            CacheFactory.get_shared_cache("classify_result").set(cache_key, result, ttl)
+        except (APIException, TypeError, ValueError) as e:
+            logger.warning(f"Failed to cache classification result: {str(e)}")
+
+    def _classify_with_llm(
+        self,
+        image_url: str,
+        categories: List[Dict[str, str]],
+        config: Dict[str, Any],
+        user_id: str,
+    ) -> Dict[str, Any]:
+        """调用LLM完成分类并解析结果"""
+        # 检查配置中是否包含provider_type
+        provider_type = config.get("provider_type")
+        if not provider_type:
+            raise ValidationException("应用配置中未指定provider_type")
+            
+        # 目前图片分类只支持Volcano提供商
+        if provider_type != "Volcano":
+            raise ValidationException("图片分类目前仅支持Volcano提供商", CLASSIFICATION_FAILED)
+
+        # 获取LLM服务
+        llm_provider_config = self._get_llm_provider_config(provider_type, user_id)
+        ai_provider = self._create_llm_provider(llm_provider_config)
+
+        # 准备提示词
+        messages = self._prepare_prompts(config, image_url, categories)
+
+        # 获取模型名称
+        model_id = self._get_model_id(config)
+
+        # 生成分类结果
+        max_tokens = config.get("max_tokens", 2000)
+        temperature = config.get("temperature", 0.2)  # 降低温度增加确定性
+        # 模型支持JSON模式时由应用配置开启，回复直接是JSON对象，无需从文本中查找
+        extra_params = {}
+        if config.get("json_mode"):
+            extra_params["response_format"] = _JSON_RESPONSE_FORMAT
+
+        # LLM调用耗时较长，调用前归还数据库连接，结果写回时再重新获取
+        # （此前的记录写入均已在存储库中提交，会话中没有未提交的修改）
+        release_db_connection()
+
+        if current_app.config.get("CLASSIFY_STREAM_RESPONSE", False):
+            content, result, usage = self._stream_llm_service(
+                ai_provider=ai_provider,
+                messages=messages,
+                model=model_id,
+                max_tokens=max_tokens,
+                temperature=temperature,
+                **extra_params,
+            )
+            # 提前结束的流式调用拿不到usage，tokens_used记为空（未知）
+            tokens_used = usage.get("total_tokens") if usage else None
+        else:
+            response = self._call_llm_service(
+                ai_provider=ai_provider,
+                messages=messages,
+                model=model_id,
+                max_tokens=max_tokens,
+                temperature=temperature,
+                **extra_params,
+            )
+            content, result = response["message"]["content"], response.get("json_object")
+            tokens_used = response.get("usage", {}).get("total_tokens", 0)
+
+        # 解析分类结果
+        parsed_result = self._parse_classification_result(content, categories, result)
+
+        return {
+            "category_id": parsed_result["category_id"],
+            "category_name": parsed_result["category_name"],
+            "confidence": parsed_result.get("confidence", 0.0),
+            "reasoning": parsed_result.get("reasoning", ""),
+            "tokens_used": tokens_used,
+            "provider_type": provider_type,
+            "model_id": model_id,
+        }
+
+    def _log_classification_error(self, error: Exception) -> None:
+        """记录分类失败
+
+        业务异常（LLM调用失败、配置缺失等）属于预期错误，只记录消息；
+        其他异常才记录堆栈，避免错误高发时反复格式化堆栈。
+        """
+        if isinstance(error, APIException):
+            logger.warning("Classification failed: %s", error.message)
+        else:
+            logger.exception("Classification error: %s", error)
+
     def _validate_classification_input(self, image_url: str, categories: List[Dict[str, str]]) -> None:
         """验证分类输入"""
         if not image_url:
             raise ValidationException("图片URL不能为空", INVALID_IMAGE_URL)
 
         # 验证图片URL格式
-        if not image_url.startswith(("http://", "https://")):
+        if not is_valid_image_url(image_url):
             raise ValidationException(f"无效的图片URL: {image_url}", INVALID_IMAGE_URL)
 
         # 验证分类列表
@@ -234,8 +669,8 @@ class ImageClassifyService:
         if not self.llm_provider_config_repo:
             raise APIException("未配置LLM提供商存储库", CLASSIFICATION_FAILED)
             
-        # 根据provider_type获取用户的默认配置
-        llm_config = self.llm_provider_config_repo.get_default(user_id, provider_type)
+        # 根据provider_type获取用户的默认配置（进程内缓存的快照，不必每次查询数据库）
+        llm_config = self.llm_provider_config_repo.get_default_snapshot(user_id, provider_type)
         if not llm_config:
             raise NotFoundException(
                 f"未找到{provider_type}的LLM配置，请先在LLM设置中配置", CLASSIFICATION_FAILED
@@ -270,7 +705,7 @@ class ImageClassifyService:
                 if llm_provider_config.app_secret:
                     config["app_secret"] = llm_provider_config.app_secret
 
-                return LLMProviderFactory.create_provider(
+                return LLMProviderFactory.get_provider(
                     "volcano", llm_provider_config.api_key, **config
                 )
             else:
@@ -283,39 +718,12 @@ class ImageClassifyService:
             raise APIException(f"创建LLM提供商失败: {str(e)}", CLASSIFICATION_FAILED)
 
     def _prepare_prompts(self, config, image_url, categories):
-        """准备提示词"""
+        """准备提示词（分类选项部分按分类选项缓存，只替换图片URL）"""
         # 系统提示词
-        system_prompt = config.get(
-            "system_prompt", 
-            "你是一位专业的图像分类助手，你的任务是判断图片属于哪个预定义分类。请仔细分析图片内容，如果图片不属于任何分类或信息值太低，请明确表示无法分类。"
-        )
+        system_prompt = config.get("system_prompt", DEFAULT_SYSTEM_PROMPT)
 
-        # 构建分类选项文本
-        categories_text = "\n".join([f"ID: {cat['id']}, 分类: {cat['text']}" for cat in categories])
-        
         # 用户提示词
-        user_prompt = f"""请分析下面这张图片，并判断它应该属于以下哪个分类：
-
-        {categories_text}
-
-        请仔细分析图片内容，并给出你的分类结果和推理过程。
-        你的回答必须是以下JSON格式：
-        {{
-        "category_id": "分类ID",
-        "category_name": "分类名称",
-        "confidence": 0.95,
-        "reasoning": "这里是你对分类的推理过程"
-        }}
-
-        只能选择一个最匹配的分类。如果图片内容不清晰、信息值低或不属于任何一个给定分类，请返回以下JSON格式：
-        {{
-        "category_id": null,
-        "category_name": null,
-        "confidence": 0,
-        "reasoning": "这里说明为什么无法对图片进行分类的原因"
-        }}
-
-        置信度为0-1之间的小数，推理过程需要详细说明为什么图片属于该分类或无法分类的原因。"""
+        user_prompt = _build_user_prompt(_category_options(categories))
 
         # 构建消息
         messages = [
@@ -343,26 +751,57 @@ class ImageClassifyService:
         # 否则使用默认模型
         return "doubao-1.5-vision-pro-32k-250115"  # 默认火山引擎视觉模型
 
-    def _call_llm_service(self, ai_provider, messages, model, max_tokens, temperature):
+    def _call_llm_service(self, ai_provider, messages, model, max_tokens, temperature, **kwargs):
         """调用LLM服务"""
         return ai_provider.generate_chat_completion(
             messages=messages,
             max_tokens=max_tokens,
             temperature=temperature,
             model=model,
+            **kwargs
         )
 
-    def _parse_classification_result(self, content, categories):
+    def _stream_llm_service(self, ai_provider, messages, model, max_tokens, temperature, **kwargs):
+        """流式调用LLM服务，读到第一个完整的JSON对象后立即结束调用
+
+        Returns:
+            (已接收的回复文本, 解析出的JSON对象, usage)。流结束仍未找到对象时
+            JSON对象为None；提前结束调用时拿不到usage，为None
+        """
+        scanner = _JsonObjectScanner()
+        usage = None
+        stream = ai_provider.stream_chat_completion(
+            messages=messages,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            model=model,
+            **kwargs
+        )
+        try:
+            for chunk in stream:
+                usage = chunk.get("usage") or usage
+                if not chunk.get("content"):
+                    continue
+                result = scanner.feed(chunk["content"])
+                if result is not None:
+                    # 提前结束时只有同一块中带回的usage是完整的（不支持流式的提供商一次性返回）
+                    return scanner.text, result, chunk.get("usage")
+        finally:
+            # 关闭底层响应，丢弃剩余输出
+            stream.close()
+        return scanner.text, None, usage
+
+    def _parse_classification_result(self, content, categories, result=None):
         """解析分类结果
         
         尝试从LLM响应中提取JSON格式的分类结果，包含category_id、category_name、confidence和reasoning
-        支持无法分类的情况，返回null值
+        支持无法分类的情况，返回null值。result为流式接收时已解析出的JSON对象
         """
         try:
             # 尝试获取JSON格式的响应
-            json_content = self._extract_json(content)
-            if json_content:
-                result = json.loads(json_content)
+            if result is None:
+                result = self._extract_json(content)
+            if result is not None:
                 
                 # 检查是否为无法分类的情况（空分类）
                 if result.get("category_id") is None and result.get("category_name") is None:
@@ -396,9 +835,11 @@ class ImageClassifyService:
                 valid_ids = [cat["id"] for cat in categories]
                 if result["category_id"] not in valid_ids:
                     logger.warning(f"分类ID不在提供的列表中: {result['category_id']}")
-                    # 尝试匹配最接近的ID
-                    for cat in categories:
-                        if cat["text"].lower() == result["category_name"].lower():
+                    # 尝试按分类名称匹配ID（小写名称按分类选项缓存）
+                    category_name = result["category_name"].lower()
+                    patterns = _category_patterns(_category_options(categories))
+                    for cat, (name, _) in zip(categories, patterns):
+                        if name == category_name:
                             result["category_id"] = cat["id"]
                             break
                 
@@ -415,26 +856,38 @@ class ImageClassifyService:
                 
                 # 无法解析JSON，尝试推断分类
                 return self._guess_classification(content, categories)
-        except Exception as e:
-            logger.error(f"解析分类结果失败: {str(e)}\n{traceback.format_exc()}")
+        except Exception:
+            logger.exception("解析分类结果失败")
             # 尝试推断分类
             return self._guess_classification(content, categories)
 
     def _extract_json(self, text):
-        """从文本中提取JSON格式的内容"""
-        # 尝试正则提取JSON格式内容
-        json_pattern = r'\{(?:[^{}]|(?:\{(?:[^{}]|(?:\{(?:[^{}]|(?:\{[^{}]*\}))*\}))*\}))*\}'
-        matches = re.findall(json_pattern, text)
-        
-        if matches:
-            # 尝试解析找到的每个JSON块
-            for match in matches:
-                try:
-                    json.loads(match)
-                    return match
-                except:
-                    continue
-        
+        """从文本中提取第一个JSON对象并解析
+
+        LLM按要求只返回JSON时直接用orjson整体解析；否则从每个"{"处用标准库的
+        raw_decode尝试解码，解码器在C层完成括号匹配和字符串转义处理，
+        只解析一次，不再先用正则截取、验证后再重复解析。
+
+        Returns:
+            解析得到的字典，未找到时返回None
+        """
+        try:
+            result = orjson.loads(text)
+            if isinstance(result, dict):
+                return result
+        except orjson.JSONDecodeError:
+            pass
+
+        start = text.find("{")
+        while start != -1:
+            try:
+                result, _ = _json_decoder.raw_decode(text, start)
+                if isinstance(result, dict):
+                    return result
+            except ValueError:
+                pass
+            start = text.find("{", start + 1)
+
         return None
 
     def _guess_classification(self, content, categories):
@@ -444,14 +897,13 @@ class ImageClassifyService:
         highest_score = 0
         reasoning = "通过文本分析推断的分类结果"
         
-        # 简单的文本匹配算法
-        for category in categories:
-            category_name = category["text"].lower()
+        # 简单的文本匹配算法（匹配模式按分类选项缓存，不在每次推断时重新编译）
+        patterns = _category_patterns(_category_options(categories))
+        for category, (category_name, id_pattern) in zip(categories, patterns):
             score = content_lower.count(category_name)
             
             # 增加对ID的检测
-            id_match = re.search(r'id[:\s]*["\']?' + re.escape(category["id"]) + r'["\']?', content_lower)
-            if id_match:
+            if id_pattern.search(content_lower):
                 score += 5
             
             if score > highest_score:
@@ -82,9 +82,14 @@ class UserAppService:
         app = self.user_app_repo.create(app_data)
         return self._format_app(app)
 
-    def get_all_apps(self, user_id: str) -> List[Dict[str, Any]]:
-        """获取用户所有应用"""
-        apps = self.user_app_repo.get_all_by_user(user_id)
+    def get_all_apps(
+        self, user_id: str, app_type: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """获取用户所有应用，可按应用类型过滤"""
+        if app_type:
+            apps = self.user_app_repo.get_all_by_type(user_id, app_type)
+        else:
+            apps = self.user_app_repo.get_all_by_user(user_id)
         return [self._format_app(app) for app in apps]
 
     def get_app(self, app_id: str, user_id: str) -> Dict[str, Any]:
@@ -99,6 +104,11 @@ class UserAppService:
             return None
         return self._format_app(app)
 
+    def get_apps_by_keys(self, app_keys: List[str]) -> Dict[str, Dict[str, Any]]:
+        """根据多个应用密钥批量获取应用，不存在的密钥不会出现在结果中"""
+        apps = self.user_app_repo.get_by_app_keys(app_keys)
+        return {app_key: self._format_app(app) for app_key, app in apps.items()}
+
     def get_apps_by_type(self, user_id: str, app_type: str) -> List[Dict[str, Any]]:
         """获取用户特定类型的所有应用"""
         apps = self.user_app_repo.get_all_by_type(user_id, app_type)
@@ -383,7 +393,7 @@ class UserAppService:
 
     def _generate_app_key(self) -> str:
         """生成应用密钥"""
-        return str(uuid.uuid4()).replace("-", "")
+        return uuid.uuid4().hex
 
     def _format_app(self, app) -> Dict[str, Any]:
         """格式化应用数据"""
@@ -1,12 +1,15 @@
 """小红书文案生成服务"""
 
+import hashlib
+import json
 import logging
 import time
-import traceback
-from typing import List, Dict, Any, Optional, Tuple
+from typing import Iterator, List, Dict, Any, Optional, Tuple
 from datetime import datetime, timedelta
 
+from flask import current_app
 
+from app.infrastructure.database.models.xhs_copy_app import XhsCopyGeneration
 from app.infrastructure.database.repositories.user_app_repository import (
     UserAppRepository,
 )
@@ -19,7 +22,11 @@ from app.infrastructure.database.repositories.llm_repository import (
     LLMProviderConfigRepository
 )
 
+from app.infrastructure.database.session import release_db_connection
 from app.infrastructure.llm_providers.factory import LLMProviderFactory
+from app.infrastructure.cache.factory import CacheFactory
+from app.core.pagination import decode_cursor, encode_cursor
+from app.core.validation import MAX_IMAGE_URLS, find_invalid_image_url
 from app.core.exceptions import ValidationException, NotFoundException, APIException
 from app.core.status_codes import (
     APPLICATION_NOT_FOUND,
@@ -29,6 +36,9 @@ from app.core.status_codes import (
 
 logger = logging.getLogger(__name__)
 
+# 结果缓存只保存生成内容，命中时为本次调用写入新的生成记录
+_CACHED_RESPONSE_FIELDS = ("title", "content", "tags", "provider_type", "model_id")
+
 
 class XhsCopyGenerationService:
     """小红书文案生成服务"""
@@ -49,13 +59,39 @@ class XhsCopyGenerationService:
         self.llm_provider_config_repo = llm_provider_config_repository
 
     def get_all_generations(
-        self, user_id: str, page: int = 1, per_page: int = 20, **filters
-    ) -> tuple[List[Dict[str, Any]], int]:
-        """获取用户所有生成记录"""
-        generations, total = self.generation_repo.get_all_by_user(
-            user_id, page, per_page, **filters
+        self,
+        user_id: str,
+        page: int = 1,
+        per_page: int = 20,
+        cursor: Optional[str] = None,
+        **filters,
+    ) -> tuple[List[XhsCopyGeneration], Optional[int], Optional[str]]:
+        """获取用户所有生成记录
+
+        传入cursor时使用游标分页，此时不计算总数（total为None）；
+        没有下一页时下一页游标为None
+
+        Returns:
+            (生成记录列表, 总数, 下一页游标)
+        """
+        generations, total, has_more = self.generation_repo.get_all_by_user(
+            user_id,
+            page,
+            per_page,
+            cursor=decode_cursor(cursor) if cursor else None,
+            **filters,
         )
-        return [self._format_generation(gen) for gen in generations], total
+
+        next_cursor = None
+        if has_more and generations:
+            next_cursor = encode_cursor(generations[-1].created_at, generations[-1].id)
+
+        # 直接返回ORM实例，由响应序列化按模型的__json_fields__输出
+        return generations, total, next_cursor
+
+    def iter_generations(self, user_id: str, **filters) -> Iterator[XhsCopyGeneration]:
+        """逐条迭代用户的生成记录，用于流式导出"""
+        return self.generation_repo.iter_by_user(user_id, **filters)
 
     def get_generation(self, generation_id: int, user_id: str) -> Dict[str, Any]:
         """获取特定生成记录"""
@@ -86,34 +122,101 @@ class XhsCopyGenerationService:
         Returns:
             生成结果
         """
-        start_time = time.time()
+        start_ns = time.perf_counter_ns()
 
         # 验证数据
         self._validate_generation_input(prompt, image_urls)
 
         # 获取应用配置
         app = self._get_generation_app(app_id, user_id)
-        if use_published_config and app.published and app.published_config:
-            config = app.published_config
-            logger.info(f"使用已发布配置: {app.id}")
-        else:
-            config = app.config
-            logger.info(f"使用应用配置: {app.id}")
+        config = self._select_config(app, use_published_config)
+
+        # 相同请求命中结果缓存时跳过LLM调用，复用上次生成的内容，
+        # 但仍为本次调用写入一条独立的生成记录（评分、反馈和用量统计按记录计算）
+        cache_ttl = current_app.config.get("XHS_RESPONSE_CACHE_TTL", 0)
+        cache_key = None
+        if cache_ttl > 0:
+            cache_key = self._response_cache_key(
+                user_id, config, prompt, image_urls, forbidden_words
+            )
+            cached = self._get_cached_response(cache_key)
+            if cached is not None:
+                generation = self._create_generation_record(
+                    prompt, image_urls, app.id, user_id, ip_address, user_agent,
+                    status="completed",
+                    title=cached["title"],
+                    content=cached["content"],
+                    tags=cached["tags"],
+                    tokens_used=0,
+                    provider_type=cached["provider_type"],
+                    model_id=cached["model_id"],
+                    temperature=config.get("temperature", 0.7),
+                    max_tokens=config.get("max_tokens", 800),
+                    duration_ms=(time.perf_counter_ns() - start_ns) // 1_000_000,
+                )
+                return self._format_generation(generation)
 
         # 创建生成记录
         generation = self._create_generation_record(
             prompt, image_urls, app.id, user_id, ip_address, user_agent
         )
 
-         
-        
-        
+        result = self.run_generation(
+            generation.id, prompt, image_urls, config, user_id, forbidden_words, start_ns
+        )
+        if cache_key:
+            self._set_cached_response(cache_key, result, cache_ttl)
+        return result
+
+    def prepare_generation(
+        self,
+        prompt: str,
+        image_urls: List[str],
+        app_id: Optional[str] = None,
+        user_id: str = None,
+        ip_address: Optional[str] = None,
+        user_agent: Optional[str] = None,
+        use_published_config: bool = False,
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """校验输入并创建处理中的生成记录，不调用LLM（异步生成使用）
+
+        Returns:
+            (生成记录, 生效的应用配置)
+        """
+        self._validate_generation_input(prompt, image_urls)
+        app = self._get_generation_app(app_id, user_id)
+        config = self._select_config(app, use_published_config)
+        generation = self._create_generation_record(
+            prompt, image_urls, app.id, user_id, ip_address, user_agent
+        )
+        return self._format_generation(generation), config
+
+    def run_generation(
+        self,
+        generation_id: int,
+        prompt: str,
+        image_urls: List[str],
+        config: Dict[str, Any],
+        user_id: str,
+        forbidden_words: Optional[List[str]] = None,
+        start_ns: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """调用LLM生成文案并更新生成记录
+
+        Args:
+            generation_id: prepare_generation创建的记录ID
+            start_ns: 计时起点（time.perf_counter_ns()），默认为调用时刻
+
+        Returns:
+            更新后的生成记录
+        """
+        if start_ns is None:
+            start_ns = time.perf_counter_ns()
 
         try:
             # 检查配置中是否包含provider_type
-            print("检查配置中是否包含provider_type")
-            print(config)
-            print("---------------------")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Generation %s config: %s", generation_id, config)
             provider_type = config.get("provider_type")
             if not provider_type:
                 raise ValidationException("应用配置中未指定provider_type")
@@ -134,6 +237,10 @@ class XhsCopyGenerationService:
             max_tokens = config.get("max_tokens", 800)
             temperature = config.get("temperature", 0.7)
 
+            # LLM调用耗时较长，调用前归还数据库连接，结果写回时再重新获取
+            # （此前的记录写入均已在存储库中提交，会话中没有未提交的修改）
+            release_db_connection()
+
             response = self._call_llm_service(
                 ai_provider=ai_provider,
                 messages=messages,
@@ -151,11 +258,11 @@ class XhsCopyGenerationService:
             tokens_used = response.get("usage", {}).get("total_tokens", 0)
 
             # 计算处理时间
-            duration_ms = int((time.time() - start_time) * 1000)
+            duration_ms = (time.perf_counter_ns() - start_ns) // 1_000_000
 
             # 更新生成记录
             updated_generation = self._update_generation_success(
-                generation.id,
+                generation_id,
                 user_id,
                 parsed_result["title"],
                 parsed_result["body"],
@@ -171,10 +278,10 @@ class XhsCopyGenerationService:
             return self._format_generation(updated_generation)
 
         except Exception as e:
-            logger.error(f"Generation error: {str(e)}\n{traceback.format_exc()}")
+            logger.exception("Generation error")
             # 更新失败状态
             self._update_generation_failure(
-                generation.id, user_id, str(e), int((time.time() - start_time) * 1000)
+                generation_id, user_id, str(e), (time.perf_counter_ns() - start_ns) // 1_000_000
             )
 
             # 重新抛出异常
@@ -182,16 +289,62 @@ class XhsCopyGenerationService:
                 raise
             raise APIException(f"生成文案失败: {str(e)}", GENERATION_FAILED)
 
+    def _select_config(self, app, use_published_config: bool) -> Dict[str, Any]:
+        """选择生效的应用配置：优先使用已发布配置"""
+        if use_published_config and app.published and app.published_config:
+            logger.info(f"使用已发布配置: {app.id}")
+            return app.published_config
+        logger.info(f"使用应用配置: {app.id}")
+        return app.config
+
+    @staticmethod
+    def _response_cache_key(
+        user_id: str,
+        config: Dict[str, Any],
+        prompt: str,
+        image_urls: List[str],
+        forbidden_words: Optional[List[str]],
+    ) -> str:
+        """计算结果缓存键，包含生效的应用配置，配置修改后自然失效"""
+        raw = json.dumps(
+            [user_id, config, prompt, sorted(image_urls or []), sorted(forbidden_words or [])],
+            ensure_ascii=False,
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.blake2b(raw.encode("utf-8"), digest_size=20).hexdigest()
+
+    def _get_cached_response(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        """读取缓存的生成结果，缓存不可用时视为未命中"""
+        try:
+            return CacheFactory.get_shared_cache("xhs_response").get(cache_key)
+        except APIException as e:
+            logger.warning(f"Generation response cache unavailable: {str(e)}")
+            return None
+
+    def _set_cached_response(self, cache_key: str, result: Dict[str, Any], ttl: int) -> None:
+        """缓存生成内容（不含记录ID等记录字段），失败不影响本次返回"""
+        if result.get("status") != "completed":
+            return
+        content = {field: result[field] for field in _CACHED_RESPONSE_FIELDS}
+        try:
+            CacheFactory.get_shared_cache("xhs_response").set(cache_key, content, ttl)
+        except (APIException, TypeError, ValueError) as e:
+            logger.warning(f"Failed to cache generation response: {str(e)}")
+
     def _validate_generation_input(self, prompt: str, image_urls: List[str]) -> None:
         """验证生成输入"""
         if not prompt:
             raise ValidationException("提示词不能为空", PARAMETER_ERROR)
 
+        if image_urls and len(image_urls) > MAX_IMAGE_URLS:
+            raise ValidationException(f"图片数量不能超过{MAX_IMAGE_URLS}张")
+
         # 验证图片URL格式
         if image_urls:
-            for url in image_urls:
-                if not url.startswith(("http://", "https://")):
-                    raise ValidationException(f"无效的图片URL: {url}", PARAMETER_ERROR)
+            invalid_url = find_invalid_image_url(image_urls)
+            if invalid_url is not None:
+                raise ValidationException(f"无效的图片URL: {invalid_url}", PARAMETER_ERROR)
 
     def _get_generation_app(self, app_id: Optional[str], user_id: str):
         """获取生成应用配置"""
@@ -211,9 +364,9 @@ class XhsCopyGenerationService:
         return self.user_app_repo.get_by_id(app_id, user_id)
 
     def _create_generation_record(
-        self, prompt, image_urls, app_id, user_id, ip_address, user_agent
+        self, prompt, image_urls, app_id, user_id, ip_address, user_agent, **fields
     ):
-        """创建生成记录"""
+        """创建生成记录，默认为处理中状态，fields可直接写入最终状态的字段"""
         generation_data = {
             "prompt": prompt,
             "image_urls": image_urls,
@@ -223,6 +376,7 @@ class XhsCopyGenerationService:
             "user_agent": user_agent,
             "status": "processing",
         }
+        generation_data.update(fields)
         return self.generation_repo.create(generation_data)
 
     def _get_llm_provider_config(self, provider_type: str, user_id: str):
@@ -230,8 +384,8 @@ class XhsCopyGenerationService:
         if not self.llm_provider_config_repo:
             raise APIException("未配置LLM提供商存储库", GENERATION_FAILED)
             
-        # 根据provider_type获取用户的默认配置
-        llm_config = self.llm_provider_config_repo.get_default(user_id, provider_type)
+        # 根据provider_type获取用户的默认配置（进程内缓存的快照，不必每次查询数据库）
+        llm_config = self.llm_provider_config_repo.get_default_snapshot(user_id, provider_type)
         if not llm_config:
             raise NotFoundException(
                 f"未找到{provider_type}的LLM配置，请先在LLM设置中配置", GENERATION_FAILED
@@ -254,7 +408,7 @@ class XhsCopyGenerationService:
                         "您尚未配置OpenAI API密钥", GENERATION_FAILED
                     )
 
-                return LLMProviderFactory.create_provider(
+                return LLMProviderFactory.get_provider(
                     "openai",
                     llm_provider_config.api_key,
                     api_base_url=llm_provider_config.api_base_url,
@@ -268,7 +422,7 @@ class XhsCopyGenerationService:
                         "您尚未配置Claude API密钥", GENERATION_FAILED
                     )
 
-                return LLMProviderFactory.create_provider(
+                return LLMProviderFactory.get_provider(
                     "anthropic",
                     llm_provider_config.api_key,
                     api_base_url=llm_provider_config.api_base_url,
@@ -293,7 +447,7 @@ class XhsCopyGenerationService:
                 if llm_provider_config.app_secret:
                     config["app_secret"] = llm_provider_config.app_secret
 
-                return LLMProviderFactory.create_provider(
+                return LLMProviderFactory.get_provider(
                     "volcano", llm_provider_config.api_key, **config
                 )
             else:
@@ -103,12 +103,10 @@ class AuthService:
         # 解密密码
         try:
             password = decrypt_with_private_key(encrypted_password)
-            print(password)
         except Exception as e:
 
             logger.error(f"Password decryption failed: {str(e)}")
             raise ValidationException("密码解密失败")
-        print("------1----------------")
 
         # 检查手机号是否已注册
         if self.auth_repo.find_user_by_phone(phone):
@@ -118,7 +116,6 @@ class AuthService:
         try:
             # 密码加盐哈希
             password_hash = generate_password_hash(password, method="pbkdf2:sha256")
-            print(password_hash)
 
             # 注册用户
             user = self.auth_repo.register_user(
@@ -142,8 +139,6 @@ class AuthService:
                 "token": token,
             }
         except Exception as e:
-            print("注册失败")
-            print(e)
             logger.error(f"Registration failed: {str(e)}")
             raise APIException(f"注册失败: {str(e)}", AUTH_FAILED)
 
@@ -269,7 +264,6 @@ class AuthService:
         except Exception as e:
             if isinstance(e, (AuthenticationException, ValidationException)):
                 raise
-            print(e)
             logger.error(f"Login error: {str(e)}")
             raise ValidationException("登录过程中发生错误")
 
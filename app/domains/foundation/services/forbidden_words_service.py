@@ -16,8 +16,9 @@ class ForbiddenWordsService:
     def __init__(self, forbidden_words_repository: ForbiddenWordsRepository):
         """初始化服务"""
         self.repository = forbidden_words_repository
+        # {应用场景: (缓存时间, 违禁词列表, 词汇列表, 小写词汇列表)}，
+        # 服务实例在进程内共享，读写单个键避免竞态
         self._cache = {}
-        self._cache_time = {}
         self._cache_duration = 300  # 缓存5分钟
     
     def check_content(self, content: str, application: str) -> Tuple[bool, List[str]]:
@@ -34,18 +35,12 @@ class ForbiddenWordsService:
         if not content:
             return True, []
             
-        # 获取违禁词列表
-        words = self._get_forbidden_words(application)
-        
-        # 检测到的违禁词
-        detected_words = []
+        # 获取预先转为小写的违禁词
+        lowered_words = self._get_cache_entry(application)[3]
         
         # 简单匹配
         content_lower = content.lower()
-        for word_info in words:
-            word = word_info["word"].lower()
-            if word in content_lower:
-                detected_words.append(word)
+        detected_words = [word for word in lowered_words if word in content_lower]
         
         return len(detected_words) == 0, detected_words
     
@@ -83,6 +78,18 @@ class ForbiddenWordsService:
         """
         return self._get_forbidden_words(application)
     
+    def get_word_texts(self, application: str) -> List[str]:
+        """
+        获取特定应用的违禁词词汇（不含其他字段）
+        
+        Args:
+            application: 应用场景
+            
+        Returns:
+            词汇列表
+        """
+        return self._get_cache_entry(application)[2]
+    
     def get_word(self, word_id: int) -> Dict[str, Any]:
         """
         获取特定违禁词
@@ -124,9 +131,7 @@ class ForbiddenWordsService:
         word = self.repository.add_word(word_data)
         
         # 清除缓存
-        if word.application in self._cache:
-            del self._cache[word.application]
-            del self._cache_time[word.application]
+        self._cache.pop(word.application, None)
         
         return self.repository._format_word(word)
     
@@ -154,9 +159,7 @@ class ForbiddenWordsService:
         updated_word = self.repository.update_word(word_id, word_data)
         
         # 清除缓存
-        if updated_word.application in self._cache:
-            del self._cache[updated_word.application]
-            del self._cache_time[updated_word.application]
+        self._cache.pop(updated_word.application, None)
         
         return self.repository._format_word(updated_word)
     
@@ -181,9 +184,7 @@ class ForbiddenWordsService:
         result = self.repository.delete_word(word_id)
         
         # 清除缓存
-        if application in self._cache:
-            del self._cache[application]
-            del self._cache_time[application]
+        self._cache.pop(application, None)
         
         return result
     
@@ -233,8 +234,7 @@ class ForbiddenWordsService:
         Returns:
             格式化的提示词
         """
-        words = self._get_forbidden_words(application)
-        word_list = ", ".join([word["word"] for word in words])
+        word_list = ", ".join(self.get_word_texts(application))
         
         return f"""请确保您生成的内容不包含以下违禁词：
 {word_list}
@@ -251,21 +251,35 @@ class ForbiddenWordsService:
         Returns:
             违禁词列表
         """
+        return self._get_cache_entry(application)[1]
+    
+    def _get_cache_entry(self, application: str) -> Tuple[datetime, List[Dict[str, Any]], List[str], List[str]]:
+        """
+        获取特定应用的违禁词缓存项，过期时从数据库重新加载
+        
+        词汇列表和小写词汇列表随缓存一起生成，列表接口和内容检测无需每次重新提取。
+        
+        Args:
+            application: 应用场景
+            
+        Returns:
+            (缓存时间, 违禁词列表, 词汇列表, 小写词汇列表)
+        """
         # 检查缓存
         current_time = datetime.now()
-        if (application in self._cache and 
-            application in self._cache_time and 
-            (current_time - self._cache_time[application]).total_seconds() < self._cache_duration):
-            return self._cache[application]
+        cached = self._cache.get(application)
+        if cached is not None and (current_time - cached[0]).total_seconds() < self._cache_duration:
+            return cached
         
         # 从数据库加载
         words = self.repository.get_all_words(application)
+        texts = [word["word"] for word in words]
         
         # 更新缓存
-        self._cache[application] = words
-        self._cache_time[application] = current_time
+        cached = (current_time, words, texts, [text.lower() for text in texts])
+        self._cache[application] = cached
         
-        return words
+        return cached
     
     def _log_detection(self, content: str, detected_words: List[str], application: str) -> None:
         """
@@ -1,13 +1,24 @@
 """LLM 相关服务"""
 import logging
+import uuid
 from typing import List, Dict, Any, Optional, Tuple
 from app.infrastructure.database.repositories.llm_repository import LLMProviderConfigRepository, LLMProviderRepository, LLMModelRepository
 
-from app.infrastructure.database.repositories.user_repository import UserRepository
-from app.core.exceptions import ValidationException, ConflictException, NotFoundException
+from app.infrastructure.cache.factory import CacheFactory
+from app.infrastructure.cache.memory_cache import MemoryCache
+from app.core.exceptions import APIException, ValidationException, ConflictException, NotFoundException
 from app.core.status_codes import PROVIDER_VALIDATION_ERROR, PROVIDER_ALREADY_EXISTS, MODEL_VALIDATION_ERROR
 
 logger = logging.getLogger(__name__)
+
+# 提供商和模型目录缓存时间（秒）。目录为系统预置数据，仅管理员维护
+CATALOG_CACHE_TTL = 300
+
+# 进程内缓存已格式化的提供商/模型数据，避免每次请求查询数据库并重新格式化
+_catalog_cache = MemoryCache()
+_catalog_cache.initialize(prefix="llm_catalog", max_size=1000)
+
+
 class LLMProviderService:
     """AI提供商服务"""
     
@@ -28,8 +39,14 @@ class LLMProviderService:
         返回:
             提供商列表
         """
-        providers = self.provider_repo.get_all_providers()
-        return [self._format_provider(provider) for provider in providers]
+        providers = _catalog_cache.get("providers")
+        if providers is None:
+            providers = [
+                self._format_provider(provider)
+                for provider in self.provider_repo.get_all_providers()
+            ]
+            _catalog_cache.set("providers", providers, ttl=CATALOG_CACHE_TTL)
+        return providers
     
     def get_provider(self, provider_id: int) -> Dict[str, Any]:
         """
@@ -41,8 +58,12 @@ class LLMProviderService:
         返回:
             提供商信息
         """
-        provider = self.provider_repo.get_by_id(provider_id)
-        return self._format_provider(provider)
+        cache_key = f"provider:{provider_id}"
+        provider = _catalog_cache.get(cache_key)
+        if provider is None:
+            provider = self._format_provider(self.provider_repo.get_by_id(provider_id))
+            _catalog_cache.set(cache_key, provider, ttl=CATALOG_CACHE_TTL)
+        return provider
     
     def get_provider_by_type(self, provider_type: str) -> Dict[str, Any]:
         """
@@ -111,6 +132,7 @@ class LLMProviderService:
         # 创建提供商
         try:
             provider = self.provider_repo.create(provider_data)
+            _catalog_cache.flush()
             return self._format_provider(provider)
         except Exception as e:
             raise ConflictException(
@@ -135,6 +157,7 @@ class LLMProviderService:
         
         # 更新提供商
         provider = self.provider_repo.update(provider_id, provider_data)
+        _catalog_cache.flush()
         return self._format_provider(provider)
     
     def delete_provider(self, provider_id: int) -> bool:
@@ -147,7 +170,9 @@ class LLMProviderService:
         返回:
             操作是否成功
         """
-        return self.provider_repo.delete(provider_id)
+        result = self.provider_repo.delete(provider_id)
+        _catalog_cache.flush()
+        return result
     
     def _validate_provider_data(self, data: Dict[str, Any], is_update: bool = False) -> None:
         """
@@ -253,6 +278,11 @@ class LLMModelService:
         返回:
             模型列表
         """
+        cache_key = f"models:{provider_id or ''}:{model_type or ''}"
+        cached = _catalog_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
         if provider_id:
             # 验证提供商存在
             self.provider_repo.get_by_id(provider_id)
@@ -262,7 +292,9 @@ class LLMModelService:
         else:
             models = self.model_repo.get_all_models()
             
-        return [self._format_model(model) for model in models]
+        formatted = [self._format_model(model) for model in models]
+        _catalog_cache.set(cache_key, formatted, ttl=CATALOG_CACHE_TTL)
+        return formatted
     
     def get_model(self, model_id: int) -> Dict[str, Any]:
         """
@@ -274,8 +306,12 @@ class LLMModelService:
         返回:
             模型信息
         """
-        model = self.model_repo.get_by_id(model_id)
-        return self._format_model(model)
+        cache_key = f"model:{model_id}"
+        model = _catalog_cache.get(cache_key)
+        if model is None:
+            model = self._format_model(self.model_repo.get_by_id(model_id))
+            _catalog_cache.set(cache_key, model, ttl=CATALOG_CACHE_TTL)
+        return model
     
     def get_model_by_model_id(self, model_id_str: str) -> Dict[str, Any]:
         """
@@ -287,8 +323,12 @@ class LLMModelService:
         返回:
             模型信息
         """
-        model = self.model_repo.get_by_model_id(model_id_str)
-        return self._format_model(model)
+        cache_key = f"model_id:{model_id_str}"
+        model = _catalog_cache.get(cache_key)
+        if model is None:
+            model = self._format_model(self.model_repo.get_by_model_id(model_id_str))
+            _catalog_cache.set(cache_key, model, ttl=CATALOG_CACHE_TTL)
+        return model
     
     def create_model(self, model_data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -316,6 +356,7 @@ class LLMModelService:
         
         # 创建模型
         model = self.model_repo.create(model_data)
+        _catalog_cache.flush()
         return self._format_model(model)
     
     def update_model(self, model_id: int, model_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -335,6 +376,7 @@ class LLMModelService:
         
         # 更新模型
         model = self.model_repo.update(model_id, model_data)
+        _catalog_cache.flush()
         return self._format_model(model)
     
     def delete_model(self, model_id: int) -> bool:
@@ -347,7 +389,9 @@ class LLMModelService:
         返回:
             操作是否成功
         """
-        return self.model_repo.delete(model_id)
+        result = self.model_repo.delete(model_id)
+        _catalog_cache.flush()
+        return result
     
     def _validate_model_data(self, data: Dict[str, Any], is_update: bool = False) -> None:
         """
@@ -418,28 +462,106 @@ class LLMModelService:
 class LLMProviderConfigService:
     """用户LLM配置服务"""
 
+    # 配置读取结果的缓存时间（秒）
+    CACHE_TTL = 300
+
     def __init__(self, config_repository: LLMProviderConfigRepository):
-        """初始化服务"""
+        """初始化服务
+
+        配置修改后所有工作进程都必须立即读到新配置，因此只使用跨进程的Redis缓存；
+        未配置Redis或Redis不可用时不缓存，直接读取数据库。
+        """
         self.config_repo = config_repository
+        self.cache = CacheFactory.get_cross_process_cache("llm_config")
 
     def get_all_configs(self, user_id: str) -> List[Dict[str, Any]]:
-        """获取用户所有LLM配置"""
+        """获取用户所有LLM配置
+
+        列表接口按返回内容计算ETag，缓存的列表必须在配置修改后对所有进程立即失效，
+        否则客户端会对旧数据收到304；因此与单个配置一样只使用跨进程缓存。
+        """
+        cache_key = self._cache_key(user_id, "list")
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached["value"]
+
         configs = self.config_repo.get_all_by_user(user_id)
-        return [self._format_config(config) for config in configs]
+        result = [self._format_config(config) for config in configs]
+        self._cache_set(cache_key, {"value": result})
+        return result
 
     def get_config(self, config_id: int, user_id: str) -> Dict[str, Any]:
         """获取特定LLM配置"""
-        config = self.config_repo.get_by_id(config_id, user_id)
-        return self._format_config(config)
+        cache_key = self._cache_key(user_id, f"config:{config_id}")
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached["value"]
+
+        config = self._format_config(self.config_repo.get_by_id(config_id, user_id))
+        self._cache_set(cache_key, {"value": config})
+        return config
 
     def get_default_config(
         self, user_id: str, provider_type: Optional[str] = None
     ) -> Optional[Dict[str, Any]]:
         """获取默认LLM配置"""
+        cache_key = self._cache_key(user_id, f"default:{provider_type or ''}")
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached["value"]
+
         config = self.config_repo.get_default(user_id, provider_type)
-        if not config:
+        result = self._format_config(config) if config else None
+        self._cache_set(cache_key, {"value": result})
+        return result
+
+    def _cache_key(self, user_id: str, name: str) -> Optional[str]:
+        """生成带用户版本标记的缓存键，不使用缓存时返回None
+
+        版本标记是随机字符串而不是递增计数：配置变更时写入新标记，旧标记下的
+        缓存项自然失效；版本键被淘汰时同样生成新标记，不会回到旧版本重新
+        命中过期数据。
+        """
+        if self.cache is None:
+            return None
+        version_key = f"{user_id}:version"
+        try:
+            version = self.cache.get(version_key)
+            if version is None:
+                version = uuid.uuid4().hex
+                self.cache.set(version_key, version)
+        except APIException as e:
+            logger.warning(f"Failed to read llm config cache version: {str(e)}")
+            return None
+        return f"{user_id}:{version}:{name}"
+
+    def _cache_get(self, key: Optional[str]) -> Optional[Dict[str, Any]]:
+        """读取缓存，缓存不可用时返回None"""
+        if key is None:
+            return None
+        try:
+            return self.cache.get(key)
+        except APIException as e:
+            logger.warning(f"Failed to read llm config cache: {str(e)}")
             return None
-        return self._format_config(config)
+
+    def _cache_set(self, key: Optional[str], value: Dict[str, Any]) -> None:
+        """写入缓存，缓存不可用时忽略"""
+        if key is None:
+            return
+        try:
+            self.cache.set(key, value, ttl=self.CACHE_TTL)
+        except APIException as e:
+            logger.warning(f"Failed to write llm config cache: {str(e)}")
+
+    def _invalidate_cache(self, user_id: str) -> None:
+        """使用户的配置缓存失效"""
+        if self.cache is None:
+            return
+        try:
+            self.cache.set(f"{user_id}:version", uuid.uuid4().hex)
+        except APIException as e:
+            logger.warning(f"Failed to invalidate llm config cache: {str(e)}")
 
     def create_config(
         self, config_data: Dict[str, Any], user_id: str
@@ -468,6 +590,7 @@ class LLMProviderConfigService:
 
         # 创建配置
         config = self.config_repo.create(config_data)
+        self._invalidate_cache(user_id)
         return self._format_config(config)
 
     def update_config(
@@ -486,17 +609,13 @@ class LLMProviderConfigService:
             # 取消其他同类型配置的默认状态
             provider_type = config_data.get("provider_type", current_config.provider_type)
             try:
-                existing_configs = self.config_repo.get_all_by_user(user_id)
-                for config in existing_configs:
-                    if (config.id != config_id and 
-                        config.provider_type == provider_type and 
-                        config.is_default):
-                        self.config_repo.update(config.id, user_id, {"is_default": False})
+                self.config_repo.clear_default(user_id, provider_type, exclude_id=config_id)
             except Exception as e:
                 logger.error(f"Failed to reset default status: {str(e)}")
 
         # 更新配置
         config = self.config_repo.update(config_id, user_id, config_data)
+        self._invalidate_cache(user_id)
         return self._format_config(config)
 
     def delete_config(self, config_id: int, user_id: str) -> bool:
@@ -508,34 +627,24 @@ class LLMProviderConfigService:
         if config.is_default:
             # 尝试将同类型的另一个配置设为默认
             try:
-                other_configs = self.config_repo.get_all_by_user(user_id)
-                alternatives = [c for c in other_configs 
-                               if c.id != config_id and c.provider_type == config.provider_type]
-                
-                if alternatives:
-                    # 选择第一个替代配置设为默认
-                    self.config_repo.update(alternatives[0].id, user_id, {"is_default": True})
+                alternative = self.config_repo.get_alternative(
+                    user_id, config.provider_type, config_id
+                )
+                if alternative:
+                    self.config_repo.update(alternative.id, user_id, {"is_default": True})
             except Exception as e:
                 logger.error(f"Failed to set alternative default config: {str(e)}")
         
-        return self.config_repo.delete(config_id, user_id)
+        result = self.config_repo.delete(config_id, user_id)
+        self._invalidate_cache(user_id)
+        return result
 
     def set_default_config(self, config_id: int, user_id: str) -> Dict[str, Any]:
         """设置默认LLM配置"""
-        # 获取当前配置
-        config = self.config_repo.get_by_id(config_id, user_id)
-        
         try:
-            # 取消同类型其他配置的默认状态
-            other_configs = self.config_repo.get_all_by_user(user_id)
-            for other_config in other_configs:
-                if (other_config.id != config_id and 
-                    other_config.provider_type == config.provider_type and 
-                    other_config.is_default):
-                    self.config_repo.update(other_config.id, user_id, {"is_default": False})
-            
-            # 设置当前配置为默认
+            # 设置当前配置为默认（存储库在同一事务中取消同类型其他配置的默认状态）
             config = self.config_repo.set_as_default(config_id, user_id)
+            self._invalidate_cache(user_id)
             return self._format_config(config)
         except Exception as e:
             logger.error(f"Failed to set default config: {str(e)}")
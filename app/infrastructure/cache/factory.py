@@ -0,0 +1,116 @@
+"""缓存工厂模块，负责创建和管理缓存实例"""
+import logging
+import threading
+from typing import Dict, Optional
+
+from flask import current_app
+
+from app.infrastructure.cache.base import CacheInterface
+from app.infrastructure.cache.memory_cache import MemoryCache
+from app.infrastructure.cache.redis_cache import RedisCache
+from app.core.exceptions import APIException
+from app.core.status_codes import EXTERNAL_API_ERROR
+
+logger = logging.getLogger(__name__)
+
+
+class CacheFactory:
+    """缓存工厂类，负责创建和管理缓存实例"""
+
+    # 支持的缓存类型映射
+    CACHES = {
+        "memory": MemoryCache,
+        "redis": RedisCache,
+    }
+
+    # 已创建的共享缓存实例：{名称: 缓存实例}
+    _instances: Dict[str, CacheInterface] = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def create_cache(cls, cache_type: str, **config) -> CacheInterface:
+        """创建缓存实例
+
+        Args:
+            cache_type: 缓存类型，如"memory"、"redis"
+            **config: 配置参数，传递给缓存实例的initialize方法
+
+        Returns:
+            初始化好的缓存实例
+
+        Raises:
+            APIException: 如果缓存类型不支持或初始化失败
+        """
+        cache_type = cache_type.lower()
+
+        if cache_type not in cls.CACHES:
+            logger.error(f"Unsupported cache type: {cache_type}")
+            raise APIException(
+                f"不支持的缓存类型: {cache_type}，支持的类型: {', '.join(cls.CACHES.keys())}",
+                EXTERNAL_API_ERROR,
+            )
+
+        cache = cls.CACHES[cache_type]()
+        cache.initialize(**config)
+        return cache
+
+    @classmethod
+    def get_shared_cache(cls, name: str) -> CacheInterface:
+        """获取按名称共享的缓存实例
+
+        缓存类型由应用配置CACHE_TYPE决定，Redis不可用时退回到进程内存缓存。
+        同一名称在进程内只创建一次。
+
+        Args:
+            name: 缓存名称，同时作为键前缀
+
+        Returns:
+            缓存实例
+        """
+        cache = cls._instances.get(name)
+        if cache is not None:
+            return cache
+
+        with cls._lock:
+            cache = cls._instances.get(name)
+            if cache is not None:
+                return cache
+
+            cache_type = current_app.config.get("CACHE_TYPE", "memory")
+            if cache_type == "redis":
+                try:
+                    cache = cls.create_cache(
+                        "redis",
+                        redis_url=current_app.config.get("REDIS_URL"),
+                        prefix=name,
+                    )
+                except APIException as e:
+                    logger.warning(
+                        f"Redis cache unavailable, falling back to memory cache: {str(e)}"
+                    )
+                    cache = None
+
+            if cache is None:
+                cache = cls.create_cache("memory", prefix=name, max_size=10000)
+
+            cls._instances[name] = cache
+            return cache
+
+    @classmethod
+    def get_cross_process_cache(cls, name: str) -> Optional[CacheInterface]:
+        """获取跨进程共享的缓存实例
+
+        写入后需要所有工作进程立即失效的数据使用该方法：进程内存缓存只能失效
+        当前进程，其他进程会在TTL内继续返回旧数据。只在CACHE_TYPE=redis且Redis
+        可用时返回缓存，否则返回None，由调用方直接读取数据库。
+
+        Args:
+            name: 缓存名称，同时作为键前缀
+
+        Returns:
+            Redis缓存实例，不可用时返回None
+        """
+        if current_app.config.get("CACHE_TYPE", "memory") != "redis":
+            return None
+        cache = cls.get_shared_cache(name)
+        return cache if isinstance(cache, RedisCache) else None
@@ -19,15 +19,18 @@ class MemoryCache(CacheInterface):
         self.cache = {}
         self.lock = threading.RLock()  # 可重入锁，用于线程安全操作
         self.prefix = ""
+        self.max_size = None  # 最大缓存项数量，None表示不限制
     
-    def initialize(self, prefix: str = "", **kwargs) -> None:
+    def initialize(self, prefix: str = "", max_size: Optional[int] = None, **kwargs) -> None:
         """初始化内存缓存
         
         Args:
             prefix: 键前缀
+            max_size: 最大缓存项数量，超出时淘汰最早写入的项，None表示不限制
             **kwargs: 其他配置参数（被忽略）
         """
         self.prefix = prefix
+        self.max_size = max_size
         logger.info("Memory cache initialized")
     
     def _prefixed_key(self, key: str) -> str:
@@ -57,6 +60,17 @@ class MemoryCache(CacheInterface):
         for key in expired_keys:
             del self.cache[key]
     
+    def _evict_if_needed(self) -> None:
+        """缓存项超出上限时，先清理过期项，再按写入顺序淘汰最早的项"""
+        if self.max_size is None or len(self.cache) <= self.max_size:
+            return
+        
+        self._cleanup_expired()
+        
+        # 字典保持插入顺序，最早写入的键位于最前
+        while len(self.cache) > self.max_size:
+            del self.cache[next(iter(self.cache))]
+    
     def get(self, key: str) -> Optional[Any]:
         """获取缓存项
         
@@ -67,14 +81,18 @@ class MemoryCache(CacheInterface):
             缓存的值，如果不存在或已过期则返回None
         """
         with self.lock:
-            self._cleanup_expired()
-            
             prefixed_key = self._prefixed_key(key)
-            if prefixed_key in self.cache:
-                value, expiry_time = self.cache[prefixed_key]
-                return value
+            item = self.cache.get(prefixed_key)
+            if item is None:
+                return None
+            
+            # 仅检查当前键是否过期，避免每次读取都遍历全部缓存
+            value, expiry_time = item
+            if expiry_time is not None and expiry_time <= time.time():
+                del self.cache[prefixed_key]
+                return None
             
-            return None
+            return value
     
     def set(self, key: str, value: Any, ttl: Optional[int] = None) -> bool:
         """设置缓存项
@@ -95,8 +113,10 @@ class MemoryCache(CacheInterface):
             if ttl is not None:
                 expiry_time = time.time() + ttl
             
-            # 存储值和过期时间
+            # 存储值和过期时间（先删除旧值，使键移动到写入顺序末尾）
+            self.cache.pop(prefixed_key, None)
             self.cache[prefixed_key] = (value, expiry_time)
+            self._evict_if_needed()
             return True
     
     def delete(self, key: str) -> bool:
@@ -215,8 +235,10 @@ class MemoryCache(CacheInterface):
             # 批量设置
             for key, value in mapping.items():
                 prefixed_key = self._prefixed_key(key)
+                self.cache.pop(prefixed_key, None)
                 self.cache[prefixed_key] = (value, expiry_time)
             
+            self._evict_if_needed()
             return True
     
     def keys(self, pattern: str = "*") -> List[str]:
@@ -0,0 +1,51 @@
+"""进程内重复调用合并
+
+不依赖共享缓存和轮询：同一进程内相同key的并发调用中，第一个调用执行函数，
+其余调用阻塞等待同一个Future，函数返回后立即拿到结果。
+"""
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Tuple
+
+
+class SingleFlight:
+    """进程内重复调用合并器"""
+
+    def __init__(self):
+        """初始化合并器"""
+        self._calls: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: str, func: Callable[[], Any]) -> Tuple[Any, bool]:
+        """执行函数，相同key的并发调用只执行一次
+
+        执行方抛出的异常会同样抛给等待中的调用方。
+
+        Args:
+            key: 调用指纹
+            func: 实际执行的函数
+
+        Returns:
+            (函数执行结果, 结果是否来自其他调用)
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._calls[key] = future
+
+        if not leader:
+            return future.result(), True
+
+        try:
+            result = func()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result, False
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
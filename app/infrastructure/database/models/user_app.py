@@ -10,6 +10,7 @@ from sqlalchemy import (
     DateTime,
     JSON,
     ForeignKey,
+    Index,
 )
 from sqlalchemy.orm import relationship
 from app.extensions import db
@@ -19,6 +20,10 @@ class UserApp(db.Model):
     """用户应用模型 - 用户创建的应用实例和配置"""
 
     __tablename__ = "user_apps"
+    __table_args__ = (
+        # 按用户和应用类型查询应用列表
+        Index("ix_user_apps_user_id_app_type", "user_id", "app_type"),
+    )
 
     id = Column(String(32), primary_key=True, default=generate_uuid)
     user_id = Column(String(32), nullable=False, comment="所属用户ID")
@@ -1,6 +1,6 @@
 # app/infrastructure/database/models/xhs_copy_app.py
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, JSON, Float
+from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, JSON, Float, Index
 from app.extensions import db
 
 
@@ -8,6 +8,17 @@ class XhsCopyGeneration(db.Model):
     """小红书文案生成记录"""
 
     __tablename__ = "xhs_copy_generations"
+    __table_args__ = (
+        # 历史记录列表按用户筛选、按(创建时间, ID)倒序分页
+        Index("ix_xhs_copy_generations_user_id_created_at", "user_id", "created_at", "id"),
+    )
+
+    # 接口输出的字段，直接序列化ORM实例时使用
+    __json_fields__ = (
+        "id", "prompt", "image_urls", "app_id", "title", "content", "tags",
+        "status", "error_message", "tokens_used", "provider_type", "model_id",
+        "duration_ms", "ip_address", "user_rating", "user_feedback", "created_at",
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
 
@@ -1,12 +1,16 @@
 # app/infrastructure/database/repositories/image_classify_repository.py
-from typing import List, Optional, Dict, Any, Tuple
+from typing import Iterator, List, Optional, Dict, Any, Tuple
 from datetime import datetime
-from sqlalchemy.orm import Session
-from sqlalchemy import desc, func
+from sqlalchemy.orm import Session, load_only
+from sqlalchemy import desc, insert
 from app.infrastructure.database.models.image_classify import ImageClassification
 from app.core.exceptions import NotFoundException
+from app.core.pagination import keyset_paginate, offset_paginate
 from app.core.status_codes import CLASSIFICATION_NOT_FOUND
 
+# 列表和导出只加载接口输出的列，不读取user_agent等大字段
+_LIST_COLUMNS = load_only(*(getattr(ImageClassification, field) for field in ImageClassification.__json_fields__))
+
 class ImageClassifyRepository:
     """图片分类存储库"""
 
@@ -15,9 +19,40 @@ class ImageClassifyRepository:
         self.db = db_session
 
     def get_all_by_user(
-        self, user_id: str, page: int = 1, per_page: int = 20, **filters
-    ) -> Tuple[List[ImageClassification], int]:
-        """获取用户的所有分类记录"""
+        self,
+        user_id: str,
+        page: int = 1,
+        per_page: int = 20,
+        cursor: Optional[Tuple[datetime, int]] = None,
+        **filters,
+    ) -> Tuple[List[ImageClassification], Optional[int], bool]:
+        """获取用户的所有分类记录
+
+        Returns:
+            (当前页记录, 总数, 是否还有下一页)，游标分页时总数为None
+        """
+        query = self._filtered_query(user_id, **filters)
+
+        # 游标分页：不计算总数，总数返回None
+        if cursor is not None:
+            records, has_more = keyset_paginate(
+                query.options(_LIST_COLUMNS), ImageClassification.created_at, ImageClassification.id, cursor, per_page
+            )
+            return records, None, has_more
+
+        # 页码分页：总数通过窗口函数随当前页一起查询
+        records, total = offset_paginate(
+            query.options(_LIST_COLUMNS),
+            ImageClassification.id,
+            (ImageClassification.created_at.desc(), ImageClassification.id.desc()),
+            page,
+            per_page,
+        )
+
+        return records, total, page * per_page < total
+
+    def _filtered_query(self, user_id: str, **filters):
+        """构造按用户和过滤条件筛选的查询"""
         query = self.db.query(ImageClassification).filter(
             ImageClassification.user_id == user_id
         )
@@ -35,18 +70,17 @@ class ImageClassifyRepository:
                 ImageClassification.created_at <= filters["end_date"],
             )
 
-        # 计算总数
-        total = query.count()
+        return query
 
-        # 分页
-        records = (
-            query.order_by(ImageClassification.created_at.desc())
-            .offset((page - 1) * per_page)
-            .limit(per_page)
-            .all()
-        )
+    def iter_by_user(self, user_id: str, batch_size: int = 500, **filters) -> Iterator[ImageClassification]:
+        """按创建时间倒序逐条迭代用户的分类记录
 
-        return records, total
+        使用yield_per分批从数据库游标读取，内存占用与记录总数无关，用于导出。
+        """
+        query = self._filtered_query(user_id, **filters).options(_LIST_COLUMNS).order_by(
+            ImageClassification.created_at.desc(), ImageClassification.id.desc()
+        )
+        return query.yield_per(batch_size)
 
     def get_by_id(self, classification_id: int, user_id: str) -> ImageClassification:
         """根据ID获取分类记录"""
@@ -74,6 +108,15 @@ class ImageClassifyRepository:
         self.db.refresh(record)
         return record
 
+    def insert(self, record_data: dict) -> int:
+        """插入一条分类记录并返回ID
+
+        与create不同，不回读记录，只执行一次INSERT和提交，适合一次写入最终状态的记录。
+        """
+        result = self.db.execute(insert(ImageClassification).values(**record_data))
+        self.db.commit()
+        return result.inserted_primary_key[0]
+
     def update(self, classification_id: int, user_id: str, update_data: dict) -> ImageClassification:
         """更新分类记录"""
         record = self.get_by_id(classification_id, user_id)
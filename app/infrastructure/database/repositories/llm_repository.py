@@ -1,4 +1,5 @@
 """LLM模型存储库"""
+from collections import namedtuple
 from datetime import datetime
 import logging
 from typing import List, Optional, Dict, Any, Tuple
@@ -6,6 +7,7 @@ from typing import List, Optional, Dict, Any, Tuple
 from sqlalchemy import func, desc, and_, or_
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
+from app.infrastructure.cache.memory_cache import MemoryCache
 from app.infrastructure.database.models.llm import  LLMModel, LLMProvider,LLMProviderConfig
 from app.core.exceptions import NotFoundException
 from app.core.status_codes import MODEL_NOT_FOUND,CONFIG_NOT_FOUND
@@ -14,6 +16,28 @@ from app.core.status_codes import MODEL_NOT_FOUND,CONFIG_NOT_FOUND
 
 logger = logging.getLogger(__name__)
 
+# 默认配置快照缓存时间（秒）。修改配置时只能失效当前进程的缓存，
+# 其他工作进程最多在该时间内继续使用旧的默认配置，因此保持为几秒
+DEFAULT_CONFIG_CACHE_TTL = 5
+
+# 进程内缓存：用户ID -> {提供商类型: 默认配置快照}。分类和文案生成每次调用都要
+# 读取默认配置；快照含API密钥，只缓存在进程内存中，不写入共享缓存
+_default_config_cache = MemoryCache()
+_default_config_cache.initialize(prefix="llm_config:default", max_size=10000)
+
+LLMProviderConfigSnapshot = namedtuple(
+    "LLMProviderConfigSnapshot",
+    [
+        "id", "provider_type", "api_key", "app_id", "app_secret", "api_base_url",
+        "api_version", "is_active", "request_timeout", "max_retries",
+    ],
+)
+
+
+def invalidate_default_config_cache(user_id: str) -> None:
+    """使用户的默认配置快照缓存失效"""
+    _default_config_cache.delete(str(user_id))
+
 class LLMModelRepository:
     """AI模型存储库"""
     
@@ -184,6 +208,76 @@ class LLMProviderConfigRepository:
             self.db.rollback()
             raise
 
+    def get_default_snapshot(
+        self, user_id: str, provider_type: str
+    ) -> Optional[LLMProviderConfigSnapshot]:
+        """获取用户默认LLM配置的快照（带进程内缓存），用于创建提供商实例"""
+        cache_key = str(user_id)
+        snapshots = _default_config_cache.get(cache_key) or {}
+        if provider_type in snapshots:
+            return snapshots[provider_type]
+
+        config = self.get_default(user_id, provider_type)
+        if not config:
+            return None
+
+        snapshot = LLMProviderConfigSnapshot(
+            id=config.id,
+            provider_type=config.provider_type,
+            api_key=config.api_key,
+            app_id=config.app_id,
+            app_secret=config.app_secret,
+            api_base_url=config.api_base_url,
+            api_version=config.api_version,
+            is_active=config.is_active,
+            request_timeout=config.request_timeout,
+            max_retries=config.max_retries,
+        )
+        _default_config_cache.set(
+            cache_key, dict(snapshots, **{provider_type: snapshot}), ttl=DEFAULT_CONFIG_CACHE_TTL
+        )
+        return snapshot
+
+    def get_alternative(
+        self, user_id: str, provider_type: str, exclude_id: int
+    ) -> Optional[LLMProviderConfig]:
+        """获取同类型的另一个配置（用于删除默认配置后接替默认）"""
+        try:
+            return (
+                self.db.query(LLMProviderConfig)
+                .filter(
+                    LLMProviderConfig.user_id == user_id,
+                    LLMProviderConfig.provider_type == provider_type,
+                    LLMProviderConfig.id != exclude_id,
+                )
+                .order_by(LLMProviderConfig.id)
+                .first()
+            )
+        except SQLAlchemyError as e:
+            logger.error(f"Error fetching alternative config: {str(e)}")
+            self.db.rollback()
+            raise
+
+    def clear_default(
+        self, user_id: str, provider_type: str, exclude_id: Optional[int] = None
+    ) -> None:
+        """取消同类型配置的默认状态（单条UPDATE语句）"""
+        try:
+            query = self.db.query(LLMProviderConfig).filter(
+                LLMProviderConfig.user_id == user_id,
+                LLMProviderConfig.provider_type == provider_type,
+                LLMProviderConfig.is_default == True,
+            )
+            if exclude_id is not None:
+                query = query.filter(LLMProviderConfig.id != exclude_id)
+            query.update({"is_default": False}, synchronize_session=False)
+            self.db.commit()
+            invalidate_default_config_cache(user_id)
+        except SQLAlchemyError as e:
+            logger.error(f"Error clearing default config: {str(e)}")
+            self.db.rollback()
+            raise
+
     def create(self, config_data: dict) -> LLMProviderConfig:
         """创建新配置"""
         try:
@@ -191,6 +285,7 @@ class LLMProviderConfigRepository:
             config = LLMProviderConfig(**config_data)
             self.db.add(config)
             self.db.commit()
+            invalidate_default_config_cache(config.user_id)
             self.db.refresh(config)
             return config
         except SQLAlchemyError as e:
@@ -211,6 +306,7 @@ class LLMProviderConfigRepository:
             
             # 提交事务
             self.db.commit()
+            invalidate_default_config_cache(user_id)
             self.db.refresh(config)
             return config
         except SQLAlchemyError as e:
@@ -227,6 +323,7 @@ class LLMProviderConfigRepository:
             # 删除配置
             self.db.delete(config)
             self.db.commit()
+            invalidate_default_config_cache(user_id)
             return True
         except SQLAlchemyError as e:
             logger.error(f"Error deleting config: {str(e)}")
@@ -249,6 +346,7 @@ class LLMProviderConfigRepository:
             # 设置当前配置为默认
             config.is_default = True
             self.db.commit()
+            invalidate_default_config_cache(user_id)
             self.db.refresh(config)
             return config
         except SQLAlchemyError as e:
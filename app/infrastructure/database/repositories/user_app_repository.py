@@ -1,11 +1,54 @@
 # app/infrastructure/database/repositories/user_app_repository.py
+import hashlib
+import logging
+from collections import namedtuple
 from typing import List, Optional, Dict, Any
 from sqlalchemy.orm import Session
 from sqlalchemy import and_
+from app.infrastructure.cache.factory import CacheFactory
+from app.infrastructure.cache.memory_cache import MemoryCache
 from app.infrastructure.database.models.user_app import UserApp
-from app.core.exceptions import NotFoundException
+from app.core.exceptions import APIException, NotFoundException
 from app.core.status_codes import APPLICATION_NOT_FOUND
 
+logger = logging.getLogger(__name__)
+
+# 应用密钥缓存时间（秒）。CACHE_TYPE=redis时快照存放在Redis中，重新生成密钥、
+# 删除或取消发布应用会立即在所有工作进程失效；未启用Redis时只能使用进程内缓存，
+# 失效只作用于当前进程，其他工作进程最多在该时间内仍按旧快照通过鉴权
+APP_KEY_CACHE_TTL = 10
+
+# app_key -> 应用快照。外部接口每次请求都要按密钥查找应用，
+# 缓存快照而不是ORM对象，避免跨请求使用已脱离会话的实例
+_app_key_cache = MemoryCache()
+_app_key_cache.initialize(prefix="user_app:key", max_size=10000)
+
+UserAppSnapshot = namedtuple(
+    "UserAppSnapshot",
+    ["id", "user_id", "app_id", "app_type", "name", "published", "published_config", "config"],
+)
+
+
+def _app_key_cache_key(app_key: str) -> str:
+    """缓存键使用密钥的摘要，避免明文密钥写入缓存"""
+    return hashlib.sha256(app_key.encode("utf-8")).hexdigest()
+
+
+def invalidate_app_key_cache(app_key: Optional[str]) -> None:
+    """使应用密钥缓存失效（本进程及Redis中的快照）"""
+    if not app_key:
+        return
+
+    cache_key = _app_key_cache_key(app_key)
+    _app_key_cache.delete(cache_key)
+
+    shared_cache = CacheFactory.get_cross_process_cache("user_app_key")
+    if shared_cache is not None:
+        try:
+            shared_cache.delete(cache_key)
+        except APIException as e:
+            logger.warning(f"删除应用密钥缓存失败: {str(e)}")
+
 
 class UserAppRepository:
     """用户应用存储库"""
@@ -33,8 +76,6 @@ class UserAppRepository:
     
     def get_by_app_id(self, app_id: str, user_id: str) -> UserApp:
         """根据应用ID获取应用"""
-        print("get_by_app_id")
-        print(f"app_id: {app_id}, user_id: {user_id}")
         app= (
             self.db.query(UserApp)
             .filter(UserApp.app_id == app_id, UserApp.user_id == user_id)
@@ -50,6 +91,61 @@ class UserAppRepository:
         """根据应用密钥获取应用"""
         return self.db.query(UserApp).filter(UserApp.app_key == app_key).first()
 
+    def get_by_app_keys(self, app_keys: List[str]) -> Dict[str, UserApp]:
+        """根据多个应用密钥批量获取应用，返回以app_key为键的字典"""
+        keys = {app_key for app_key in app_keys if app_key}
+        if not keys:
+            return {}
+
+        apps = self.db.query(UserApp).filter(UserApp.app_key.in_(keys)).all()
+        return {app.app_key: app for app in apps}
+
+    def get_snapshot_by_app_key(self, app_key: str) -> Optional[UserAppSnapshot]:
+        """根据应用密钥获取应用快照（带缓存）
+
+        启用Redis时只使用Redis缓存，保证失效对所有工作进程立即生效；
+        否则退回进程内缓存，跨进程的陈旧窗口为APP_KEY_CACHE_TTL秒
+        """
+        cache_key = _app_key_cache_key(app_key)
+        shared_cache = CacheFactory.get_cross_process_cache("user_app_key")
+
+        if shared_cache is not None:
+            try:
+                data = shared_cache.get(cache_key)
+            except APIException as e:
+                logger.warning(f"读取应用密钥缓存失败: {str(e)}")
+                data = None
+            if data is not None:
+                return UserAppSnapshot(**data)
+        else:
+            snapshot = _app_key_cache.get(cache_key)
+            if snapshot is not None:
+                return snapshot
+
+        app = self.get_by_app_key(app_key)
+        if not app:
+            return None
+
+        snapshot = UserAppSnapshot(
+            id=app.id,
+            user_id=app.user_id,
+            app_id=app.app_id,
+            app_type=app.app_type,
+            name=app.name,
+            published=app.published,
+            published_config=app.published_config,
+            config=app.config,
+        )
+
+        if shared_cache is not None:
+            try:
+                shared_cache.set(cache_key, snapshot._asdict(), ttl=APP_KEY_CACHE_TTL)
+            except APIException as e:
+                logger.warning(f"写入应用密钥缓存失败: {str(e)}")
+        else:
+            _app_key_cache.set(cache_key, snapshot, ttl=APP_KEY_CACHE_TTL)
+        return snapshot
+
     def get_all_by_type(self, user_id: str, app_type: str) -> List[UserApp]:
         """获取用户特定类型的所有应用"""
         return (
@@ -81,6 +177,8 @@ class UserAppRepository:
     def update(self, app_id: str, user_id: str, app_data: dict) -> UserApp:
         """更新应用"""
         app = self.get_by_app_id(app_id, user_id)
+        # 记录旧密钥，重新生成密钥后旧密钥需要立即失效
+        old_app_key = app.app_key
 
         for key, value in app_data.items():
             if hasattr(app, key):
@@ -88,13 +186,19 @@ class UserAppRepository:
 
         self.db.commit()
         self.db.refresh(app)
+
+        invalidate_app_key_cache(old_app_key)
+        invalidate_app_key_cache(app.app_key)
         return app
 
     def delete(self, app_id: str, user_id: str) -> bool:
         """删除应用"""
         app = self.get_by_id(app_id, user_id)
+        app_key = app.app_key
         self.db.delete(app)
         self.db.commit()
+
+        invalidate_app_key_cache(app_key)
         return True
 
     def set_as_default(self, app_id: str, user_id: str) -> UserApp:
@@ -93,11 +93,34 @@ class UserRepository:
             用户对象或None
         """
         try:
-            return User.query.get(user_id)
+            # Session.get优先命中会话的标识映射，同一请求内重复查询不会再访问数据库
+            return self.db.get(User, user_id)
         except SQLAlchemyError as e:
             logger.error(f"Error finding user by ID: {str(e)}")
             return None
 
+    def find_many_by_ids(self, user_ids: List[str]) -> Dict[str, User]:
+        """通过ID批量查找用户
+
+        Args:
+            user_ids: 用户ID列表
+
+        Returns:
+            用户ID到用户对象的映射，不存在的ID不会出现在结果中
+        """
+        ids = {user_id for user_id in user_ids if user_id}
+        if not ids:
+            return {}
+
+        try:
+            # 一次IN查询加载全部用户，结果同时进入会话的标识映射，
+            # 之后的find_by_id调用可以直接命中
+            users = self.db.query(User).filter(User.id.in_(ids)).all()
+            return {user.id: user for user in users}
+        except SQLAlchemyError as e:
+            logger.error(f"Error finding users by IDs: {str(e)}")
+            return {}
+
     def find_by_username(self, username: str) -> Optional[User]:
         """通过用户名查找用户
 
@@ -1,13 +1,17 @@
 # app/infrastructure/database/repositories/xhs_copy_repository.py
-from typing import List, Optional, Dict, Any
+from typing import Iterator, List, Optional, Dict, Any, Tuple
 from datetime import datetime
-from sqlalchemy.orm import Session
-from sqlalchemy import desc, func
+from sqlalchemy.orm import Session, load_only
+from sqlalchemy import desc
 from app.infrastructure.database.models.xhs_copy_app import XhsCopyGeneration
 from app.core.exceptions import NotFoundException
+from app.core.pagination import keyset_paginate, offset_paginate
 from app.core.status_codes import CONFIG_NOT_FOUND, GENERATION_NOT_FOUND, TEST_NOT_FOUND
 
 
+# 列表和导出只加载接口输出的列，不读取user_agent等大字段
+_LIST_COLUMNS = load_only(*(getattr(XhsCopyGeneration, field) for field in XhsCopyGeneration.__json_fields__))
+
 class XhsCopyGenerationRepository:
     """小红书文案生成记录存储库"""
 
@@ -16,9 +20,40 @@ class XhsCopyGenerationRepository:
         self.db = db_session
 
     def get_all_by_user(
-        self, user_id: str, page: int = 1, per_page: int = 20, **filters
-    ) -> tuple[List[XhsCopyGeneration], int]:
-        """获取用户的所有生成记录"""
+        self,
+        user_id: str,
+        page: int = 1,
+        per_page: int = 20,
+        cursor: Optional[Tuple[datetime, int]] = None,
+        **filters,
+    ) -> Tuple[List[XhsCopyGeneration], Optional[int], bool]:
+        """获取用户的所有生成记录
+
+        Returns:
+            (当前页记录, 总数, 是否还有下一页)，游标分页时总数为None
+        """
+        query = self._filtered_query(user_id, **filters)
+
+        # 游标分页：不计算总数，总数返回None
+        if cursor is not None:
+            generations, has_more = keyset_paginate(
+                query.options(_LIST_COLUMNS), XhsCopyGeneration.created_at, XhsCopyGeneration.id, cursor, per_page
+            )
+            return generations, None, has_more
+
+        # 页码分页：总数通过窗口函数随当前页一起查询
+        generations, total = offset_paginate(
+            query.options(_LIST_COLUMNS),
+            XhsCopyGeneration.id,
+            (XhsCopyGeneration.created_at.desc(), XhsCopyGeneration.id.desc()),
+            page,
+            per_page,
+        )
+
+        return generations, total, page * per_page < total
+
+    def _filtered_query(self, user_id: str, **filters):
+        """构造按用户和过滤条件筛选的查询"""
         query = self.db.query(XhsCopyGeneration).filter(
             XhsCopyGeneration.user_id == user_id
         )
@@ -39,18 +74,17 @@ class XhsCopyGenerationRepository:
                 XhsCopyGeneration.created_at <= filters["end_date"],
             )
 
-        # 计算总数
-        total = query.count()
+        return query
 
-        # 分页
-        generations = (
-            query.order_by(XhsCopyGeneration.created_at.desc())
-            .offset((page - 1) * per_page)
-            .limit(per_page)
-            .all()
-        )
+    def iter_by_user(self, user_id: str, batch_size: int = 500, **filters) -> Iterator[XhsCopyGeneration]:
+        """按创建时间倒序逐条迭代用户的生成记录
 
-        return generations, total
+        使用yield_per分批从数据库游标读取，内存占用与记录总数无关，用于导出。
+        """
+        query = self._filtered_query(user_id, **filters).options(_LIST_COLUMNS).order_by(
+            XhsCopyGeneration.created_at.desc(), XhsCopyGeneration.id.desc()
+        )
+        return query.yield_per(batch_size)
 
     def get_by_id(self, generation_id: int, user_id: str) -> XhsCopyGeneration:
         """根据ID获取生成记录"""
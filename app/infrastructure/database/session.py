@@ -1,6 +1,5 @@
 """数据库会话管理"""
-from flask import _app_ctx_stack, current_app
-from flask.globals import app_ctx
+from flask import has_app_context
 from app.extensions import db
 
 def get_db_session():
@@ -8,16 +7,31 @@ def get_db_session():
 
     返回:
         SQLAlchemy会话对象
+
+    Flask-SQLAlchemy的db.session是按应用上下文划分作用域的scoped_session，
+    连接从引擎连接池中获取，并在应用上下文结束时自动remove归还连接池。
     """
     # 检查是否已有激活的应用上下文
-    if _app_ctx_stack.top is not None:
-        # 在应用上下文中获取会话
-        return db.session
-    else:
-        # 如果没有应用上下文，创建一个临时会话
-        return db.create_scoped_session(options={"expire_on_commit": False})
-
-def close_db_session(exception=None):
-    """关闭数据库会话"""
-    if hasattr(app_ctx, 'db_session'):
-        app_ctx.db_session.close()
\ No newline at end of file
+    if not has_app_context():
+        raise RuntimeError("数据库会话只能在应用上下文中使用")
+    return db.session
+
+
+def release_db_connection():
+    """结束当前事务，把连接归还连接池
+
+    在耗时较长的外部调用（如LLM请求）前调用，避免等待期间占用数据库连接，
+    并发较高时耗尽连接池。会话仍然可用，之后的查询会重新从连接池获取连接；
+    已加载的ORM对象会过期，再次访问属性时重新加载。
+
+    调用方必须已提交自己的全部修改：会话中仍有未flush的新增、修改或删除时
+    直接报错，而不是顺带提交与本次调用无关的状态。
+
+    Raises:
+        RuntimeError: 会话中存在未提交的修改
+    """
+    session = get_db_session()
+    if session.new or session.dirty or session.deleted:
+        raise RuntimeError("归还数据库连接前会话中存在未提交的修改")
+    # 事务中已无待写入的对象，提交仅用于结束事务、释放连接
+    session.commit()
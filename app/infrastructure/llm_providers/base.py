@@ -1,6 +1,6 @@
 """AI供应商基础抽象类"""
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List, Optional, Union
+from typing import Dict, Any, Iterator, List, Optional, Union
 
 class LLMProviderInterface(ABC):
     """AI模型提供商接口"""
@@ -78,6 +78,36 @@ class LLMProviderInterface(ABC):
         """
         pass
     
+    def stream_chat_completion(
+        self,
+        messages: List[Dict[str, str]],
+        max_tokens: int = 1000,
+        temperature: float = 0.7,
+        top_p: float = 1.0,
+        stop_sequences: Optional[List[str]] = None,
+        **kwargs
+    ) -> Iterator[Dict[str, Any]]:
+        """流式生成对话完成，逐段返回回复
+        
+        调用方可以在拿到所需内容后提前关闭迭代器，丢弃剩余输出（此时拿不到usage）。
+        默认实现不支持流式，调用generate_chat_completion后一次性返回完整回复。
+        
+        Args:
+            参数同generate_chat_completion
+            
+        Yields:
+            {"content": 回复文本片段}，流正常结束时最后一项带有"usage"（token使用量）
+        """
+        response = self.generate_chat_completion(
+            messages=messages,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            top_p=top_p,
+            stop_sequences=stop_sequences,
+            **kwargs
+        )
+        yield {"content": response["message"]["content"], "usage": response.get("usage")}
+    
     @abstractmethod
     def count_tokens(self, text: str) -> int:
         """计算文本包含的token数量
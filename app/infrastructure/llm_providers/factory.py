@@ -1,16 +1,28 @@
 """AI提供商工厂模块，负责创建和管理AI提供商实例"""
+import hashlib
+import json
 import logging
 from typing import Dict, Any, Optional
 
+import httpx
+
 from app.infrastructure.llm_providers.base import LLMProviderInterface
 from app.infrastructure.llm_providers.openai_provider import OpenLLMProvider
 from app.infrastructure.llm_providers.anthropic_provider import AnthropicProvider
 from app.infrastructure.llm_providers.volcano_provider import VolcanoProvider
+from app.infrastructure.cache.memory_cache import MemoryCache
 from app.core.exceptions import APIException
 from app.core.status_codes import EXTERNAL_API_ERROR
 
 logger = logging.getLogger(__name__)
 
+# 提供商实例缓存时间（秒）。实例初始化后无状态，SDK客户端线程安全，可跨请求复用
+PROVIDER_CACHE_TTL = 3600
+
+# 进程内缓存：提供商名称和配置摘要 -> 已初始化的提供商实例
+_provider_cache = MemoryCache()
+_provider_cache.initialize(prefix="llm_provider", max_size=512)
+
 class LLMProviderFactory:
     """AI提供商工厂类，负责创建和管理AI提供商实例"""
     
@@ -22,12 +34,20 @@ class LLMProviderFactory:
     }
     
     @classmethod
-    def create_provider(cls, provider_name: str, api_key: str, **config) -> LLMProviderInterface:
+    def create_provider(
+        cls,
+        provider_name: str,
+        api_key: str,
+        http_client: Optional[httpx.Client] = None,
+        **config
+    ) -> LLMProviderInterface:
         """创建AI提供商实例
         
         Args:
             provider_name: 提供商名称，如"openai"、"anthropic"
             api_key: API密钥
+            http_client: 提供商SDK使用的httpx客户端，默认为进程级共享连接池
+                         （OpenAI和火山引擎；锁定版本的Anthropic SDK不支持注入）
             **config: 其他配置参数
             
         Returns:
@@ -50,6 +70,8 @@ class LLMProviderFactory:
             provider = cls.PROVIDERS[provider_name]()
             
             # 初始化提供商
+            if http_client is not None:
+                config["http_client"] = http_client
             provider.initialize(api_key, **config)
             
             logger.info(f"Successfully created and initialized {provider_name} provider")
@@ -59,4 +81,38 @@ class LLMProviderFactory:
             if isinstance(e, APIException):
                 raise
             raise APIException(f"创建AI提供商失败: {str(e)}", EXTERNAL_API_ERROR)
-    
\ No newline at end of file
+    
+
+    @classmethod
+    def get_provider(
+        cls,
+        provider_name: str,
+        api_key: str,
+        http_client: Optional[httpx.Client] = None,
+        **config
+    ) -> LLMProviderInterface:
+        """获取AI提供商实例，相同名称、密钥和配置复用已初始化的实例
+
+        缓存键为密钥和配置的摘要，不保存明文密钥；密钥或配置修改后自然使用新实例。
+
+        Args:
+            provider_name: 提供商名称，如"openai"、"anthropic"
+            api_key: API密钥
+            http_client: 提供商SDK使用的httpx客户端，默认为进程级共享连接池
+                         （OpenAI和火山引擎；锁定版本的Anthropic SDK不支持注入）
+            **config: 其他配置参数
+
+        Returns:
+            初始化好的AI提供商实例
+        """
+        client_id = id(http_client) if http_client is not None else None
+        raw = json.dumps(
+            [provider_name.lower(), api_key, config, client_id], sort_keys=True, default=str
+        )
+        cache_key = hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+        provider = _provider_cache.get(cache_key)
+        if provider is None:
+            provider = cls.create_provider(provider_name, api_key, http_client, **config)
+            _provider_cache.set(cache_key, provider, ttl=PROVIDER_CACHE_TTL)
+        return provider
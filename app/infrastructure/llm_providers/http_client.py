@@ -0,0 +1,36 @@
+"""LLM提供商共享HTTP客户端
+
+提供商实例按请求创建，若每次都新建SDK客户端，底层连接池也随之重建，
+每次调用都要重新进行TCP和TLS握手。这里维护进程级的httpx连接池，
+供各提供商的SDK客户端复用长连接。
+"""
+import threading
+from typing import Optional
+
+import httpx
+
+# 连接池上限，按单进程的并发请求数设置
+MAX_CONNECTIONS = 200
+MAX_KEEPALIVE_CONNECTIONS = 50
+
+# 默认超时（秒），SDK按请求传入的timeout会覆盖该值
+DEFAULT_TIMEOUT = httpx.Timeout(300.0, connect=10.0)
+
+_http_client: Optional[httpx.Client] = None
+_http_client_lock = threading.Lock()
+
+
+def get_shared_http_client() -> httpx.Client:
+    """获取进程级共享的httpx客户端（线程安全，首次使用时创建）"""
+    global _http_client
+    if _http_client is None:
+        with _http_client_lock:
+            if _http_client is None:
+                _http_client = httpx.Client(
+                    limits=httpx.Limits(
+                        max_connections=MAX_CONNECTIONS,
+                        max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+                    ),
+                    timeout=DEFAULT_TIMEOUT,
+                )
+    return _http_client
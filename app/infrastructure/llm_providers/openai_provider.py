@@ -7,6 +7,7 @@ from openai import OpenAI, APIError, RateLimitError, APIConnectionError
 from tiktoken import encoding_for_model
 
 from app.infrastructure.llm_providers.base import LLMProviderInterface
+from app.infrastructure.llm_providers.http_client import get_shared_http_client
 from app.core.exceptions import APIException
 from app.core.status_codes import OPENAI_API_ERROR, TIMEOUT, RATE_LIMITED
 
@@ -33,9 +34,13 @@ class OpenLLMProvider(LLMProviderInterface):
                       - embeddings_model: 嵌入模型名称
                       - max_retries: 最大重试次数
                       - timeout: 请求超时时间
+                      - http_client: 使用的httpx客户端，默认为进程级共享连接池
         """
         try:
-            self.client = OpenAI(api_key=api_key)
+            self.client = OpenAI(
+                api_key=api_key,
+                http_client=kwargs.get("http_client") or get_shared_http_client(),
+            )
             
             # 更新可选配置
             self.default_model = kwargs.get("default_model", self.default_model)
@@ -3,12 +3,14 @@
 import time
 import json
 import logging
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Iterator, List, Optional
 
 from volcenginesdkarkruntime import Ark
 import httpx
+import orjson
 from openai import OpenAI
 from app.infrastructure.llm_providers.base import LLMProviderInterface
+from app.infrastructure.llm_providers.http_client import get_shared_http_client
 from app.core.exceptions import APIException
 from app.core.status_codes import EXTERNAL_API_ERROR, TIMEOUT, RATE_LIMITED
 
@@ -35,6 +37,7 @@ class VolcanoProvider(LLMProviderInterface):
                       - default_model: 默认模型名称
                       - max_retries: 最大重试次数
                       - timeout: 请求超时时间
+                      - http_client: 使用的httpx客户端，默认为进程级共享连接池
         """
         try:
             # 更新可选配置
@@ -43,16 +46,19 @@ class VolcanoProvider(LLMProviderInterface):
             
             # 设置超时时间
             timeout_seconds = kwargs.get("timeout", 300)
-            print(f"设置超时时间为 {timeout_seconds} 秒")
-            print(f"默认模型为 {self.default_model}")
-            print(f"api_key为 {api_key}")
+            logger.debug(
+                "火山引擎客户端配置: 超时时间=%s秒, 默认模型=%s",
+                timeout_seconds, self.default_model,
+            )
             # 初始化客户端
             # 如果提供了app_id和app_secret，则使用IAM认证
+            # 复用进程级连接池，避免每次请求都重新建立到火山引擎的TLS连接
             self.client = OpenAI(
                     api_key=api_key,
                     base_url = "https://ark.cn-beijing.volces.com/api/v3",
+                    timeout=timeout_seconds,
+                    http_client=kwargs.get("http_client") or get_shared_http_client(),
                 )
-            print(f"火山引擎客户端初始化成功")
             logger.info(f"火山引擎初始化成功: {self.default_model}")
         except Exception as e:
             logger.error(f"失败初始化火山引擎: {str(e)}")
@@ -188,36 +194,16 @@ class VolcanoProvider(LLMProviderInterface):
         
         try:
             def operation_func():
-                used_model = model or self.default_model
-                
-                # 构建请求参数
-                params = {
-                    "model": used_model,
-                    "messages": messages,
-                    "temperature": temperature,
-                    "top_p": top_p,
-                    "max_tokens": max_tokens
-                }
-                
-                if stop_sequences:
-                    params["stop"] = stop_sequences
-                
-                # 添加其他参数
-                for key, value in kwargs.items():
-                    if key not in params:
-                        params[key] = value
-                
-                print(f"发送到火山引擎的请求参数:")
-                print(f"- 模型: {params['model']}")
-                print(f"- 消息数量: {len(params['messages'])}")
-                print(f"- 温度: {params['temperature']}")
-                print(f"- 最大tokens: {params['max_tokens']}")
+                params = self._build_chat_params(
+                    messages, max_tokens, temperature, top_p, stop_sequences, model, **kwargs
+                )
+                used_model = params["model"]
                 
                 # 发送请求
-                print("开始调用火山引擎API...")
                 response = self.client.chat.completions.create(**params)
-                print(response)
-                print("API调用成功!")
+                if logger.isEnabledFor(logging.DEBUG):
+                    # 完整响应体较大，仅在开启DEBUG时格式化
+                    logger.debug("火山引擎API响应: %s", response)
                 
                 # 构造统一格式的返回结果
                 result = {
@@ -233,6 +219,18 @@ class VolcanoProvider(LLMProviderInterface):
                     }
                 }
                 
+                # JSON模式下回复即JSON对象，直接解析供调用方使用
+                response_format = params.get("response_format") or {}
+                if response_format.get("type") == "json_object":
+                    try:
+                        json_object = orjson.loads(result["message"]["content"])
+                    except (orjson.JSONDecodeError, TypeError):
+                        json_object = None
+                    if isinstance(json_object, dict):
+                        result["json_object"] = json_object
+                    else:
+                        logger.warning("火山引擎JSON模式返回的内容不是JSON对象")
+                
                 # 添加reasoning_content（如果有）
                 if hasattr(response.choices[0].message, 'reasoning_content') and response.choices[0].message.reasoning_content:
                     result["reasoning_content"] = response.choices[0].message.reasoning_content
@@ -243,6 +241,94 @@ class VolcanoProvider(LLMProviderInterface):
         except Exception as e:
             self._handle_api_error("对话生成", e)
     
+    def stream_chat_completion(
+        self,
+        messages: List[Dict[str, str]],
+        max_tokens: int = 1000,
+        temperature: float = 0.7,
+        top_p: float = 1.0,
+        stop_sequences: Optional[List[str]] = None,
+        model: Optional[str] = None,
+        **kwargs
+    ) -> Iterator[Dict[str, Any]]:
+        """流式生成对话完成，逐段返回回复
+        
+        迭代器被提前关闭时会关闭底层响应，不再接收剩余输出。
+        
+        Args:
+            参数同generate_chat_completion
+            
+        Yields:
+            {"content": 回复文本片段}（不含reasoning_content），
+            流正常结束时最后一项带有"usage"（token使用量）
+        """
+        if not self.client:
+            raise APIException("火山引擎客户端未初始化", EXTERNAL_API_ERROR)
+        
+        params = self._build_chat_params(
+            messages, max_tokens, temperature, top_p, stop_sequences, model, **kwargs
+        )
+        params["stream"] = True
+        # 最后一个数据块返回本次调用的usage
+        params["stream_options"] = {"include_usage": True}
+        stream = self._execute_with_retry(
+            lambda: self.client.chat.completions.create(**params), "流式对话生成"
+        )
+        try:
+            for chunk in stream:
+                usage = getattr(chunk, "usage", None)
+                if usage:
+                    yield {
+                        "usage": {
+                            "prompt_tokens": usage.prompt_tokens,
+                            "completion_tokens": usage.completion_tokens,
+                            "total_tokens": usage.total_tokens,
+                        }
+                    }
+                if not chunk.choices:
+                    continue
+                content = chunk.choices[0].delta.content
+                if content:
+                    yield {"content": content}
+        except Exception as e:
+            self._handle_api_error("流式对话生成", e)
+        finally:
+            stream.close()
+    
+    def _build_chat_params(
+        self,
+        messages: List[Dict[str, str]],
+        max_tokens: int,
+        temperature: float,
+        top_p: float,
+        stop_sequences: Optional[List[str]],
+        model: Optional[str],
+        **kwargs
+    ) -> Dict[str, Any]:
+        """构建对话请求参数"""
+        params = {
+            "model": model or self.default_model,
+            "messages": messages,
+            "temperature": temperature,
+            "top_p": top_p,
+            "max_tokens": max_tokens
+        }
+        
+        if stop_sequences:
+            params["stop"] = stop_sequences
+        
+        # 添加其他参数
+        for key, value in kwargs.items():
+            if key not in params:
+                params[key] = value
+        
+        logger.debug(
+            "调用火山引擎API: 模型=%s, 消息数量=%d, 温度=%s, 最大tokens=%s",
+            params["model"], len(params["messages"]),
+            params["temperature"], params["max_tokens"],
+        )
+        return params
+    
     def count_tokens(self, text: str) -> int:
         """计算文本包含的token数量
         
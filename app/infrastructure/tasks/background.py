@@ -0,0 +1,55 @@
+"""进程内后台任务执行器
+
+耗时的LLM调用可提交到线程池执行，接口立即返回，避免长时间占用请求工作线程。
+任务在独立的应用上下文中运行，db.session按应用上下文划分，各任务使用各自的会话。
+"""
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from flask import current_app
+
+logger = logging.getLogger(__name__)
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor(max_workers: int) -> ThreadPoolExecutor:
+    """获取进程级线程池，首次使用时创建"""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=max_workers, thread_name_prefix="background"
+                )
+    return _executor
+
+
+def submit_background_task(func: Callable[..., Any], *args, **kwargs) -> Future:
+    """提交后台任务
+
+    任务在新的应用上下文中执行，上下文结束时Flask-SQLAlchemy自动关闭会话。
+
+    Args:
+        func: 任务函数
+        *args: 位置参数
+        **kwargs: 关键字参数
+
+    Returns:
+        任务Future
+    """
+    app = current_app._get_current_object()
+
+    def run():
+        with app.app_context():
+            try:
+                return func(*args, **kwargs)
+            except Exception:
+                logger.exception(f"Background task {func.__name__} failed")
+                raise
+
+    executor = _get_executor(app.config.get("BACKGROUND_WORKERS", 4))
+    return executor.submit(run)
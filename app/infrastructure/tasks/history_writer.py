@@ -0,0 +1,109 @@
+"""历史记录批量写入器
+
+高并发调用时每个请求单独INSERT一条历史记录，数据库往返次数与请求数相同。
+写入器把记录放入队列，由后台线程攒批（达到条数上限或等待超时）后
+通过bulk_insert_mappings一次写入。记录不会立即可见，也拿不到自增ID。
+"""
+import atexit
+import logging
+import queue
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from flask import current_app
+
+from app.extensions import db
+
+logger = logging.getLogger(__name__)
+
+
+class BufferedHistoryWriter:
+    """历史记录批量写入器"""
+
+    def __init__(self, model, max_batch_size: int = 100, max_delay: float = 0.05):
+        """初始化写入器
+
+        Args:
+            model: 写入的ORM模型类
+            max_batch_size: 单批最大记录数
+            max_delay: 攒批最长等待时间（秒）
+        """
+        self.model = model
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+        self.queue: "queue.Queue[Dict[str, Any]]" = queue.Queue()
+        self._app = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def add(self, row: Dict[str, Any]) -> None:
+        """加入一条待写入记录（需在应用上下文中调用）
+
+        Args:
+            row: 列名到值的映射
+        """
+        self._ensure_started()
+        self.queue.put(row)
+
+    def flush(self) -> None:
+        """立即写入队列中剩余的全部记录"""
+        batch = self._drain(len_limit=None)
+        if batch:
+            self._write(batch)
+
+    def _ensure_started(self) -> None:
+        """首次写入时启动后台线程"""
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._app = current_app._get_current_object()
+            thread = threading.Thread(
+                target=self._run,
+                name=f"history-writer-{self.model.__tablename__}",
+                daemon=True,
+            )
+            thread.start()
+            self._thread = thread
+            # 进程退出前写入尚未落库的记录
+            atexit.register(self.flush)
+
+    def _drain(self, len_limit: Optional[int]) -> List[Dict[str, Any]]:
+        """非阻塞地取出队列中的记录"""
+        batch = []
+        while len_limit is None or len(batch) < len_limit:
+            try:
+                batch.append(self.queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self) -> None:
+        """后台线程：阻塞等待第一条记录，再在max_delay内尽量攒满一批"""
+        while True:
+            batch = [self.queue.get()]
+            deadline = time.monotonic() + self.max_delay
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self.queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self._write(batch)
+
+    def _write(self, batch: List[Dict[str, Any]]) -> None:
+        """在独立的应用上下文中批量插入"""
+        with self._app.app_context():
+            session = db.session
+            try:
+                session.bulk_insert_mappings(self.model, batch)
+                session.commit()
+            except Exception:
+                session.rollback()
+                logger.exception(
+                    f"Failed to write {len(batch)} rows to {self.model.__tablename__}"
+                )
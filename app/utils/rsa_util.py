@@ -181,7 +181,6 @@ def init_rsa_keys(app) -> None:
     Args:
         app: Flask应用实例
     """
-    print( "init_rsa_keys" )
     try:
         # 检查是否已配置
         if app.config.get('RSA_PRIVATE_KEY') and app.config.get('RSA_PUBLIC_KEY'):
@@ -13,7 +13,7 @@ def generate_app_key() -> str:
     Returns:
         生成的应用密钥
     """
-    return str(uuid.uuid4()).replace("-", "")
+    return uuid.uuid4().hex
 
 def generate_secure_token(length: int = 32) -> str:
     """生成安全令牌